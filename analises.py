@@ -0,0 +1,224 @@
+"""
+Relatórios analíticos sobre as partidas válidas para ranking:
+- resumo_temporadas: por ano e jogador (partidas, vitórias, posição média)
+- vitorias_por_mecanica: por mecânica do BGG e jogador
+- matriz_confrontos: vitórias/derrotas/empates de cada par de jogadores
+  (companheiros de time não contam, como no confronto direto)
+
+Dois motores com o mesmo resultado:
+- 'duckdb' (opcional, se o pacote estiver instalado): SQL vetorizado e em
+  várias threads sobre o histórico colunar compartilhado (colunar.py),
+  sem passar pelo SQLite além das tabelas pequenas (jogadores, jogos)
+- 'pandas': read_sql_query + groupby, sempre disponível
+
+Os motores devolvem contagens por id; nomes, taxas e ordenação são feitos
+uma vez só, em pandas, para as duas saídas serem idênticas.
+"""
+import importlib.util
+
+import numpy as np
+import pandas as pd
+
+import colunar
+
+MOTORES = ('duckdb', 'pandas')
+
+
+def duckdb_disponivel():
+    return importlib.util.find_spec('duckdb') is not None
+
+
+def motor_padrao():
+    return 'duckdb' if duckdb_disponivel() else 'pandas'
+
+
+def resumo_temporadas(db, motor=None):
+    """temporada, jogador, partidas, vitorias, taxa_vitoria (%), posicao_media"""
+    motor = _validar_motor(motor)
+    if motor == 'duckdb':
+        df = _consultar_duckdb(db, """
+            SELECT CAST(year(data) AS VARCHAR) AS temporada, jogador_id,
+                   COUNT(*) AS partidas,
+                   COUNT(*) FILTER (WHERE posicao = 1) AS vitorias,
+                   SUM(posicao) AS soma_posicoes
+            FROM resultados
+            GROUP BY ALL
+        """)
+    else:
+        df = _resultados_pandas(db)
+        df['temporada'] = df['data'].str[:4]
+        df['vitoria'] = df['posicao'] == 1
+        df = df.groupby(['temporada', 'jogador_id'], as_index=False).agg(
+            partidas=('posicao', 'size'),
+            vitorias=('vitoria', 'sum'),
+            soma_posicoes=('posicao', 'sum'),
+        )
+
+    df = _com_nomes(db, df)
+    df['taxa_vitoria'] = _percentual(df['vitorias'], df['partidas'])
+    df['posicao_media'] = (df['soma_posicoes'] / df['partidas']).round(2)
+    df = df.sort_values(['temporada', 'taxa_vitoria', 'partidas', 'jogador'],
+                        ascending=[False, False, False, True])
+    return df[['temporada', 'jogador', 'partidas', 'vitorias', 'taxa_vitoria', 'posicao_media']] \
+        .reset_index(drop=True)
+
+
+def vitorias_por_mecanica(db, data_inicio=None, data_fim=None, min_partidas=1, motor=None):
+    """mecanica, jogador, partidas, vitorias, taxa_vitoria (%)"""
+    motor = _validar_motor(motor)
+    if motor == 'duckdb':
+        df = _consultar_duckdb(db, """
+            WITH mecanicas AS (
+                SELECT id AS jogo_id, trim(unnest(string_split(mecanicas, ','))) AS mecanica
+                FROM jogos
+            )
+            SELECT m.mecanica, r.jogador_id,
+                   COUNT(*) AS partidas,
+                   COUNT(*) FILTER (WHERE r.posicao = 1) AS vitorias
+            FROM resultados r
+            JOIN mecanicas m USING (jogo_id)
+            WHERE m.mecanica != ''
+            GROUP BY ALL
+        """, data_inicio, data_fim)
+    else:
+        df = _resultados_pandas(db, data_inicio, data_fim)
+        jogos = db.get_jogos(apenas_ativos=False)[['id', 'mecanicas']].dropna()
+        jogos['mecanica'] = jogos['mecanicas'].str.split(',')
+        jogos = jogos.explode('mecanica')
+        jogos['mecanica'] = jogos['mecanica'].str.strip()
+        jogos = jogos[jogos['mecanica'] != '']
+        df = df.merge(jogos[['id', 'mecanica']], left_on='jogo_id', right_on='id')
+        df['vitoria'] = df['posicao'] == 1
+        df = df.groupby(['mecanica', 'jogador_id'], as_index=False).agg(
+            partidas=('posicao', 'size'),
+            vitorias=('vitoria', 'sum'),
+        )
+
+    df = _com_nomes(db, df[df['partidas'] >= min_partidas])
+    df['taxa_vitoria'] = _percentual(df['vitorias'], df['partidas'])
+    df = df.sort_values(['mecanica', 'taxa_vitoria', 'partidas', 'jogador'],
+                        ascending=[True, False, False, True])
+    return df[['mecanica', 'jogador', 'partidas', 'vitorias', 'taxa_vitoria']].reset_index(drop=True)
+
+
+def matriz_confrontos(db, data_inicio=None, data_fim=None, motor=None):
+    """
+    Uma linha por par (jogador, adversario) que já se enfrentou:
+    vitorias, derrotas, empates e aproveitamento (%, empate vale meia)
+    do jogador contra o adversário. Use .pivot para a matriz.
+    """
+    motor = _validar_motor(motor)
+    if motor == 'duckdb':
+        df = _consultar_duckdb(db, """
+            SELECT a.jogador_id, b.jogador_id AS adversario_id,
+                   COUNT(*) FILTER (WHERE a.posicao < b.posicao) AS vitorias,
+                   COUNT(*) FILTER (WHERE a.posicao > b.posicao) AS derrotas,
+                   COUNT(*) FILTER (WHERE a.posicao = b.posicao) AS empates
+            FROM resultados a
+            JOIN resultados b
+              ON a.partida_id = b.partida_id AND a.jogador_id != b.jogador_id
+            WHERE a.eh_jogo_time != 'S' OR a.posicao != b.posicao
+            GROUP BY ALL
+        """, data_inicio, data_fim)
+    else:
+        df = _resultados_pandas(db, data_inicio, data_fim)
+        pares = df.merge(df[['partida_id', 'jogador_id', 'posicao']], on='partida_id',
+                         suffixes=('', '_adversario'))
+        pares = pares[(pares['jogador_id'] != pares['jogador_id_adversario'])
+                      & ((pares['eh_jogo_time'] != 'S') | (pares['posicao'] != pares['posicao_adversario']))]
+        pares = pares.assign(
+            vitorias=pares['posicao'] < pares['posicao_adversario'],
+            derrotas=pares['posicao'] > pares['posicao_adversario'],
+            empates=pares['posicao'] == pares['posicao_adversario'],
+        )
+        df = pares.groupby(['jogador_id', 'jogador_id_adversario'], as_index=False)[
+            ['vitorias', 'derrotas', 'empates']].sum()
+        df = df.rename(columns={'jogador_id_adversario': 'adversario_id'})
+
+    nomes = _nomes(db)
+    df = df.assign(jogador=df['jogador_id'].map(nomes), adversario=df['adversario_id'].map(nomes))
+    total = df['vitorias'] + df['derrotas'] + df['empates']
+    df['aproveitamento'] = _percentual(df['vitorias'] + df['empates'] / 2, total)
+    df = df.sort_values(['jogador', 'adversario'])
+    return df[['jogador', 'adversario', 'vitorias', 'derrotas', 'empates', 'aproveitamento']] \
+        .reset_index(drop=True)
+
+
+def _validar_motor(motor):
+    motor = motor or motor_padrao()
+    if motor not in MOTORES:
+        raise ValueError(f"Motor desconhecido: {motor} (use {', '.join(MOTORES)})")
+    if motor == 'duckdb' and not duckdb_disponivel():
+        raise ValueError("Motor 'duckdb' indisponível: instale o pacote duckdb")
+    return motor
+
+
+# === PANDAS ===
+def _resultados_pandas(db, data_inicio=None, data_fim=None):
+    """Resultados das partidas válidas (uma linha por jogador em cada partida)"""
+    filtros, params = ["p.valida_ranking = 'S'"], []
+    if data_inicio:
+        filtros.append("p.data >= ?")
+        params.append(data_inicio)
+    if data_fim:
+        filtros.append("p.data <= ?")
+        params.append(data_fim)
+    conn = db.get_connection()
+    df = pd.read_sql_query(f"""
+        SELECT r.partida_id, p.data, p.jogo_id, p.eh_jogo_time, r.jogador_id, r.posicao
+        FROM partidas p
+        JOIN resultados r ON r.partida_id = p.id
+        WHERE {' AND '.join(filtros)}
+    """, conn, params=params)
+    conn.close()
+    return df
+
+
+# === DUCKDB ===
+def _consultar_duckdb(db, sql, data_inicio=None, data_fim=None):
+    """
+    Roda `sql` numa conexão DuckDB em memória com as tabelas:
+    - resultados: partida_id, data, jogo_id, eh_jogo_time, jogador_id, posicao
+      (só partidas válidas e dentro do período)
+    - jogos: id, mecanicas
+    """
+    import duckdb
+
+    historico = colunar.obter(db).validas()
+    tamanhos = np.diff(historico['inicio'])
+    mascara = np.ones(len(tamanhos), dtype=bool)
+    if data_inicio:
+        mascara &= historico['data'] >= np.datetime64(data_inicio, 'D')
+    if data_fim:
+        mascara &= historico['data'] <= np.datetime64(data_fim, 'D')
+    linhas = np.repeat(mascara, tamanhos)
+
+    resultados = pd.DataFrame({
+        chave: np.repeat(historico[chave][mascara], tamanhos[mascara])
+        for chave in ('partida_id', 'data', 'jogo_id', 'eh_jogo_time')
+    })
+    resultados['jogador_id'] = historico['jogador_id'][linhas]
+    resultados['posicao'] = historico['posicao'][linhas]
+
+    conn = db.get_connection()
+    jogos = pd.read_sql_query("SELECT id, mecanicas FROM jogos WHERE mecanicas IS NOT NULL", conn)
+    conn.close()
+
+    with duckdb.connect() as con:
+        con.register('resultados', resultados)
+        con.register('jogos', jogos)
+        return con.execute(sql).df()
+
+
+# === COMUM ===
+def _nomes(db):
+    jogadores = db.get_jogadores(apenas_ativos=False)
+    return dict(zip(jogadores['id'], jogadores['nome']))
+
+
+def _com_nomes(db, df):
+    return df.assign(jogador=df['jogador_id'].map(_nomes(db)))
+
+
+def _percentual(parte, total):
+    return (parte / total * 100).round(2)
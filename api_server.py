@@ -0,0 +1,449 @@
+"""
+API HTTP somente leitura (JSON) para outras ferramentas: bot do Discord,
+painel da TV nas jogatinas etc. Roda separada do Streamlit, no mesmo banco,
+aberto com mode=ro: não cria nem migra tabelas (o esquema vem do app).
+
+Uso:
+    python api_server.py --porta 8502 --banco jogos.db
+
+Endpoints (GET):
+    /api/versao
+    /api/rankings/aproveitamento?limite=40&inicio=AAAA-MM-DD&fim=AAAA-MM-DD
+    /api/rankings/elo
+    /api/rankings/confronto-direto
+    /api/jogadores
+    /api/jogadores/<id>
+    /api/partidas?pagina=1&por_pagina=20
+    /api/jogos
+    /api/eventos   (Server-Sent Events: diferenças de ranking a cada partida)
+
+Toda resposta leva ETag = versão dos dados (metadados.versao_dados, que sobe
+a cada escrita). Cliente que manda If-None-Match com a versão atual recebe
+304 sem corpo. Os corpos JSON ficam em cache por (rota, parâmetros, versão):
+depois de uma escrita só a primeira requisição de cada rota consulta o banco.
+
+/api/eventos mantém a conexão aberta: ao conectar manda o ranking atual
+(evento 'estado') e, a cada escrita que muda algo, um evento 'ranking' com os
+eventos gravados (partida adicionada/removida...) e só os jogadores que
+mudaram de posição ou valor. Reconexão com Last-Event-ID recebe o que perdeu.
+"""
+import argparse
+import collections
+import dataclasses
+import json
+import logging
+import math
+import re
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from database import Database
+from ranking import RankingCalculator
+
+logger = logging.getLogger(__name__)
+
+MAX_POR_PAGINA = 100
+INTERVALO_EVENTOS = 1.0   # segundos entre conferências da versão (uma para todos os clientes)
+PING_EVENTOS = 15         # comentário SSE para manter a conexão viva
+
+
+class RequisicaoInvalida(Exception):
+    """Parâmetro inválido (400)"""
+
+
+class NaoEncontrado(Exception):
+    """Rota ou registro inexistente (404)"""
+
+
+class VigiaVersao:
+    """
+    Versão dos dados com uma conexão só: relê metadados apenas quando o
+    PRAGMA data_version (que muda a cada commit de outra conexão) mudar.
+    """
+
+    def __init__(self, db_name):
+        self._conn = sqlite3.connect(f"file:{db_name}?mode=ro", uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._data_version = None
+        self._versao = None
+
+    def atual(self):
+        with self._lock:
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version != self._data_version:
+                self._versao = self._conn.execute(
+                    "SELECT valor FROM metadados WHERE chave = 'versao_dados'"
+                ).fetchone()[0]
+                self._data_version = data_version
+            return self._versao
+
+
+class CacheRespostas:
+    """LRU de corpos JSON por chave, válido só para a versão em que foi gerado"""
+
+    def __init__(self, max_itens=256):
+        self.max_itens = max_itens
+        self._itens = collections.OrderedDict()   # chave -> (versao, corpo)
+        self._lock = threading.Lock()
+        self._locks_chave = {}
+
+    def obter_ou_gerar(self, chave, versao, gerar):
+        corpo = self._obter(chave, versao)
+        if corpo is not None:
+            return corpo
+        # Um só cálculo por chave: os outros clientes esperam e usam o resultado
+        with self._lock:
+            lock_chave = self._locks_chave.setdefault(chave, threading.Lock())
+        with lock_chave:
+            corpo = self._obter(chave, versao)
+            if corpo is None:
+                corpo = gerar()
+                with self._lock:
+                    self._itens[chave] = (versao, corpo)
+                    self._itens.move_to_end(chave)
+                    while len(self._itens) > self.max_itens:
+                        antiga, _ = self._itens.popitem(last=False)
+                        self._locks_chave.pop(antiga, None)
+        return corpo
+
+    def _obter(self, chave, versao):
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None or item[0] != versao:
+                return None
+            self._itens.move_to_end(chave)
+            return item[1]
+
+
+class DifusorEventos:
+    """
+    Uma thread para todos os clientes de /api/eventos: confere a versão a
+    cada INTERVALO_EVENTOS (barato, PRAGMA data_version) e, se mudou, lê os
+    eventos novos, recalcula os rankings uma vez e publica as diferenças.
+    """
+
+    def __init__(self, db, vigia, intervalo=INTERVALO_EVENTOS, historico=100):
+        self.db = db
+        self.vigia = vigia
+        self.intervalo = intervalo
+        self._cond = threading.Condition()
+        self._mensagens = collections.deque(maxlen=historico)   # (versao, bytes)
+        self._versao = vigia.atual()
+        self._ultimo_evento = db.get_ultimo_evento_id()
+        self._rankings = self._carregar_rankings()
+        self._parar = threading.Event()
+        threading.Thread(target=self._loop, name='difusor-eventos', daemon=True).start()
+
+    def _carregar_rankings(self):
+        return {
+            'elo': RankingCalculator.get_ranking_elo(self.db),
+            'aproveitamento': RankingCalculator.calcular_ranking_aproveitamento(self.db),
+        }
+
+    def _loop(self):
+        while not self._parar.wait(self.intervalo):
+            try:
+                self.verificar()
+            except Exception:
+                logger.exception("Erro ao verificar eventos")
+
+    def parar(self):
+        self._parar.set()
+
+    def verificar(self):
+        """Publica um evento 'ranking' se a versão mudou e algo relevante mudou junto"""
+        versao = self.vigia.atual()
+        if versao == self._versao:
+            return
+        eventos = self.db.get_eventos(self._ultimo_evento)
+        rankings = self._carregar_rankings()
+        diferencas = {
+            'elo': RankingCalculator.diferenca_ranking(self._rankings['elo'], rankings['elo']),
+            'aproveitamento': RankingCalculator.diferenca_ranking(
+                self._rankings['aproveitamento'], rankings['aproveitamento'], 'jogador', 'aproveitamento'
+            ),
+        }
+        with self._cond:
+            self._versao, self._rankings = versao, rankings
+            if eventos:
+                self._ultimo_evento = eventos[-1].id
+            if not eventos and not any(diferencas.values()):
+                return
+            dados = {'versao': versao, 'eventos': [dataclasses.asdict(e) for e in eventos], **diferencas}
+            self._mensagens.append((versao, _mensagem_sse(versao, 'ranking', dados)))
+            self._cond.notify_all()
+
+    def estado(self):
+        """(versao, mensagem 'estado') com os rankings completos, para quem acabou de conectar"""
+        with self._cond:
+            dados = {
+                'versao': self._versao,
+                'elo': _registros(self._rankings['elo'], indice='posicao'),
+                'aproveitamento': _registros(self._rankings['aproveitamento'], indice='posicao'),
+            }
+            return self._versao, _mensagem_sse(self._versao, 'estado', dados)
+
+    def aguardar(self, desde_versao, timeout):
+        """Mensagens [(versao, bytes)] mais novas que desde_versao; espera até `timeout`"""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._mensagens and self._mensagens[-1][0] > desde_versao, timeout
+            )
+            return [(v, m) for v, m in self._mensagens if v > desde_versao]
+
+
+def _mensagem_sse(versao, tipo, dados):
+    texto = json.dumps(dados, ensure_ascii=False, default=_valor_json)
+    return f"id: {versao}\nevent: {tipo}\ndata: {texto}\n\n".encode('utf-8')
+
+
+# === CONVERSÃO ===
+def _valor_json(valor):
+    """numpy/pandas -> tipos nativos; NaN vira null"""
+    if hasattr(valor, 'item'):
+        valor = valor.item()
+    if isinstance(valor, float) and math.isnan(valor):
+        return None
+    return valor
+
+
+def _registros(df, indice=None):
+    """DataFrame -> lista de dicts (com o índice numa coluna, se pedido)"""
+    if indice:
+        df = df.reset_index(names=indice)
+    return [
+        {coluna: _valor_json(valor) for coluna, valor in zip(df.columns, linha)}
+        for linha in df.itertuples(index=False, name=None)
+    ]
+
+
+def _inteiro(params, nome, padrao, minimo=1, maximo=None):
+    texto = params.get(nome, [None])[0]
+    if texto is None:
+        return padrao
+    try:
+        valor = int(texto)
+    except ValueError:
+        raise RequisicaoInvalida(f"'{nome}' deve ser inteiro")
+    if valor < minimo or (maximo is not None and valor > maximo):
+        raise RequisicaoInvalida(f"'{nome}' fora do intervalo")
+    return valor
+
+
+# === ROTAS ===
+def rota_versao(db, params):
+    return {'versao': db.get_versao_dados()}
+
+
+def rota_ranking_aproveitamento(db, params):
+    limite = _inteiro(params, 'limite', 40)
+    inicio = params.get('inicio', [None])[0]
+    fim = params.get('fim', [None])[0]
+    ranking = RankingCalculator.calcular_ranking_aproveitamento(
+        db, limite_partidas=limite, data_inicio=inicio, data_fim=fim
+    )
+    return _registros(ranking, indice='posicao')
+
+
+def rota_ranking_elo(db, params):
+    return _registros(RankingCalculator.get_ranking_elo(db), indice='posicao')
+
+
+def rota_confronto_direto(db, params):
+    return _registros(db.get_confronto_direto())
+
+
+def rota_jogadores(db, params):
+    return _registros(db.get_jogadores()[['id', 'nome', 'elo']])
+
+
+def rota_jogador(db, params, jogador_id):
+    jogadores = db.get_jogadores(apenas_ativos=False)
+    jogador = jogadores[jogadores['id'] == jogador_id]
+    if len(jogador) == 0:
+        raise NaoEncontrado(f"jogador {jogador_id} não existe")
+    jogador = _registros(jogador[['id', 'nome', 'elo', 'ativo']])[0]
+    nome = jogador['nome']
+
+    ranking_elo = RankingCalculator.get_ranking_elo(db)
+    posicao_elo = ranking_elo.index[ranking_elo['nome'] == nome]
+    aproveitamento = RankingCalculator.calcular_ranking_aproveitamento(db)
+    linha_aprov = aproveitamento[aproveitamento['jogador'] == nome]
+    confrontos = db.get_confronto_direto(apenas_ativos=False)
+
+    jogador.update({
+        'posicao_elo': _valor_json(posicao_elo[0]) if len(posicao_elo) else None,
+        'aproveitamento': _valor_json(linha_aprov['aproveitamento'].iloc[0]) if len(linha_aprov) else None,
+        'posicao_aproveitamento': _valor_json(linha_aprov.index[0]) if len(linha_aprov) else None,
+        'ultimas_partidas': _registros(
+            db.get_todas_partidas_jogador(jogador_id, limit=10, apenas_validas=False)
+        ),
+        'confrontos': _registros(
+            confrontos[confrontos['jogador_a'] == nome].drop(columns='jogador_a')
+        ),
+    })
+    return jogador
+
+
+def rota_partidas(db, params):
+    pagina = _inteiro(params, 'pagina', 1)
+    por_pagina = _inteiro(params, 'por_pagina', 20, maximo=MAX_POR_PAGINA)
+    total = db.contar_partidas()
+    partidas = db.get_partidas(limit=por_pagina, offset=(pagina - 1) * por_pagina)
+    return {
+        'pagina': pagina,
+        'por_pagina': por_pagina,
+        'total': total,
+        'paginas': max(1, -(-total // por_pagina)),
+        'partidas': _registros(partidas),
+    }
+
+
+def rota_jogos(db, params):
+    return _registros(db.get_jogos().drop(columns='ativo'))
+
+
+ROTAS = {
+    '/api/versao': rota_versao,
+    '/api/rankings/aproveitamento': rota_ranking_aproveitamento,
+    '/api/rankings/elo': rota_ranking_elo,
+    '/api/rankings/confronto-direto': rota_confronto_direto,
+    '/api/jogadores': rota_jogadores,
+    '/api/partidas': rota_partidas,
+    '/api/jogos': rota_jogos,
+}
+ROTA_JOGADOR = re.compile(r'^/api/jogadores/(\d+)$')
+
+
+def resolver(caminho):
+    """Função (db, params) da rota, ou NaoEncontrado"""
+    caminho = caminho.rstrip('/') or '/'
+    if caminho in ROTAS:
+        return ROTAS[caminho]
+    casamento = ROTA_JOGADOR.match(caminho)
+    if casamento:
+        jogador_id = int(casamento.group(1))
+        return lambda db, params: rota_jogador(db, params, jogador_id)
+    raise NaoEncontrado(f"rota {caminho} não existe")
+
+
+# === SERVIDOR ===
+class ManipuladorAPI(BaseHTTPRequestHandler):
+    server_version = "DiretoriaAPI/1.0"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = parse_qs(url.query)
+        if url.path.rstrip('/') == '/api/eventos':
+            self._transmitir_eventos()
+            return
+        try:
+            rota = resolver(url.path)
+            versao = self.server.vigia.atual()
+            etag = f'"{versao}"'
+            if etag in self.headers.get('If-None-Match', ''):
+                self._responder(304, etag=etag)
+                return
+            chave = (url.path.rstrip('/'), tuple(sorted((k, tuple(v)) for k, v in params.items())))
+            corpo = self.server.cache.obter_ou_gerar(
+                chave, versao,
+                lambda: json.dumps(rota(self.server.db, params), ensure_ascii=False).encode('utf-8')
+            )
+            self._responder(200, corpo, etag=etag)
+        except RequisicaoInvalida as e:
+            self._responder_erro(400, str(e))
+        except NaoEncontrado as e:
+            self._responder_erro(404, str(e))
+        except Exception:
+            logger.exception("Erro em %s", self.path)
+            self._responder_erro(500, "erro interno")
+
+    def _transmitir_eventos(self):
+        difusor = self.server.difusor
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        try:
+            ultimo = self.headers.get('Last-Event-ID', '')
+            if ultimo.isdigit():
+                versao = int(ultimo)   # reconexão: manda só o que perdeu
+            else:
+                versao, mensagem = difusor.estado()
+                self.wfile.write(mensagem)
+                self.wfile.flush()
+            while True:
+                mensagens = difusor.aguardar(versao, timeout=PING_EVENTOS)
+                for versao, mensagem in mensagens:
+                    self.wfile.write(mensagem)
+                if not mensagens:
+                    self.wfile.write(b': ping\n\n')
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _responder(self, status, corpo=b'', etag=None):
+        self.send_response(status)
+        if etag:
+            self.send_header('ETag', etag)
+            # Cliente sempre revalida (barato: 304 quando nada mudou)
+            self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        if status != 304:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(corpo)
+
+    def _responder_erro(self, status, mensagem):
+        corpo = json.dumps({'erro': mensagem}, ensure_ascii=False).encode('utf-8')
+        self._responder(status, corpo)
+
+    def log_message(self, formato, *args):
+        # Centenas de clientes fazendo polling: log só em debug
+        logger.debug("%s - %s", self.address_string(), formato % args)
+
+
+class ServidorAPI(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, endereco, db_name='jogos.db', max_cache=256):
+        # Não cria nem migra tabelas: quem escreve no banco é o app
+        self.db = Database(db_name, somente_leitura=True)
+        self.vigia = VigiaVersao(db_name)
+        self.cache = CacheRespostas(max_cache)
+        self.difusor = DifusorEventos(self.db, self.vigia)
+        super().__init__(endereco, ManipuladorAPI)
+
+    def server_close(self):
+        self.difusor.parar()
+        super().server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API JSON (somente leitura) da Diretoria da Jogatina")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--porta', type=int, default=8502)
+    parser.add_argument('--banco', default='jogos.db')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        servidor = ServidorAPI((args.host, args.porta), args.banco)
+    except ValueError as e:
+        parser.exit(1, f"{e}\n")
+    logger.info("API em http://%s:%s/api/versao", args.host, args.porta)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Gerador de bancos sintéticos (reprodutível por seed) para os benchmarks.
+
+Os jogadores são divididos em grupos de ~30 (como o nosso), cada jogatina
+junta gente de um grupo só. Habilidade latente por jogador, popularidade
+dos jogos em Zipf, peso BGG com média ~2.1 (igual à coleção real), 6% de
+jogos de time (dois times de dois) e alguns empates.
+"""
+import random
+import sqlite3
+from datetime import date, timedelta
+from pathlib import Path
+
+from database import Database
+
+TAMANHO_GRUPO = 30
+PARTIDAS_POR_JOGATINA = 6
+
+
+def _gerar_jogos(rng, n_jogos):
+    jogos = []
+    for jogo_id in range(1, n_jogos + 1):
+        peso = round(1 + 3.5 * rng.betavariate(2, 4.5), 2)
+        min_jog = rng.choice([1, 2, 2, 2, 3])
+        max_jog = max(min_jog + 1, rng.choice([4, 4, 5, 5, 6, 8]))
+        tempo_min = rng.choice([15, 20, 30, 45, 60, 90])
+        tempo_max = tempo_min + rng.choice([0, 15, 30, 60])
+        jogos.append((jogo_id, f"Jogo {jogo_id:05d}", peso, min_jog, max_jog, tempo_min, tempo_max))
+    return jogos
+
+
+def _resultados_partida(rng, partida_id, jogadores, habilidade, peso, eh_time):
+    """Posições a partir de habilidade + ruído (jogos leves têm mais sorte)"""
+    sorte = 2.5 / peso
+    desempenho = {j: habilidade[j] + rng.gauss(0, sorte) for j in jogadores}
+
+    if eh_time:
+        time_a, time_b = jogadores[:2], jogadores[2:]
+        a_venceu = sum(desempenho[j] for j in time_a) >= sum(desempenho[j] for j in time_b)
+        return (
+            [(partida_id, j, 1 if a_venceu else 2, None, 1) for j in time_a]
+            + [(partida_id, j, 2 if a_venceu else 1, None, 2) for j in time_b]
+        )
+
+    ordem = sorted(jogadores, key=lambda j: -desempenho[j])
+    resultados = []
+    posicao = 1
+    for i, j in enumerate(ordem):
+        # ~2% de empate com o anterior
+        if i > 0 and rng.random() >= 0.02:
+            posicao = i + 1
+        resultados.append((partida_id, j, posicao, round(rng.uniform(0, 100)), None))
+    return resultados
+
+
+def gerar_banco(caminho, n_jogadores, n_partidas, seed=42):
+    """
+    Cria um banco em `caminho` com n_jogadores e n_partidas sintéticas.
+    Os agregados (confronto direto etc.) são preenchidos pelo próprio
+    Database ao abrir um banco com partidas e agregados vazios.
+    """
+    caminho = Path(caminho)
+    for arquivo in (caminho, Path(f"{caminho}-wal"), Path(f"{caminho}-shm")):
+        if arquivo.exists():
+            arquivo.unlink()
+    Database(str(caminho))
+
+    rng = random.Random(seed)
+    n_jogos = min(2000, max(30, n_partidas // 10))
+    jogos = _gerar_jogos(rng, n_jogos)
+    popularidade = [1 / (i + 1) for i in range(n_jogos)]
+
+    habilidade = {j: rng.gauss(0, 1) for j in range(1, n_jogadores + 1)}
+    ids = list(habilidade)
+    grupos = [ids[i:i + TAMANHO_GRUPO] for i in range(0, n_jogadores, TAMANHO_GRUPO)]
+    if len(grupos) > 1 and len(grupos[-1]) < 4:
+        grupos[-2].extend(grupos.pop())
+    # Alguns jogadores aparecem muito mais que outros
+    frequencia = {j: rng.paretovariate(1.5) for j in habilidade}
+
+    n_jogatinas = max(1, -(-n_partidas // PARTIDAS_POR_JOGATINA))
+    inicio = date(2015, 1, 1)
+    dias = max(n_jogatinas // len(grupos), 1) * 7
+
+    jogatinas, partidas, resultados = [], [], []
+    partida_id = 0
+    for jogatina_id in range(1, n_jogatinas + 1):
+        grupo = grupos[jogatina_id % len(grupos)]
+        data = (inicio + timedelta(days=int(dias * jogatina_id / n_jogatinas))).isoformat()
+        jogatinas.append((jogatina_id, data))
+
+        # Amostra ponderada sem reposição (chave = u ^ (1 / peso))
+        n_presentes = min(len(grupo), rng.randint(3, 8))
+        presentes = sorted(grupo, key=lambda j: rng.random() ** (1 / frequencia[j]))[-n_presentes:]
+
+        for _ in range(PARTIDAS_POR_JOGATINA):
+            if partida_id >= n_partidas:
+                break
+            partida_id += 1
+            jogo = rng.choices(jogos, weights=popularidade)[0]
+            eh_time = len(presentes) >= 4 and rng.random() < 0.06
+            n = 4 if eh_time else min(len(presentes), rng.choice([2, 3, 3, 4, 4, 5, 6]))
+            jogadores = rng.sample(presentes, n)
+
+            valida = 'S' if rng.random() < 0.95 else 'N'
+            partidas.append((partida_id, jogo[0], jogatina_id, data, valida, 'S' if eh_time else 'N'))
+            resultados.extend(_resultados_partida(rng, partida_id, jogadores, habilidade, jogo[2], eh_time))
+
+    conn = sqlite3.connect(str(caminho))
+    conn.executemany("INSERT INTO jogadores (id, nome) VALUES (?, ?)",
+                     [(j, f"Jogador {j:05d}") for j in habilidade])
+    conn.executemany("""INSERT INTO jogos
+                        (id, nome, peso_bgg, min_jogadores, max_jogadores, tempo_min, tempo_max)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)""", jogos)
+    conn.executemany("INSERT INTO jogatinas (id, data) VALUES (?, ?)", jogatinas)
+    conn.executemany("""INSERT INTO partidas
+                        (id, jogo_id, jogatina_id, data, valida_ranking, eh_jogo_time)
+                        VALUES (?, ?, ?, ?, ?, ?)""", partidas)
+    conn.executemany("""INSERT INTO resultados
+                        (partida_id, jogador_id, posicao, pontuacao, time_id)
+                        VALUES (?, ?, ?, ?, ?)""", resultados)
+    conn.commit()
+    conn.close()
+
+    # Reabre para preencher os agregados. O escritor mantém a conexão aberta,
+    # então o WAL não é checkpointado sozinho: sem isso o arquivo principal
+    # (o que se copia) fica só com o esquema
+    db = Database(str(caminho))
+    db.executar_escrita(lambda c: c.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone(),
+                        transacao=False)
+    return db
@@ -0,0 +1,76 @@
+"""
+Mede o cold start e o tempo por rerun de cada página do app.py usando o
+AppTest do Streamlit, num subprocesso limpo (imports não estão em cache).
+
+Uso (na raiz do repositório):
+    python -m benchmarks.render_app
+    python -m benchmarks.render_app --reruns 20 --saida render.json
+    python -m benchmarks.render_app --raiz /caminho/de/outro/checkout
+
+O app roda numa cópia temporária da pasta (o jogos.db original não é tocado).
+"""
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+# Roda dentro do subprocesso, com cwd = cópia do app
+_SCRIPT = r"""
+import json, statistics, sys, time
+sys.path.insert(0, '.')
+from streamlit.testing.v1 import AppTest
+
+reruns = int(sys.argv[1])
+inicio = time.perf_counter()
+at = AppTest.from_file('app.py', default_timeout=300).run()
+cold_start = time.perf_counter() - inicio
+
+paginas = {}
+for pagina in at.sidebar.radio[0].options:
+    at.sidebar.radio[0].set_value(pagina).run()
+    tempos = []
+    for _ in range(reruns):
+        inicio = time.perf_counter()
+        at.run()
+        tempos.append(time.perf_counter() - inicio)
+    paginas[pagina] = {'mediana_s': statistics.median(tempos), 'min_s': min(tempos)}
+
+print(json.dumps({'cold_start_s': cold_start, 'paginas': paginas}))
+"""
+
+
+def medir(raiz, reruns):
+    with tempfile.TemporaryDirectory() as tmp:
+        copia = Path(tmp) / 'app'
+        shutil.copytree(raiz, copia, ignore=shutil.ignore_patterns('.git', 'benchmarks', '__pycache__'))
+        saida = subprocess.run(
+            [sys.executable, '-c', _SCRIPT, str(reruns)],
+            cwd=copia, capture_output=True, text=True, check=True
+        ).stdout
+    return json.loads(saida.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold start e rerun por página do app")
+    parser.add_argument('--raiz', type=Path, default=RAIZ, help="pasta com o app.py")
+    parser.add_argument('--reruns', type=int, default=10)
+    parser.add_argument('--saida', help="arquivo JSON para salvar os resultados")
+    args = parser.parse_args(argv)
+
+    resultado = medir(args.raiz, args.reruns)
+    print(f"  {'cold start':<28} {resultado['cold_start_s'] * 1000:10.1f} ms")
+    for pagina, estat in resultado['paginas'].items():
+        print(f"  {pagina:<28} {estat['mediana_s'] * 1000:10.1f} ms")
+
+    if args.saida:
+        Path(args.saida).write_text(json.dumps(resultado, indent=2, ensure_ascii=False), encoding='utf-8')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,272 @@
+"""
+Benchmarks do Database e do RankingCalculator sobre bancos sintéticos.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.run_benchmarks --cenario pequeno
+    python -m benchmarks.run_benchmarks --cenario medio --saida resultado.json
+    python -m benchmarks.run_benchmarks --jogadores 100 --partidas 50000
+    python -m benchmarks.run_benchmarks --cenario pequeno --baseline base.json --tolerancia 0.25
+
+Com --baseline, sai com código 1 se algum benchmark ficar mais de
+--tolerancia (fração) mais lento que a mediana registrada no baseline.
+Os bancos gerados ficam em cache (--dados) por cenário + seed.
+"""
+import argparse
+import json
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import analises
+import colunar
+import database
+import replicacao
+from benchmarks.gerador import gerar_banco
+from database import Database
+from ferramentas.gerador_times import dividir_times
+from ranking import RankingCalculator
+
+CENARIOS = {
+    'pequeno': (30, 10_000),
+    'medio': (300, 100_000),
+    'grande': (3_000, 1_000_000),
+}
+
+PASTA_DADOS = Path(__file__).parent / '.dados'
+
+# Partidas novas entram depois de todo o histórico sintético (como a partida
+# de hoje); DATA_RETROATIVA cai no meio dele
+DATA_NOVA = '2099-01-01'
+DATA_RETROATIVA = '2030-01-01'
+
+
+def medir(funcao, repeticoes):
+    """Roda `funcao` algumas vezes e devolve estatísticas em segundos"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return {
+        'mediana_s': statistics.median(tempos),
+        'min_s': min(tempos),
+        'max_s': max(tempos),
+        'repeticoes': repeticoes,
+    }
+
+
+def preparar_banco(n_jogadores, n_partidas, seed, pasta_dados):
+    """Gera (ou reaproveita do cache) o banco base e devolve uma cópia descartável"""
+    pasta_dados.mkdir(parents=True, exist_ok=True)
+    base = pasta_dados / f"bench_{n_jogadores}_{n_partidas}_{seed}.db"
+    if not base.exists():
+        print(f"Gerando banco sintético ({n_jogadores} jogadores, {n_partidas} partidas)...")
+        gerar_banco(base, n_jogadores, n_partidas, seed=seed)
+
+    copia = pasta_dados / f"{base.stem}_execucao.db"
+    for sufixo in ('', '-wal', '-shm'):
+        Path(f"{copia}{sufixo}").unlink(missing_ok=True)
+    shutil.rmtree(f"{copia}{colunar.SUFIXO_DISCO}", ignore_errors=True)
+    # Cópia pela API de backup: inclui o que ainda estiver no WAL da base
+    origem, destino = sqlite3.connect(base), sqlite3.connect(copia)
+    try:
+        origem.backup(destino)
+    finally:
+        origem.close()
+        destino.close()
+    return Database(str(copia))
+
+
+def executar(db, seed, repeticoes):
+    """Roda todos os benchmarks e devolve {nome: estatísticas}"""
+    rng = random.Random(seed)
+    conn = db.get_connection()
+    partida_ids = [r[0] for r in conn.execute("SELECT id FROM partidas").fetchall()]
+    jogo_ids = [r[0] for r in conn.execute("SELECT id FROM jogos").fetchall()]
+    jogador_ids = [r[0] for r in conn.execute("SELECT id FROM jogadores").fetchall()]
+    jogatina_ids = [r[0] for r in conn.execute("SELECT id FROM jogatinas").fetchall()]
+    elos = dict(conn.execute("SELECT id, elo FROM jogadores").fetchall())
+    conn.close()
+
+    def gerar_times(n_jogadores, n_times):
+        selecionados = rng.sample(jogador_ids, min(n_jogadores, len(jogador_ids)))
+        return lambda: dividir_times({j: elos[j] for j in selecionados}, n_times)
+
+    def metricas_sem_cache():
+        database._cache_metricas.clear()
+        db.get_metricas_dashboard()
+
+    def historico_frio():
+        colunar._historicos.clear()
+        RankingCalculator.carregar_historico(db)
+
+    def historico_sem_disco():
+        colunar._historicos.clear()
+        shutil.rmtree(db.db_name + colunar.SUFIXO_DISCO, ignore_errors=True)
+        RankingCalculator.carregar_historico(db)
+
+    # Réplica por páginas num diretório local no lugar do Drive
+    remoto = replicacao.ArmazenamentoPasta(Path(db.db_name).with_suffix('.replica'))
+    replica = {'estado': None}
+
+    def replicar_snapshot():
+        # Remoto vazio: o primeiro envio (com réplica lá, sem estado, é conflito)
+        for nome in remoto.listar(replicacao.PREFIXO):
+            remoto.apagar(nome)
+        replica['estado'] = replicacao.replicar(remoto, replicacao.imagem_banco(db.db_name), None)
+
+    def replicar_segmento():
+        # Uma partida nova e o envio das páginas alteradas (o que roda ao salvar)
+        jogadores = rng.sample(jogador_ids, 4)
+        db.add_partida(rng.choice(jogo_ids), DATA_NOVA, [(j, pos, 0) for pos, j in enumerate(jogadores, 1)])
+        replica['estado'] = replicacao.replicar(remoto, replicacao.imagem_banco(db.db_name), replica['estado'])
+
+    def detalhes():
+        for partida_id in rng.sample(partida_ids, min(100, len(partida_ids))):
+            db.get_partida_detalhes(partida_id)
+
+    def jogatinas():
+        for jogatina_id in rng.sample(jogatina_ids, min(100, len(jogatina_ids))):
+            db.get_jogatina_by_id(jogatina_id)
+
+    def add_partida():
+        for _ in range(20):
+            jogadores = rng.sample(jogador_ids, 4)
+            db.add_partida(
+                rng.choice(jogo_ids), DATA_NOVA,
+                [(j, pos, 0) for pos, j in enumerate(jogadores, 1)]
+            )
+
+    def add_partida_retroativa():
+        for _ in range(5):
+            jogadores = rng.sample(jogador_ids, 4)
+            db.add_partida(
+                rng.choice(jogo_ids), DATA_RETROATIVA,
+                [(j, pos, 0) for pos, j in enumerate(jogadores, 1)]
+            )
+
+    def add_partida_concorrente():
+        # 8 sessões salvando ao mesmo tempo (noite de jogatina)
+        def sessao(seed_sessao):
+            rng_sessao = random.Random(seed_sessao)
+            for _ in range(5):
+                jogadores = rng_sessao.sample(jogador_ids, 4)
+                db.add_partida(
+                    rng_sessao.choice(jogo_ids), DATA_NOVA,
+                    [(j, pos, 0) for pos, j in enumerate(jogadores, 1)]
+                )
+        threads = [threading.Thread(target=sessao, args=(rng.random(),)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    benchmarks = {
+        'recalcular_todos_elos': lambda: RankingCalculator.recalcular_todos_elos(db),
+        'carregar_historico_frio': historico_frio,
+        'carregar_historico_sem_disco': historico_sem_disco,
+        'calcular_ranking_aproveitamento': lambda: RankingCalculator.calcular_ranking_aproveitamento(db),
+        'get_partidas': lambda: db.get_partidas(),
+        'get_partidas_limit_10': lambda: db.get_partidas(limit=10),
+        'get_partida_detalhes_x100': detalhes,
+        'get_jogatina_by_id_x100': jogatinas,
+        'get_jogadores': lambda: db.get_jogadores(),
+        'get_metricas_dashboard': metricas_sem_cache,
+        'add_partida_x20': add_partida,
+        'add_partida_retroativa_x5': add_partida_retroativa,
+        'add_partida_concorrente_8x5': add_partida_concorrente,
+        'backup_bytes': lambda: db.backup_bytes(),
+        'replicar_snapshot': replicar_snapshot,
+        'replicar_segmento': replicar_segmento,
+        'recomendar_jogos_5': lambda: RankingCalculator.recomendar_jogos(db, jogador_ids[:5], 120),
+        'dividir_times_12x3_exato': gerar_times(12, 3),
+        'dividir_times_24x4': gerar_times(24, 4),
+        'dividir_times_40x2': gerar_times(40, 2),
+        'resumo_temporadas_pandas': lambda: analises.resumo_temporadas(db, motor='pandas'),
+        'matriz_confrontos_pandas': lambda: analises.matriz_confrontos(db, motor='pandas'),
+    }
+    # Motor analítico opcional: só entra se o duckdb estiver instalado
+    if analises.duckdb_disponivel():
+        benchmarks['resumo_temporadas_duckdb'] = lambda: analises.resumo_temporadas(db, motor='duckdb')
+        benchmarks['matriz_confrontos_duckdb'] = lambda: analises.matriz_confrontos(db, motor='duckdb')
+
+    resultados = {}
+    for nome, funcao in benchmarks.items():
+        resultados[nome] = medir(funcao, repeticoes)
+        print(f"  {nome:<36} {resultados[nome]['mediana_s'] * 1000:10.1f} ms")
+    return resultados
+
+
+def comparar(resultados, baseline, tolerancia):
+    """Lista os benchmarks que ficaram mais lentos que o baseline além da tolerância"""
+    regressoes = []
+    for nome, atual in resultados.items():
+        anterior = baseline.get('resultados', {}).get(nome)
+        if not anterior:
+            continue
+        limite = anterior['mediana_s'] * (1 + tolerancia)
+        if atual['mediana_s'] > limite:
+            regressoes.append((nome, anterior['mediana_s'], atual['mediana_s']))
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks da Diretoria da Jogatina")
+    parser.add_argument('--cenario', choices=CENARIOS.keys(), default='pequeno')
+    parser.add_argument('--jogadores', type=int, help="sobrescreve o nº de jogadores do cenário")
+    parser.add_argument('--partidas', type=int, help="sobrescreve o nº de partidas do cenário")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--saida', help="arquivo JSON para salvar os resultados")
+    parser.add_argument('--baseline', help="JSON de uma execução anterior para comparar")
+    parser.add_argument('--tolerancia', type=float, default=0.25,
+                        help="regressão máxima aceita (0.25 = 25%% mais lento)")
+    parser.add_argument('--dados', type=Path, default=PASTA_DADOS, help="pasta de cache dos bancos")
+    args = parser.parse_args(argv)
+
+    n_jogadores, n_partidas = CENARIOS[args.cenario]
+    n_jogadores = args.jogadores or n_jogadores
+    n_partidas = args.partidas or n_partidas
+
+    db = preparar_banco(n_jogadores, n_partidas, args.seed, args.dados)
+    print(f"Rodando benchmarks ({args.repeticoes} repetições)...")
+    resultados = executar(db, args.seed, args.repeticoes)
+
+    saida = {
+        'meta': {
+            'cenario': args.cenario,
+            'jogadores': n_jogadores,
+            'partidas': n_partidas,
+            'seed': args.seed,
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+        },
+        'resultados': resultados,
+    }
+    texto = json.dumps(saida, indent=2, ensure_ascii=False)
+    if args.saida:
+        Path(args.saida).write_text(texto, encoding='utf-8')
+    else:
+        print(texto)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        regressoes = comparar(resultados, baseline, args.tolerancia)
+        for nome, antes, depois in regressoes:
+            print(f"❌ Regressão em {nome}: {antes * 1000:.1f} ms → {depois * 1000:.1f} ms")
+        if regressoes:
+            return 1
+        print("✅ Nenhuma regressão acima da tolerância")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+Verificação da réplica por páginas (replicacao.py) contra um diretório
+local no lugar do Drive (ArmazenamentoPasta), sobre um banco sintético:
+- snapshot + segmentos restauram exatamente o banco enviado
+- compactação abre uma geração nova e apaga as antigas
+- segmento corrompido ou truncado é detectado na restauração
+- estado defasado (outra instância enviou) levanta ConflitoReplica
+
+Uso (na raiz do repositório):
+    python -m benchmarks.verificar_replicacao
+
+Sai com código 1 se alguma verificação falhar.
+"""
+import argparse
+import random
+import sys
+import tempfile
+import zlib
+from pathlib import Path
+
+import replicacao
+from benchmarks.gerador import gerar_banco
+from database import Database
+
+
+def _conferir(condicao, mensagem):
+    if not condicao:
+        raise AssertionError(mensagem)
+
+
+def _preparar(pasta, seed):
+    """Banco sintético pequeno + remoto vazio"""
+    caminho = Path(pasta) / 'replica.db'
+    gerar_banco(caminho, 12, 3000, seed=seed)
+    db = Database(str(caminho))
+    remoto = replicacao.ArmazenamentoPasta(Path(pasta) / 'remoto')
+    return db, remoto
+
+
+def _nova_partida(db, rng):
+    jogadores = rng.sample(db.get_jogadores()['id'].tolist(), 4)
+    db.add_partida(
+        rng.choice(db.get_jogos()['id'].tolist()), '2099-01-01',
+        [(j, pos, 0) for pos, j in enumerate(jogadores, 1)]
+    )
+
+
+def _enviar(db, remoto, estado):
+    return replicacao.replicar(remoto, replicacao.imagem_banco(db.db_name), estado)
+
+
+def verificar_restauracao(pasta, rng):
+    db, remoto = _preparar(pasta, rng.random())
+    estado = _enviar(db, remoto, None)
+    _conferir((estado.geracao, estado.seq) == (1, 0), "primeiro envio não é snapshot")
+
+    for seq in range(1, 4):
+        _nova_partida(db, rng)
+        estado = _enviar(db, remoto, estado)
+        _conferir((estado.geracao, estado.seq) == (1, seq),
+                  f"envio {seq} virou {estado.geracao}.{estado.seq}, não segmento")
+    _conferir(estado.bytes_segmentos < estado.bytes_snapshot, "segmentos maiores que o snapshot")
+    _conferir(_enviar(db, remoto, estado) == estado, "envio sem mudança gravou objeto novo")
+
+    imagem, restaurado = replicacao.restaurar(remoto)
+    _conferir(imagem == replicacao.imagem_banco(db.db_name), "imagem restaurada difere do banco")
+    _conferir(restaurado == estado, "estado restaurado difere do enviado")
+
+
+def verificar_compactacao(pasta, rng):
+    db, remoto = _preparar(pasta, rng.random())
+    maximo, replicacao.MAX_SEGMENTOS = replicacao.MAX_SEGMENTOS, 3
+    try:
+        estado = _enviar(db, remoto, None)
+        while estado.geracao == 1:
+            _nova_partida(db, rng)
+            estado = _enviar(db, remoto, estado)
+    finally:
+        replicacao.MAX_SEGMENTOS = maximo
+
+    objetos = replicacao._objetos(remoto, replicacao.PREFIXO)
+    _conferir(list(objetos) == [(2, 0)], f"gerações antigas não foram apagadas: {sorted(objetos)}")
+    imagem, restaurado = replicacao.restaurar(remoto)
+    _conferir(imagem == replicacao.imagem_banco(db.db_name), "imagem restaurada difere após compactar")
+    _conferir((restaurado.geracao, restaurado.seq) == (2, 0),
+              f"estado após compactar: {restaurado.geracao}.{restaurado.seq}")
+
+
+def verificar_corrupcao(pasta, rng):
+    db, remoto = _preparar(pasta, rng.random())
+    estado = _enviar(db, remoto, None)
+    _nova_partida(db, rng)
+    estado = _enviar(db, remoto, estado)
+    nome = replicacao._nome(replicacao.PREFIXO, estado.geracao, estado.seq)
+    original = remoto.ler(nome)
+    bruto = zlib.decompress(original)
+
+    danificados = {
+        'byte trocado': zlib.compress(bruto[:-5] + bytes([bruto[-5] ^ 0xFF]) + bruto[-4:]),
+        'conteúdo truncado': zlib.compress(bruto[:len(bruto) // 2]),
+        'arquivo truncado': original[:len(original) // 2],
+    }
+    for descricao, dados in danificados.items():
+        remoto.apagar(nome)
+        remoto.gravar(nome, dados)
+        try:
+            replicacao.restaurar(remoto)
+        except ValueError:
+            continue
+        raise AssertionError(f"segmento com {descricao} não foi detectado")
+
+
+def verificar_conflito(pasta, rng):
+    db, remoto = _preparar(pasta, rng.random())
+    antigo = _enviar(db, remoto, None)
+
+    # Remoto já tem réplica: sem estado não sobrescreve
+    try:
+        _enviar(db, remoto, None)
+        raise AssertionError("envio sem estado sobrescreveu a réplica existente")
+    except replicacao.ConflitoReplica:
+        pass
+
+    # Outra instância (estado restaurado) envia primeiro: o estado antigo ficou defasado
+    _, outra = replicacao.restaurar(remoto)
+    _nova_partida(db, rng)
+    _enviar(db, remoto, outra)
+    _nova_partida(db, rng)
+    try:
+        _enviar(db, remoto, antigo)
+        raise AssertionError("estado defasado não levantou ConflitoReplica")
+    except replicacao.ConflitoReplica:
+        pass
+
+    # Criação exclusiva: o mesmo próximo objeto não é gravado duas vezes
+    nome = replicacao._nome(replicacao.PREFIXO, 9, 0)
+    remoto.gravar(nome, b'primeiro')
+    try:
+        remoto.gravar(nome, b'segundo')
+        raise AssertionError("gravar sobrescreveu um objeto existente")
+    except FileExistsError:
+        pass
+    _conferir(remoto.ler(nome) == b'primeiro', "objeto existente foi alterado")
+
+
+VERIFICACOES = {
+    'restauracao': verificar_restauracao,
+    'compactacao': verificar_compactacao,
+    'corrupcao': verificar_corrupcao,
+    'conflito': verificar_conflito,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verifica a réplica por páginas num diretório local")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    falhas = 0
+    for nome, verificacao in VERIFICACOES.items():
+        with tempfile.TemporaryDirectory() as pasta:
+            try:
+                verificacao(pasta, rng)
+            except AssertionError as e:
+                falhas += 1
+                print(f"❌ {nome}: {e}")
+            else:
+                print(f"✅ {nome}")
+    return 1 if falhas else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,325 @@
+"""
+Histórico de partidas em memória, em colunas NumPy, um por arquivo de banco
+e compartilhado pelo processo inteiro: todas as sessões do Streamlit, a API
+e os benchmarks leem o mesmo snapshot em vez de reconsultar o SQLite.
+
+Uma linha por resultado, em ordem cronológica (data, partida_id), e arrays
+por partida que apontam para as linhas via `inicio`. A cada leitura a versão
+dos dados é conferida; se mudou, os eventos gravados desde a última leitura
+dizem o que fazer:
+- só partidas novas, depois da última do histórico: acrescenta as linhas delas
+- qualquer outra coisa (partida editada/removida, peso de jogo, escrita fora
+  do app, eventos já apagados): recarrega tudo
+Os arrays publicados nunca são alterados (writeable=False): quem pegou um
+snapshot pode usá-lo enquanto outra thread atualiza.
+
+Cópia em disco: uma pasta ao lado do banco (jogos.db.colunar/) com um .bin
+por coluna e um meta.json com a versão dos dados. Na partida do processo os
+.bin são mapeados em memória (np.memmap) e só os eventos desde aquela versão
+passam pelo SQL; partidas novas são acrescentadas no fim dos .bin. Recarga
+completa grava uma geração nova de arquivos e só então troca o meta.json.
+
+Fica num registro do módulo, como o escritor, e não no st.cache_resource:
+o app limpa o cache_resource a cada sessão nova.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from database import MAX_EVENTOS
+
+_historicos = {}
+_lock = threading.Lock()
+
+# Pasta da cópia em disco = caminho do banco + SUFIXO_DISCO
+SUFIXO_DISCO = '.colunar'
+# Muda quando o formato dos arquivos mudar: cópias antigas são ignoradas
+FORMATO_DISCO = 1
+
+# Colunas e tipos gravados em disco (little-endian fixo)
+_COLUNAS = {
+    'jogador_id': '<i8',
+    'posicao': '<i8',
+    'time_id': '<f8',
+    'partida_id': '<i8',
+    'data': '<M8[D]',
+    'jogo_id': '<i8',
+    'peso': '<f8',
+    'eh_jogo_time': '<U1',
+    'valida': '?',
+    'inicio': '<i8',   # em disco sem o último elemento (= linhas)
+}
+_POR_LINHA = ('jogador_id', 'posicao', 'time_id')
+
+_CONSULTA = """
+    SELECT
+        p.id as partida_id,
+        p.data,
+        p.eh_jogo_time,
+        p.valida_ranking,
+        p.jogo_id,
+        j.peso_bgg as peso,
+        r.jogador_id,
+        r.posicao,
+        r.time_id
+    FROM partidas p
+    JOIN jogos j ON p.jogo_id = j.id
+    JOIN resultados r ON p.id = r.partida_id
+    {filtro}
+    ORDER BY p.data ASC, p.id ASC
+"""
+
+
+def obter(db):
+    """Histórico do arquivo de `db` (criado na primeira chamada do processo)"""
+    chave = os.path.abspath(db.db_name)
+    with _lock:
+        historico = _historicos.get(chave)
+        if historico is None:
+            historico = _historicos[chave] = HistoricoColunar(db)
+        return historico
+
+
+class HistoricoColunar:
+    """
+    snapshot() -> dict de arrays com TODAS as partidas:
+    - por resultado: jogador_id, posicao, time_id
+    - por partida: partida_id, data (datetime64[D]), jogo_id, peso,
+      eh_jogo_time, valida (bool)
+    - inicio: resultados da partida i ficam em [inicio[i], inicio[i+1])
+    validas() -> o mesmo formato, só com as partidas válidas para ranking
+    """
+
+    def __init__(self, db, pasta=None):
+        self.db = db
+        self.pasta = Path(pasta or os.path.abspath(db.db_name) + SUFIXO_DISCO)
+        self._lock = threading.Lock()
+        self._versao = None
+        self._ultimo_evento = 0
+        self._snapshot = None
+        self._validas = None
+        self._disco = None     # meta.json como este processo leu/gravou por último
+        self.recargas = 0      # quantas vezes leu o histórico inteiro do SQLite
+        self.extensoes = 0     # quantas vezes só acrescentou partidas
+        self.do_disco = False  # se o snapshot atual começou da cópia em disco
+
+    def snapshot(self):
+        versao = self.db.get_versao_dados()
+        if versao != self._versao:
+            with self._lock:
+                if versao != self._versao:
+                    self._atualizar(versao)
+        return self._snapshot
+
+    def validas(self):
+        snapshot = self.snapshot()
+        validas = self._validas
+        if validas is None or validas[0] is not snapshot:
+            validas = (snapshot, _filtrar_partidas(snapshot, snapshot['valida']))
+            self._validas = validas
+        return validas[1]
+
+    def _atualizar(self, versao):
+        if self._snapshot is None:
+            lido = _ler_disco(self.pasta)
+            if lido is not None:
+                self._snapshot, self._disco = lido
+                self._ultimo_evento = self._disco['ultimo_evento']
+                self.do_disco = True
+
+        # Lê o último evento antes dos dados: um evento que chegar no meio
+        # é relido na próxima versão
+        ultimo_evento = self.db.get_ultimo_evento_id()
+        anterior = self._snapshot
+        novo = None
+        if anterior is not None:
+            novo = self._estender(ultimo_evento)
+        if novo is None:
+            novo = _congelar(_carregar(self.db))
+            self.recargas += 1
+            self.do_disco = False
+            self._disco = None
+        elif novo is not anterior:
+            self.extensoes += 1
+        self._snapshot, self._versao, self._ultimo_evento = novo, versao, ultimo_evento
+        self._disco = _gravar_disco(self.pasta, novo, self._disco, versao, ultimo_evento)
+
+    def _estender(self, ultimo_evento):
+        """Snapshot atual + partidas novas, ou None se precisa recarregar tudo"""
+        novos = ultimo_evento - self._ultimo_evento
+        if novos < 0 or novos > MAX_EVENTOS:
+            return None
+        eventos = self.db.get_eventos(self._ultimo_evento, limite=novos) if novos else []
+        if len(eventos) != novos or any(e.tipo != 'partida_adicionada' for e in eventos):
+            return None
+
+        snapshot = self._snapshot
+        if eventos:
+            extra = _carregar(self.db, [e.partida_id for e in eventos])
+            if len(extra['partida_id']):
+                # Partida retroativa mudaria a ordem: recarrega
+                ultima = (snapshot['data'][-1], snapshot['partida_id'][-1]) if len(snapshot['partida_id']) else None
+                if ultima is not None and (extra['data'][0], extra['partida_id'][0]) < ultima:
+                    return None
+                snapshot = _concatenar(snapshot, extra)
+
+        # Confere com o banco: escrita fora do app não deixa evento, e o
+        # banco pode ter sido trocado (Drive) depois da cópia em disco
+        conn = self.db.get_connection()
+        total, soma = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(partida_id), 0) FROM resultados"
+        ).fetchone()
+        conn.close()
+        if total != len(snapshot['jogador_id']):
+            return None
+        if soma != int(np.dot(np.diff(snapshot['inicio']), snapshot['partida_id'])):
+            return None
+        return _congelar(snapshot)
+
+
+def _carregar(db, partida_ids=None):
+    filtro, params = "", ()
+    if partida_ids is not None:
+        filtro = f"WHERE p.id IN ({','.join('?' * len(partida_ids))})"
+        params = tuple(int(p) for p in partida_ids)
+    conn = db.get_connection()
+    df = pd.read_sql_query(_CONSULTA.format(filtro=filtro), conn, params=params)
+    conn.close()
+
+    partida_ids = df['partida_id'].to_numpy(dtype=np.int64)
+    # Início de cada partida = linhas onde o partida_id muda
+    mudou = np.ones(len(df), dtype=bool)
+    mudou[1:] = partida_ids[1:] != partida_ids[:-1]
+    inicio = np.flatnonzero(mudou)
+
+    return {
+        'jogador_id': df['jogador_id'].to_numpy(dtype=np.int64),
+        'posicao': df['posicao'].to_numpy(dtype=np.int64),
+        'time_id': df['time_id'].to_numpy(dtype=np.float64),
+        'partida_id': partida_ids[inicio],
+        'data': df['data'].to_numpy(dtype='datetime64[D]')[inicio],
+        'jogo_id': df['jogo_id'].to_numpy(dtype=np.int64)[inicio],
+        'peso': df['peso'].to_numpy(dtype=np.float64)[inicio],
+        'eh_jogo_time': df['eh_jogo_time'].to_numpy(dtype='<U1')[inicio],
+        'valida': (df['valida_ranking'] == 'S').to_numpy()[inicio],
+        'inicio': np.append(inicio, len(df)).astype(np.int64),
+    }
+
+
+def _concatenar(a, b):
+    juntos = {
+        chave: np.concatenate([a[chave], b[chave]])
+        for chave in a if chave != 'inicio'
+    }
+    juntos['inicio'] = np.concatenate([a['inicio'][:-1], b['inicio'] + a['inicio'][-1]])
+    return juntos
+
+
+def _filtrar_partidas(historico, mascara):
+    """Mesmo formato, só com as partidas em `mascara`"""
+    if mascara.all():
+        return historico
+    tamanhos = np.diff(historico['inicio'])
+    linhas = np.repeat(mascara, tamanhos)
+    filtrado = {
+        chave: historico[chave][linhas] for chave in _POR_LINHA
+    }
+    filtrado.update({
+        chave: historico[chave][mascara]
+        for chave in ('partida_id', 'data', 'jogo_id', 'peso', 'eh_jogo_time', 'valida')
+    })
+    filtrado['inicio'] = np.concatenate([[0], np.cumsum(tamanhos[mascara])])
+    return _congelar(filtrado)
+
+
+def _congelar(historico):
+    for array in historico.values():
+        array.flags.writeable = False
+    return historico
+
+
+# === CÓPIA EM DISCO ===
+def _arquivo(pasta, chave, geracao):
+    return pasta / f"{chave}.{geracao}.bin"
+
+
+def _ler_meta(pasta):
+    try:
+        meta = json.loads((pasta / 'meta.json').read_text())
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get('formato') == FORMATO_DISCO else None
+
+
+def _ler_disco(pasta):
+    """(snapshot mapeado em memória, meta) ou None se não há cópia utilizável"""
+    meta = _ler_meta(pasta)
+    if meta is None:
+        return None
+    snapshot = {}
+    try:
+        for chave, dtype in _COLUNAS.items():
+            tamanho = meta['linhas'] if chave in _POR_LINHA else meta['partidas']
+            if tamanho == 0:
+                snapshot[chave] = np.empty(0, dtype=dtype)
+            else:
+                # view como ndarray comum: fatiar np.memmap cria outro memmap a cada vez
+                snapshot[chave] = np.memmap(_arquivo(pasta, chave, meta['geracao']),
+                                            dtype=dtype, mode='r', shape=(tamanho,)).view(np.ndarray)
+    except (OSError, ValueError, KeyError):
+        return None
+    snapshot['inicio'] = np.append(snapshot['inicio'], meta['linhas']).astype(np.int64)
+    return _congelar(snapshot), meta
+
+
+def _gravar_disco(pasta, snapshot, base, versao, ultimo_evento):
+    """
+    Atualiza a cópia em disco e devolve o meta gravado (None se não deu).
+    Com `base` (o meta de que o snapshot é continuação) e o disco ainda
+    igual a ela, só acrescenta as linhas novas; senão grava tudo numa
+    geração nova. Falha de escrita não impede o uso do snapshot em memória.
+    """
+    linhas, partidas = len(snapshot['jogador_id']), len(snapshot['partida_id'])
+    try:
+        pasta.mkdir(exist_ok=True)
+        atual = _ler_meta(pasta)
+        acrescentar = base is not None and atual == base
+        geracao = base['geracao'] if acrescentar else (atual or {}).get('geracao', 0) + 1
+
+        for chave, dtype in _COLUNAS.items():
+            valores = snapshot['inicio'][:-1] if chave == 'inicio' else snapshot[chave]
+            desde = 0
+            if acrescentar:
+                desde = base['linhas'] if chave in _POR_LINHA else base['partidas']
+                if desde == len(valores):
+                    continue
+            with open(_arquivo(pasta, chave, geracao), 'r+b' if acrescentar else 'wb') as f:
+                # Sobra de uma escrita interrompida fica além do que o meta diz
+                f.truncate(desde * np.dtype(dtype).itemsize)
+                f.seek(0, os.SEEK_END)
+                f.write(np.ascontiguousarray(valores[desde:], dtype=dtype).tobytes())
+
+        meta = {
+            'formato': FORMATO_DISCO,
+            'geracao': geracao,
+            'versao': versao,
+            'ultimo_evento': ultimo_evento,
+            'linhas': linhas,
+            'partidas': partidas,
+        }
+        temporario = pasta / 'meta.json.tmp'
+        temporario.write_text(json.dumps(meta))
+        os.replace(temporario, pasta / 'meta.json')
+
+        if not acrescentar:
+            for antigo in pasta.glob('*.bin'):
+                if not antigo.name.endswith(f".{geracao}.bin"):
+                    antigo.unlink(missing_ok=True)
+        return meta
+    except OSError as e:
+        print(f"Erro ao gravar histórico colunar em {pasta}: {e}")
+        return None
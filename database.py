@@ -1,22 +1,161 @@
+import os
 import sqlite3
 from datetime import datetime
 import pandas as pd
 import tempfile
+import uuid
 from pathlib import Path
 
+import escritor
+from registros import (EstatisticaSorteio, EstatisticasJogador, Evento, Jogatina,
+                       MetricasDashboard, Partida, Resultado)
+
+# Tabelas cujas escritas sobem a versão dos dados (metadados.versao_dados)
+TABELAS_VERSIONADAS = ('jogadores', 'jogos', 'jogatinas', 'partidas', 'resultados')
+
+MAX_EVENTOS = 1000  # eventos mais antigos são apagados
+
+# Métricas do 🏠 Início por banco (caminho absoluto): (chave, MetricasDashboard).
+# No processo e não na instância, porque o app cria um Database a cada rerun
+_cache_metricas = {}
+
+# Partidas de antes da coluna uuid ganham um uuid derivado do conteúdo: duas
+# cópias do mesmo banco antigo migradas separadamente chegam ao mesmo uuid
+_NAMESPACE_PARTIDAS = uuid.UUID('6f1d3c52-4b8e-4f0a-9a57-3c1f2d8e7b10')
+
+
+def uuid_legado(partida_id, data, jogo_id):
+    return str(uuid.uuid5(_NAMESPACE_PARTIDAS, f"{int(partida_id)}|{data}|{int(jogo_id)}"))
+
+
+def _uuids_por_id(conn):
+    """{partida_id: uuid}; banco de antes da coluna uuid usa o uuid_legado"""
+    tem_uuid = 'uuid' in {coluna[1] for coluna in conn.execute("PRAGMA table_info(partidas)")}
+    return {
+        partida_id: uuid_partida or uuid_legado(partida_id, data, jogo_id)
+        for partida_id, uuid_partida, data, jogo_id in conn.execute(
+            f"SELECT id, {'uuid' if tem_uuid else 'NULL'}, data, jogo_id FROM partidas"
+        )
+    }
+
+
+def uuids_partidas(conn):
+    """Conjunto dos uuids das partidas de uma conexão qualquer"""
+    return set(_uuids_por_id(conn).values())
+
+
+def ler_partidas(conn):
+    """
+    Partidas de uma conexão qualquer (ex.: cópia do Drive), por uuid:
+    {uuid: (data, jogo, valida_ranking, eh_jogo_time, observacoes,
+            (data, local) da jogatina ou None,
+            [(jogador, posicao, pontuacao, time_id), ...])}
+    Jogo e jogadores vêm pelo nome e a jogatina por (data, local), que é o
+    que casa entre bancos diferentes.
+    """
+    uuids = _uuids_por_id(conn)
+    partidas = {}
+    for partida_id, data, jogo, valida_ranking, eh_jogo_time, observacoes, jogatina_id, \
+            jogatina_data, jogatina_local in conn.execute("""
+        SELECT p.id, p.data, j.nome, p.valida_ranking, p.eh_jogo_time, p.observacoes,
+               jt.id, jt.data, jt.local
+        FROM partidas p
+        JOIN jogos j ON j.id = p.jogo_id
+        LEFT JOIN jogatinas jt ON jt.id = p.jogatina_id
+    """):
+        jogatina = (jogatina_data, jogatina_local) if jogatina_id is not None else None
+        partidas[uuids[partida_id]] = (data, jogo, valida_ranking, eh_jogo_time, observacoes, jogatina, [])
+    for partida_id, jogador, posicao, pontuacao, time_id in conn.execute("""
+        SELECT r.partida_id, jog.nome, r.posicao, r.pontuacao, r.time_id
+        FROM resultados r
+        JOIN jogadores jog ON jog.id = r.jogador_id
+        ORDER BY r.id
+    """):
+        if partida_id in uuids:
+            partidas[uuids[partida_id]][6].append((jogador, posicao, pontuacao, time_id))
+    return partidas
+
+
+def _colunas_por_tabela(conn):
+    return {
+        tabela: {coluna[1] for coluna in conn.execute(f"PRAGMA table_info('{tabela}')")}
+        for tabela, in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+    }
+
+
 class Database:
-    def __init__(self, db_name='jogos.db'):
+    # Classe das conexões (a instrumentação troca por uma subclasse)
+    fabrica_conexao = sqlite3.Connection
+    
+    def __init__(self, db_name='jogos.db', somente_leitura=False):
+        """
+        somente_leitura: conexões com mode=ro e sem create_tables (nada de
+        migração/backfill); o esquema tem que estar atual, senão ValueError
+        """
         self.db_name = db_name
-        self.create_tables()
+        self.somente_leitura = somente_leitura
+        if somente_leitura:
+            self._conferir_esquema()
+        else:
+            self.create_tables()
     
     def get_connection(self):
-        conn = sqlite3.connect(self.db_name, timeout=30)
+        if self.somente_leitura:
+            return sqlite3.connect(f"file:{self.db_name}?mode=ro", uri=True, timeout=30,
+                                   factory=self.fabrica_conexao)
+        conn = sqlite3.connect(self.db_name, timeout=30, factory=self.fabrica_conexao)
         conn.execute("PRAGMA journal_mode=WAL;")
         conn.execute("PRAGMA synchronous=NORMAL;")
         return conn
     
-    def create_tables(self):
+    def executar_escrita(self, funcao, transacao=True):
+        """
+        Roda funcao(conn) no escritor único do banco e devolve o retorno.
+        Toda escrita passa por aqui: a função não dá commit, o escritor
+        junta escritas simultâneas numa transação só (ver escritor.py).
+        """
+        if self.somente_leitura:
+            raise sqlite3.OperationalError(f"{self.db_name} aberto somente para leitura")
+        escritor_banco = escritor.obter(self.db_name, self._conexao_escritor)
+        return escritor_banco.executar(funcao, transacao).result()
+    
+    def _conexao_escritor(self):
         conn = self.get_connection()
+        conn.isolation_level = None  # transações controladas pelo escritor
+        return conn
+    
+    def create_tables(self):
+        self.executar_escrita(self._criar_tabelas)
+    
+    def _conferir_esquema(self):
+        """Tabelas e colunas que create_tables criaria precisam existir no banco"""
+        esperado = sqlite3.connect(':memory:')
+        try:
+            self._criar_tabelas(esperado)
+            colunas_esperadas = _colunas_por_tabela(esperado)
+        finally:
+            esperado.close()
+        try:
+            conn = self.get_connection()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Não foi possível abrir {self.db_name}: {e}") from None
+        try:
+            colunas = _colunas_por_tabela(conn)
+        finally:
+            conn.close()
+        faltando = []
+        for tabela, esperadas in sorted(colunas_esperadas.items()):
+            if tabela not in colunas:
+                faltando.append(tabela)
+            else:
+                faltando += [f"{tabela}.{coluna}" for coluna in sorted(esperadas - colunas[tabela])]
+        if faltando:
+            raise ValueError(
+                f"{self.db_name} não tem o esquema atual (faltam: {', '.join(faltando)}). "
+                "Abra o app uma vez para criar/migrar o banco."
+            )
+    
+    def _criar_tabelas(self, conn):
         cursor = conn.cursor()
         
         # Tabela de jogatinas (sessões de jogos)
@@ -70,6 +209,7 @@ class Database:
                 valida_ranking TEXT DEFAULT 'S',
                 eh_jogo_time TEXT DEFAULT 'N',
                 observacoes TEXT,
+                uuid TEXT,
                 FOREIGN KEY (jogo_id) REFERENCES jogos(id),
                 FOREIGN KEY (jogatina_id) REFERENCES jogatinas(id)
             )
@@ -89,20 +229,408 @@ class Database:
             )
         """)
         
-        conn.commit()
+        # Confronto direto (mini-partidas entre cada par de jogadores)
+        # Guarda as duas direções: (a, b) e (b, a)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS confronto_direto (
+                jogador_a INTEGER NOT NULL,
+                jogador_b INTEGER NOT NULL,
+                vitorias INTEGER DEFAULT 0,
+                derrotas INTEGER DEFAULT 0,
+                empates INTEGER DEFAULT 0,
+                vitorias_ponderadas REAL DEFAULT 0,
+                derrotas_ponderadas REAL DEFAULT 0,
+                empates_ponderados REAL DEFAULT 0,
+                PRIMARY KEY (jogador_a, jogador_b)
+            ) WITHOUT ROWID
+        """)
+        
+        # Elo por jogo e por faixa de peso (preenchidos pelo recálculo de Elos)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS elos_jogo (
+                jogo_id INTEGER NOT NULL,
+                jogador_id INTEGER NOT NULL,
+                elo REAL NOT NULL,
+                partidas INTEGER NOT NULL,
+                PRIMARY KEY (jogo_id, jogador_id)
+            ) WITHOUT ROWID
+        """)
+        
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS elos_faixa_peso (
+                faixa TEXT NOT NULL,
+                jogador_id INTEGER NOT NULL,
+                elo REAL NOT NULL,
+                partidas INTEGER NOT NULL,
+                PRIMARY KEY (faixa, jogador_id)
+            ) WITHOUT ROWID
+        """)
+        
+        # Versão dos dados: sobe a cada escrita nas tabelas principais. Vem de
+        # triggers para pegar também escritas fora do app (scripts, sqlite3).
+        # É o ETag da API e a chave dos caches por versão.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS metadados (
+                chave TEXT PRIMARY KEY,
+                valor INTEGER NOT NULL
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("INSERT OR IGNORE INTO metadados (chave, valor) VALUES ('versao_dados', 1)")
+        for tabela in TABELAS_VERSIONADAS:
+            for operacao in ('INSERT', 'UPDATE', 'DELETE'):
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_versao_{tabela}_{operacao.lower()}
+                    AFTER {operacao} ON {tabela}
+                    BEGIN
+                        UPDATE metadados SET valor = valor + 1 WHERE chave = 'versao_dados';
+                    END
+                """)
+        
+        # Eventos que mudam os rankings, gravados na mesma transação da escrita
+        # (quem acompanha ao vivo lê daqui o que mudou desde o último id)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS eventos (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                quando TEXT NOT NULL,
+                tipo TEXT NOT NULL,
+                partida_id INTEGER,
+                jogo_id INTEGER,
+                versao INTEGER NOT NULL
+            )
+        """)
+        
+        # Partidas e última data de cada jogador em cada jogo (todas as
+        # partidas, válidas ou não), mantido por _atualizar_agregados_partida.
+        # Alimenta o recomendador: "há quanto tempo o grupo não joga isto".
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS jogos_jogador (
+                jogador_id INTEGER NOT NULL,
+                jogo_id INTEGER NOT NULL,
+                partidas INTEGER NOT NULL,
+                ultima_data DATE NOT NULL,
+                PRIMARY KEY (jogador_id, jogo_id)
+            ) WITHOUT ROWID
+        """)
+        
+        # Resumo de cada jogador para a página de perfil (uma linha por
+        # jogador, lida pela chave). Recalculado só para os jogadores da
+        # partida a cada escrita (_recalcular_estatisticas_jogadores).
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS estatisticas_jogador (
+                jogador_id INTEGER PRIMARY KEY,
+                partidas INTEGER NOT NULL,
+                vitorias INTEGER NOT NULL,
+                soma_posicoes INTEGER NOT NULL,
+                primeira_data DATE NOT NULL,
+                ultima_data DATE NOT NULL,
+                sequencia_atual INTEGER NOT NULL,
+                maior_sequencia INTEGER NOT NULL,
+                jogo_favorito_id INTEGER,
+                jogo_favorito_partidas INTEGER,
+                melhor_jogo_id INTEGER,
+                melhor_jogo_peso REAL
+            )
+        """)
+        
+        # Sorteios de primeiro jogador (ferramenta Sorteador). partida_id é
+        # preenchido quando a partida seguinte é registrada com o sorteio.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sorteios (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                quando TEXT NOT NULL,
+                jogatina_id INTEGER,
+                vencedor_id INTEGER NOT NULL,
+                participantes TEXT NOT NULL,
+                modo TEXT NOT NULL,
+                partida_id INTEGER,
+                FOREIGN KEY (jogatina_id) REFERENCES jogatinas(id),
+                FOREIGN KEY (vencedor_id) REFERENCES jogadores(id),
+                FOREIGN KEY (partida_id) REFERENCES partidas(id)
+            )
+        """)
+        
+        # Agregado por jogador, atualizado na transação de cada sorteio: os
+        # pesos do sorteio justo saem daqui sem varrer a tabela sorteios.
+        # esperado = soma de 1/n das participações (vezes que "deveria" ter começado)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sorteios_jogador (
+                jogador_id INTEGER PRIMARY KEY,
+                participacoes INTEGER NOT NULL,
+                vezes_sorteado INTEGER NOT NULL,
+                esperado REAL NOT NULL,
+                desde_ultimo INTEGER NOT NULL,
+                ultimo_sorteio_id INTEGER
+            ) WITHOUT ROWID
+        """)
+        
+        # uuid: identidade estável da partida entre instâncias (mescla do Drive)
+        if 'uuid' not in {coluna[1] for coluna in cursor.execute("PRAGMA table_info(partidas)")}:
+            cursor.execute("ALTER TABLE partidas ADD COLUMN uuid TEXT")
+        cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_partidas_uuid ON partidas(uuid)")
+        cursor.executemany(
+            "UPDATE partidas SET uuid = ? WHERE id = ?",
+            [(uuid_legado(*linha), linha[0])
+             for linha in cursor.execute("SELECT id, data, jogo_id FROM partidas WHERE uuid IS NULL").fetchall()]
+        )
+        
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_resultados_partida ON resultados(partida_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_resultados_jogador ON resultados(jogador_id, partida_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_partidas_data ON partidas(data)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_partidas_jogatina ON partidas(jogatina_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jogos_faixa_jogadores ON jogos(min_jogadores, max_jogadores)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_elos_jogo_jogador ON elos_jogo(jogador_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_sorteios_jogatina ON sorteios(jogatina_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_sorteios_partida ON sorteios(partida_id)")
+        
+        # Preenche os agregados em bancos que já tinham partidas
+        vazio = cursor.execute("SELECT COUNT(*) FROM confronto_direto").fetchone()[0] == 0
+        if vazio:
+            self._reconstruir_confronto_direto(cursor)
+        if cursor.execute("SELECT 1 FROM jogos_jogador LIMIT 1").fetchone() is None:
+            cursor.execute("""
+                INSERT INTO jogos_jogador (jogador_id, jogo_id, partidas, ultima_data)
+                SELECT r.jogador_id, p.jogo_id, COUNT(*), MAX(p.data)
+                FROM resultados r
+                JOIN partidas p ON p.id = r.partida_id
+                GROUP BY r.jogador_id, p.jogo_id
+            """)
+        if cursor.execute("SELECT 1 FROM estatisticas_jogador LIMIT 1").fetchone() is None:
+            self._recalcular_estatisticas_jogadores(
+                cursor, [linha[0] for linha in cursor.execute("SELECT DISTINCT jogador_id FROM resultados")]
+            )
+    
+    # === AGREGADOS ===
+    # Mini-partidas de cada par de jogadores de uma partida válida.
+    # Jogo de time: só enfrenta quem está em outra posição (outro time).
+    # Peso ajustado = peso - 1, igual ao aproveitamento (peso 1.0 não conta).
+    _CONFRONTOS_SELECT = """
+        SELECT 
+            ra.jogador_id as jogador_a,
+            rb.jogador_id as jogador_b,
+            ra.posicao < rb.posicao as v,
+            ra.posicao > rb.posicao as d,
+            ra.posicao = rb.posicao as e,
+            (ra.posicao < rb.posicao) * MAX(j.peso_bgg - 1, 0) as vp,
+            (ra.posicao > rb.posicao) * MAX(j.peso_bgg - 1, 0) as dp,
+            (ra.posicao = rb.posicao) * MAX(j.peso_bgg - 1, 0) as ep
+        FROM resultados ra
+        JOIN resultados rb ON rb.partida_id = ra.partida_id AND rb.jogador_id != ra.jogador_id
+        JOIN partidas p ON p.id = ra.partida_id
+        JOIN jogos j ON j.id = p.jogo_id
+        WHERE p.valida_ranking = 'S'
+          AND (p.eh_jogo_time != 'S' OR ra.posicao != rb.posicao)
+    """
+    
+    def _reconstruir_confronto_direto(self, cursor):
+        """Recalcula o confronto direto inteiro (ex.: após mudar peso de jogo)"""
+        cursor.execute("DELETE FROM confronto_direto")
+        cursor.execute(f"""
+            INSERT INTO confronto_direto 
+            (jogador_a, jogador_b, vitorias, derrotas, empates,
+             vitorias_ponderadas, derrotas_ponderadas, empates_ponderados)
+            SELECT jogador_a, jogador_b, SUM(v), SUM(d), SUM(e), SUM(vp), SUM(dp), SUM(ep)
+            FROM ({self._CONFRONTOS_SELECT})
+            GROUP BY jogador_a, jogador_b
+        """)
+    
+    def _atualizar_agregados_partida(self, cursor, partida_id, sinal):
+        """
+        Aplica (sinal=1) ou remove (sinal=-1) uma partida dos agregados.
+        Deve rodar na mesma transação da escrita: depois de inserir os
+        resultados ou antes de apagá-los.
+        """
+        cursor.execute(f"""
+            INSERT INTO confronto_direto 
+            (jogador_a, jogador_b, vitorias, derrotas, empates,
+             vitorias_ponderadas, derrotas_ponderadas, empates_ponderados)
+            SELECT jogador_a, jogador_b, ? * v, ? * d, ? * e, ? * vp, ? * dp, ? * ep
+            FROM ({self._CONFRONTOS_SELECT} AND ra.partida_id = ?)
+            WHERE true
+            ON CONFLICT (jogador_a, jogador_b) DO UPDATE SET
+                vitorias = vitorias + excluded.vitorias,
+                derrotas = derrotas + excluded.derrotas,
+                empates = empates + excluded.empates,
+                vitorias_ponderadas = vitorias_ponderadas + excluded.vitorias_ponderadas,
+                derrotas_ponderadas = derrotas_ponderadas + excluded.derrotas_ponderadas,
+                empates_ponderados = empates_ponderados + excluded.empates_ponderados
+        """, (sinal,) * 6 + (partida_id,))
+        
+        if sinal > 0:
+            cursor.execute("""
+                INSERT INTO jogos_jogador (jogador_id, jogo_id, partidas, ultima_data)
+                SELECT r.jogador_id, p.jogo_id, 1, p.data
+                FROM resultados r
+                JOIN partidas p ON p.id = r.partida_id
+                WHERE r.partida_id = ?
+                ON CONFLICT (jogador_id, jogo_id) DO UPDATE SET
+                    partidas = partidas + 1,
+                    ultima_data = MAX(ultima_data, excluded.ultima_data)
+            """, (partida_id,))
+        else:
+            cursor.execute(
+                "DELETE FROM confronto_direto WHERE vitorias = 0 AND derrotas = 0 AND empates = 0"
+            )
+            # A última data pode ter sido esta partida: recalcula com as outras
+            cursor.execute("""
+                UPDATE jogos_jogador SET
+                    partidas = partidas - 1,
+                    ultima_data = COALESCE((
+                        SELECT MAX(p2.data)
+                        FROM resultados r2
+                        JOIN partidas p2 ON p2.id = r2.partida_id
+                        WHERE r2.jogador_id = jogos_jogador.jogador_id
+                          AND p2.jogo_id = jogos_jogador.jogo_id
+                          AND p2.id != ?
+                    ), ultima_data)
+                WHERE (jogador_id, jogo_id) IN (
+                    SELECT r.jogador_id, p.jogo_id
+                    FROM resultados r
+                    JOIN partidas p ON p.id = r.partida_id
+                    WHERE r.partida_id = ?
+                )
+            """, (partida_id, partida_id))
+            cursor.execute("DELETE FROM jogos_jogador WHERE partidas <= 0")
+        
+        # Depois do jogos_jogador: o jogo favorito usa a contagem atualizada
+        if sinal > 0:
+            self._acrescentar_estatisticas_partida(cursor, partida_id)
+        else:
+            jogadores = [linha[0] for linha in cursor.execute(
+                "SELECT jogador_id FROM resultados WHERE partida_id = ?", (partida_id,)
+            )]
+            self._recalcular_estatisticas_jogadores(cursor, jogadores, ignorar_partida=partida_id)
+    
+    def _acrescentar_estatisticas_partida(self, cursor, partida_id):
+        """
+        Soma uma partida recém-inserida em estatisticas_jogador. Se ela é a
+        última do jogador (o normal: registrar a partida de hoje) a linha é
+        atualizada direto; partida retroativa ou editada muda as sequências,
+        então o jogador é refeito inteiro.
+        """
+        ultima_partida = cursor.execute("SELECT MAX(id) FROM partidas").fetchone()[0]
+        linhas = cursor.execute("""
+            SELECT r.jogador_id, r.posicao, p.data, p.jogo_id, j.peso_bgg, jj.partidas,
+                   e.ultima_data, e.sequencia_atual, e.jogo_favorito_id,
+                   e.jogo_favorito_partidas, e.melhor_jogo_peso
+            FROM resultados r
+            JOIN partidas p ON p.id = r.partida_id
+            JOIN jogos j ON j.id = p.jogo_id
+            JOIN jogos_jogador jj ON jj.jogador_id = r.jogador_id AND jj.jogo_id = p.jogo_id
+            LEFT JOIN estatisticas_jogador e ON e.jogador_id = r.jogador_id
+            WHERE r.partida_id = ?
+        """, (partida_id,)).fetchall()
+        
+        refazer = []
+        for (jogador_id, posicao, data, jogo_id, peso, partidas_jogo, ultima_data,
+             sequencia, favorito, favorito_partidas, melhor_peso) in linhas:
+            if partida_id != ultima_partida or ultima_data is None or data < ultima_data:
+                refazer.append(jogador_id)
+                continue
+            venceu = posicao == 1
+            sequencia = sequencia + 1 if venceu else 0
+            if jogo_id == favorito or partidas_jogo > favorito_partidas:
+                favorito, favorito_partidas = jogo_id, partidas_jogo
+            melhor = venceu and peso is not None and (melhor_peso is None or peso > melhor_peso)
+            cursor.execute("""
+                UPDATE estatisticas_jogador SET
+                    partidas = partidas + 1,
+                    vitorias = vitorias + ?,
+                    soma_posicoes = soma_posicoes + ?,
+                    ultima_data = ?,
+                    sequencia_atual = ?,
+                    maior_sequencia = MAX(maior_sequencia, ?),
+                    jogo_favorito_id = ?,
+                    jogo_favorito_partidas = ?,
+                    melhor_jogo_id = CASE WHEN ? THEN ? ELSE melhor_jogo_id END,
+                    melhor_jogo_peso = CASE WHEN ? THEN ? ELSE melhor_jogo_peso END
+                WHERE jogador_id = ?
+            """, (int(venceu), posicao, data, sequencia, sequencia, favorito, favorito_partidas,
+                  melhor, jogo_id, melhor, peso, jogador_id))
+        
+        self._recalcular_estatisticas_jogadores(cursor, refazer)
+    
+    def _recalcular_estatisticas_jogadores(self, cursor, jogador_ids, ignorar_partida=None):
+        """
+        Refaz a linha de estatisticas_jogador de cada jogador a partir das
+        partidas dele (índice idx_resultados_jogador). ignorar_partida: partida
+        que está sendo removida, mas cujos resultados ainda existem.
+        """
+        for jogador_id in jogador_ids:
+            linhas = cursor.execute("""
+                SELECT r.posicao, p.data, p.jogo_id, j.peso_bgg
+                FROM resultados r
+                JOIN partidas p ON p.id = r.partida_id
+                JOIN jogos j ON j.id = p.jogo_id
+                WHERE r.jogador_id = ? AND r.partida_id != ?
+                ORDER BY p.data, p.id
+            """, (int(jogador_id), ignorar_partida or -1)).fetchall()
+            if not linhas:
+                cursor.execute("DELETE FROM estatisticas_jogador WHERE jogador_id = ?", (int(jogador_id),))
+                continue
+            
+            sequencia = maior_sequencia = 0
+            partidas_por_jogo = {}
+            favorito = None
+            melhor_jogo, melhor_peso = None, None
+            for posicao, _, jogo_id, peso in linhas:
+                partidas_por_jogo[jogo_id] = partidas_por_jogo.get(jogo_id, 0) + 1
+                # Empate de contagem: fica o que chegou nela primeiro
+                if favorito is None or partidas_por_jogo[jogo_id] > partidas_por_jogo[favorito]:
+                    favorito = jogo_id
+                if posicao == 1:
+                    sequencia += 1
+                    maior_sequencia = max(maior_sequencia, sequencia)
+                    if peso is not None and (melhor_peso is None or peso > melhor_peso):
+                        melhor_jogo, melhor_peso = jogo_id, peso
+                else:
+                    sequencia = 0
+            
+            cursor.execute("""
+                INSERT OR REPLACE INTO estatisticas_jogador
+                (jogador_id, partidas, vitorias, soma_posicoes, primeira_data, ultima_data,
+                 sequencia_atual, maior_sequencia, jogo_favorito_id, jogo_favorito_partidas,
+                 melhor_jogo_id, melhor_jogo_peso)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                int(jogador_id), len(linhas), sum(1 for linha in linhas if linha[0] == 1),
+                sum(linha[0] for linha in linhas), linhas[0][1], linhas[-1][1],
+                sequencia, maior_sequencia, favorito, partidas_por_jogo[favorito],
+                melhor_jogo, melhor_peso
+            ))
+    
+    def _registrar_evento(self, cursor, tipo, partida_id=None, jogo_id=None):
+        """Grava um evento na transação da escrita (depois das alterações, para pegar a versão final)"""
+        cursor.execute("""
+            INSERT INTO eventos (quando, tipo, partida_id, jogo_id, versao)
+            SELECT ?, ?, ?, ?, valor FROM metadados WHERE chave = 'versao_dados'
+        """, (datetime.now().isoformat(timespec='seconds'), tipo, partida_id, jogo_id))
+        cursor.execute("DELETE FROM eventos WHERE id <= ?", (cursor.lastrowid - MAX_EVENTOS,))
+    
+    def get_eventos(self, desde_id=0, limite=100):
+        """Eventos com id > desde_id, do mais antigo para o mais novo (lista de Evento)"""
+        conn = self.get_connection()
+        linhas = conn.execute(
+            f"SELECT {Evento.COLUNAS} FROM eventos WHERE id > ? ORDER BY id LIMIT ?",
+            (int(desde_id), int(limite))
+        ).fetchall()
         conn.close()
+        return [Evento(*linha) for linha in linhas]
+    
+    def get_ultimo_evento_id(self):
+        conn = self.get_connection()
+        ultimo = conn.execute("SELECT COALESCE(MAX(id), 0) FROM eventos").fetchone()[0]
+        conn.close()
+        return ultimo
     
     # === JOGADORES ===
     def add_jogador(self, nome, elo=1500):
-        conn = self.get_connection()
         try:
-            conn.execute("INSERT INTO jogadores (nome, elo) VALUES (?, ?)", (nome, elo))
-            conn.commit()
+            self.executar_escrita(
+                lambda conn: conn.execute("INSERT INTO jogadores (nome, elo) VALUES (?, ?)", (nome, elo))
+            )
             return True
         except sqlite3.IntegrityError:
             return False
-        finally:
-            conn.close()
     
     def get_jogadores(self, apenas_ativos=True):
         conn = self.get_connection()
@@ -112,50 +640,68 @@ class Database:
             query = "SELECT * FROM jogadores ORDER BY nome"
         df = pd.read_sql_query(query, conn)
         conn.close()
-        # Retorna cópia para evitar cache do Streamlit
-        return df.copy()
+        return df
     
     def desativar_jogador(self, jogador_id):
         jogador_id = int(jogador_id)
-        conn = self.get_connection()
-        conn.execute("UPDATE jogadores SET ativo = 0 WHERE id = ?", (jogador_id,))
-        conn.commit()
-        conn.close()
+        self.executar_escrita(
+            lambda conn: conn.execute("UPDATE jogadores SET ativo = 0 WHERE id = ?", (jogador_id,))
+        )
     
     def reativar_jogador(self, jogador_id):
         """Reativa um jogador desativado"""
         jogador_id = int(jogador_id)
-        conn = self.get_connection()
-        conn.execute("UPDATE jogadores SET ativo = 1 WHERE id = ?", (jogador_id,))
-        conn.commit()
-        conn.close()
+        self.executar_escrita(
+            lambda conn: conn.execute("UPDATE jogadores SET ativo = 1 WHERE id = ?", (jogador_id,))
+        )
     
     def update_jogador(self, jogador_id, nome):
         """Atualiza dados de um jogador (apenas nome - ELO é calculado)"""
         jogador_id = int(jogador_id)
-        conn = self.get_connection()
         try:
-            conn.execute("UPDATE jogadores SET nome = ? WHERE id = ?", (nome, jogador_id))
-            conn.commit()
+            self.executar_escrita(
+                lambda conn: conn.execute("UPDATE jogadores SET nome = ? WHERE id = ?", (nome, jogador_id))
+            )
             return True
         except sqlite3.IntegrityError:
             return False
-        finally:
-            conn.close()
+    
+    def get_estatisticas_jogador(self, jogador_id):
+        """EstatisticasJogador (registros.py) ou None se o jogador ainda não jogou"""
+        conn = self.get_connection()
+        linha = conn.execute(f"""
+            SELECT {EstatisticasJogador.COLUNAS}
+            FROM estatisticas_jogador e
+            LEFT JOIN jogos fav ON fav.id = e.jogo_favorito_id
+            LEFT JOIN jogos mel ON mel.id = e.melhor_jogo_id
+            WHERE e.jogador_id = ?
+        """, (int(jogador_id),)).fetchone()
+        conn.close()
+        return EstatisticasJogador(*linha) if linha else None
+    
+    def get_jogos_mais_jogados(self, jogador_id, limit=5):
+        """Jogos mais jogados pelo jogador (jogos_jogador, pela chave)"""
+        conn = self.get_connection()
+        df = pd.read_sql_query("""
+            SELECT j.nome as jogo, jj.partidas, jj.ultima_data
+            FROM jogos_jogador jj
+            JOIN jogos j ON j.id = jj.jogo_id
+            WHERE jj.jogador_id = ?
+            ORDER BY jj.partidas DESC, jj.ultima_data DESC
+            LIMIT ?
+        """, conn, params=(int(jogador_id), int(limit)))
+        conn.close()
+        return df
     
     # === JOGATINAS ===
     def add_jogatina(self, data, local=None, observacoes=None):
         """Adiciona uma nova jogatina (sessão de jogos)"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO jogatinas (data, local, observacoes) VALUES (?, ?, ?)",
-            (data, local, observacoes)
+        return self.executar_escrita(
+            lambda conn: conn.execute(
+                "INSERT INTO jogatinas (data, local, observacoes) VALUES (?, ?, ?)",
+                (data, local, observacoes)
+            ).lastrowid
         )
-        jogatina_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        return jogatina_id
     
     def get_jogatinas(self, limit=None):
         conn = self.get_connection()
@@ -167,39 +713,109 @@ class Database:
         return df
     
     def get_jogatina_by_id(self, jogatina_id):
+        """Retorna a Jogatina (registros.py) ou None"""
         conn = self.get_connection()
-        query = "SELECT * FROM jogatinas WHERE id = ?"
-        df = pd.read_sql_query(query, conn, params=(jogatina_id,))
+        linha = conn.execute(
+            f"SELECT {Jogatina.COLUNAS} FROM jogatinas WHERE id = ?", (int(jogatina_id),)
+        ).fetchone()
         conn.close()
-        return df.iloc[0] if len(df) > 0 else None
+        return Jogatina(*linha) if linha else None
     
     def get_or_create_jogatina(self, data, local=None):
         """Pega jogatina da data ou cria se não existir"""
-        conn = self.get_connection()
+        return self.executar_escrita(lambda conn: self._obter_ou_criar_jogatina(conn, data, local))
+    
+    def _obter_ou_criar_jogatina(self, conn, data, local=None):
         cursor = conn.cursor()
         
         # Tenta achar
         result = cursor.execute("SELECT id FROM jogatinas WHERE data = ?", (data,)).fetchone()
         
         if result:
-            jogatina_id = int(result[0])  # Força int
-            conn.close()
-            return jogatina_id
+            return int(result[0])  # Força int
         else:
             # Cria nova
             cursor.execute("INSERT INTO jogatinas (data, local) VALUES (?, ?)", (data, local))
-            jogatina_id = int(cursor.lastrowid)  # Força int
-            conn.commit()
-            conn.close()
-            return jogatina_id
+            return int(cursor.lastrowid)  # Força int
+    
+    # === SORTEIOS ===
+    def registrar_sorteio(self, participantes_ids, vencedor_id, modo='aleatorio', data=None):
+        """
+        Grava um sorteio de primeiro jogador e atualiza sorteios_jogador.
+        Liga à jogatina da data, se já existir (não cria jogatina vazia).
+        Retorna o id do sorteio ou None em caso de erro.
+        """
+        participantes = [int(j) for j in participantes_ids]
+        vencedor_id = int(vencedor_id)
+        data = data or datetime.now().date().isoformat()
+        
+        def escrita(conn):
+            jogatina = conn.execute("SELECT id FROM jogatinas WHERE data = ?", (data,)).fetchone()
+            sorteio_id = conn.execute(
+                """INSERT INTO sorteios (quando, jogatina_id, vencedor_id, participantes, modo)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (datetime.now().isoformat(timespec='seconds'), jogatina[0] if jogatina else None,
+                 vencedor_id, ','.join(map(str, participantes)), modo)
+            ).lastrowid
+            chance = 1 / len(participantes)
+            conn.executemany("""
+                INSERT INTO sorteios_jogador
+                (jogador_id, participacoes, vezes_sorteado, esperado, desde_ultimo, ultimo_sorteio_id)
+                VALUES (?, 1, ?, ?, ?, ?)
+                ON CONFLICT (jogador_id) DO UPDATE SET
+                    participacoes = participacoes + 1,
+                    vezes_sorteado = vezes_sorteado + excluded.vezes_sorteado,
+                    esperado = esperado + excluded.esperado,
+                    desde_ultimo = CASE WHEN excluded.vezes_sorteado = 1 THEN 0 ELSE desde_ultimo + 1 END,
+                    ultimo_sorteio_id = COALESCE(excluded.ultimo_sorteio_id, ultimo_sorteio_id)
+            """, [
+                (j, int(j == vencedor_id), chance, int(j != vencedor_id),
+                 sorteio_id if j == vencedor_id else None)
+                for j in participantes
+            ])
+            return sorteio_id
+        
+        try:
+            return self.executar_escrita(escrita)
+        except Exception as e:
+            print(f"Erro ao registrar sorteio: {e}")
+            return None
+    
+    def get_estatisticas_sorteio(self, jogador_ids):
+        """{jogador_id: EstatisticaSorteio} (só de quem já participou de algum sorteio)"""
+        ids = [int(j) for j in jogador_ids]
+        if not ids:
+            return {}
+        conn = self.get_connection()
+        linhas = conn.execute(
+            f"""SELECT {EstatisticaSorteio.COLUNAS} FROM sorteios_jogador
+                WHERE jogador_id IN ({','.join('?' * len(ids))})""",
+            ids
+        ).fetchall()
+        conn.close()
+        return {linha[0]: EstatisticaSorteio(*linha) for linha in linhas}
+    
+    def get_sorteios(self, limit=10):
+        """Últimos sorteios, com o nome de quem começou e o jogo da partida ligada"""
+        conn = self.get_connection()
+        df = pd.read_sql_query("""
+            SELECT s.id, s.quando, jog.nome as vencedor, s.modo, j.nome as jogo
+            FROM sorteios s
+            JOIN jogadores jog ON jog.id = s.vencedor_id
+            LEFT JOIN partidas p ON p.id = s.partida_id
+            LEFT JOIN jogos j ON j.id = p.jogo_id
+            ORDER BY s.id DESC
+            LIMIT ?
+        """, conn, params=(int(limit),))
+        conn.close()
+        return df
     
     # === JOGOS ===
     def add_jogo(self, nome, peso_bgg=2.0, bgg_id=None, link_bgg=None, 
                  min_jogadores=None, max_jogadores=None, tempo_min=None, 
                  tempo_max=None, tipo=None, categoria=None, mecanicas=None,
                  ano_publicacao=None):
-        conn = self.get_connection()
-        try:
+        def escrita(conn):
             conn.execute("""
                 INSERT INTO jogos 
                 (nome, peso_bgg, bgg_id, link_bgg, min_jogadores, max_jogadores, 
@@ -207,40 +823,49 @@ class Database:
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, DATE('now'))
             """, (nome, peso_bgg, bgg_id, link_bgg, min_jogadores, max_jogadores,
                   tempo_min, tempo_max, tipo, categoria, mecanicas, ano_publicacao))
-            conn.commit()
+        
+        try:
+            self.executar_escrita(escrita)
             return True
         except sqlite3.IntegrityError:
             return False
-        finally:
-            conn.close()
     
     def update_jogo_bgg(self, jogo_id, bgg_data):
         """Atualiza dados de um jogo com informações do BGG"""
         jogo_id = int(jogo_id)
-        conn = self.get_connection()
-        conn.execute("""
-            UPDATE jogos 
-            SET peso_bgg = ?, min_jogadores = ?, max_jogadores = ?,
-                tempo_min = ?, tempo_max = ?, tipo = ?, categoria = ?,
-                mecanicas = ?, ano_publicacao = ?, link_bgg = ?, bgg_id = ?,
-                ultima_atualizacao = DATE('now')
-            WHERE id = ?
-        """, (
-            bgg_data.get('peso'),
-            bgg_data.get('min_jogadores'),
-            bgg_data.get('max_jogadores'),
-            bgg_data.get('tempo_min'),
-            bgg_data.get('tempo_max'),
-            bgg_data.get('tipo'),
-            bgg_data.get('categoria'),
-            bgg_data.get('mecanicas'),
-            bgg_data.get('ano_publicacao'),
-            bgg_data.get('link_bgg'),
-            bgg_data.get('bgg_id'),
-            jogo_id
-        ))
-        conn.commit()
-        conn.close()
+        
+        def escrita(conn):
+            conn.execute("""
+                UPDATE jogos 
+                SET peso_bgg = ?, min_jogadores = ?, max_jogadores = ?,
+                    tempo_min = ?, tempo_max = ?, tipo = ?, categoria = ?,
+                    mecanicas = ?, ano_publicacao = ?, link_bgg = ?, bgg_id = ?,
+                    ultima_atualizacao = DATE('now')
+                WHERE id = ?
+            """, (
+                bgg_data.get('peso'),
+                bgg_data.get('min_jogadores'),
+                bgg_data.get('max_jogadores'),
+                bgg_data.get('tempo_min'),
+                bgg_data.get('tempo_max'),
+                bgg_data.get('tipo'),
+                bgg_data.get('categoria'),
+                bgg_data.get('mecanicas'),
+                bgg_data.get('ano_publicacao'),
+                bgg_data.get('link_bgg'),
+                bgg_data.get('bgg_id'),
+                jogo_id
+            ))
+            # Peso pode ter mudado
+            self._reconstruir_confronto_direto(conn.cursor())
+            self._recalcular_estatisticas_jogadores(conn.cursor(), [
+                linha[0] for linha in conn.execute(
+                    "SELECT jogador_id FROM jogos_jogador WHERE jogo_id = ?", (jogo_id,)
+                )
+            ])
+            self._registrar_evento(conn.cursor(), 'jogo_atualizado', jogo_id=jogo_id)
+        
+        self.executar_escrita(escrita)
     
     def get_jogos(self, apenas_ativos=True):
         conn = self.get_connection()
@@ -250,14 +875,13 @@ class Database:
             query = "SELECT * FROM jogos ORDER BY nome"
         df = pd.read_sql_query(query, conn)
         conn.close()
-        # Retorna cópia para evitar cache do Streamlit
-        return df.copy()
+        return df
     
     def update_jogo(self, jogo_id, dados):
         """Atualiza informações de um jogo"""
         jogo_id = int(jogo_id)
-        conn = self.get_connection()
-        try:
+        
+        def escrita(conn):
             conn.execute("""
                 UPDATE jogos 
                 SET nome = ?, peso_bgg = ?, min_jogadores = ?, max_jogadores = ?,
@@ -277,91 +901,171 @@ class Database:
                 dados.get('link_bgg'),
                 jogo_id
             ))
-            conn.commit()
+            # Peso pode ter mudado
+            self._reconstruir_confronto_direto(conn.cursor())
+            self._recalcular_estatisticas_jogadores(conn.cursor(), [
+                linha[0] for linha in conn.execute(
+                    "SELECT jogador_id FROM jogos_jogador WHERE jogo_id = ?", (jogo_id,)
+                )
+            ])
+            self._registrar_evento(conn.cursor(), 'jogo_atualizado', jogo_id=jogo_id)
+        
+        try:
+            self.executar_escrita(escrita)
             return True
         except Exception as e:
             print(f"Erro ao atualizar jogo: {e}")
             return False
-        finally:
-            conn.close()
     
     def desativar_jogo(self, jogo_id):
         jogo_id = int(jogo_id)
-        conn = self.get_connection()
-        conn.execute("UPDATE jogos SET ativo = 0 WHERE id = ?", (jogo_id,))
-        conn.commit()
-        conn.close()
+        self.executar_escrita(
+            lambda conn: conn.execute("UPDATE jogos SET ativo = 0 WHERE id = ?", (jogo_id,))
+        )
     
     def reativar_jogo(self, jogo_id):
         """Reativa um jogo desativado"""
         jogo_id = int(jogo_id)
+        self.executar_escrita(
+            lambda conn: conn.execute("UPDATE jogos SET ativo = 1 WHERE id = ?", (jogo_id,))
+        )
+    
+    def get_jogos_para_grupo(self, n_jogadores, tempo_disponivel=None):
+        """
+        Jogos ativos que comportam n_jogadores (e cabem no tempo, se dado;
+        usa tempo_max, ou tempo_min quando não há máximo). Jogos sem faixa
+        de jogadores cadastrada ficam de fora.
+        """
         conn = self.get_connection()
-        conn.execute("UPDATE jogos SET ativo = 1 WHERE id = ?", (jogo_id,))
-        conn.commit()
+        query = """
+            SELECT id, nome, peso_bgg, min_jogadores, max_jogadores, tempo_min, tempo_max
+            FROM jogos
+            WHERE min_jogadores <= ? AND max_jogadores >= ? AND ativo = 1
+        """
+        params = [int(n_jogadores), int(n_jogadores)]
+        if tempo_disponivel:
+            query += " AND COALESCE(tempo_max, tempo_min, 0) <= ?"
+            params.append(int(tempo_disponivel))
+        df = pd.read_sql_query(query, conn, params=params)
+        conn.close()
+        return df
+    
+    def get_historico_grupo_jogos(self, jogador_ids):
+        """
+        Por jogo que alguém do grupo já jogou: última data (de qualquer um
+        do grupo), partidas distintas com alguém do grupo e quantos do grupo
+        já jogaram. Conta pelas partidas (idx_resultados_jogador), não somando
+        o jogos_jogador: uma partida com 4 do grupo contaria 4 vezes
+        """
+        ids = [int(j) for j in jogador_ids]
+        conn = self.get_connection()
+        df = pd.read_sql_query(f"""
+            SELECT p.jogo_id, MAX(p.data) as ultima_data,
+                   COUNT(DISTINCT r.partida_id) as partidas,
+                   COUNT(DISTINCT r.jogador_id) as jogadores
+            FROM resultados r
+            JOIN partidas p ON p.id = r.partida_id
+            WHERE r.jogador_id IN ({','.join('?' * len(ids))})
+            GROUP BY p.jogo_id
+        """, conn, params=ids)
+        conn.close()
+        return df
+    
+    def get_elos_jogo_grupo(self, jogador_ids):
+        """Elo de cada jogador do grupo em cada jogo que já jogou (jogo_id, jogador_id, elo)"""
+        ids = [int(j) for j in jogador_ids]
+        conn = self.get_connection()
+        df = pd.read_sql_query(f"""
+            SELECT jogo_id, jogador_id, elo
+            FROM elos_jogo
+            WHERE jogador_id IN ({','.join('?' * len(ids))})
+        """, conn, params=ids)
         conn.close()
+        return df
     
     # === PARTIDAS ===
     def add_partida(self, jogo_id, data, jogadores_posicoes, observacoes="", 
-                    jogatina_id=None, valida_ranking='S', eh_jogo_time='N'):
+                    jogatina_id=None, valida_ranking='S', eh_jogo_time='N', sorteio_id=None):
         """
         jogadores_posicoes: lista de tuplas [(jogador_id, posicao, pontuacao, time_id), ...]
         time_id é opcional, só usado se eh_jogo_time='S'
+        sorteio_id: sorteio de primeiro jogador que vira desta partida (se ainda livre)
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
-            # Converte IDs para int nativo (evita BLOB)
-            jogo_id = int(jogo_id)
-            if jogatina_id is not None:
-                jogatina_id = int(jogatina_id)
-            
-            # Cria jogatina se não existir
-            if jogatina_id is None:
-                jogatina_id = self.get_or_create_jogatina(data)
-            
-            # Insere partida
-            cursor.execute(
-                """INSERT INTO partidas 
-                   (jogo_id, data, observacoes, jogatina_id, valida_ranking, eh_jogo_time) 
-                   VALUES (?, ?, ?, ?, ?, ?)""",
-                (jogo_id, data, observacoes, jogatina_id, valida_ranking, eh_jogo_time)
+        def escrita(conn):
+            partida_id, jogatina = self._inserir_partida(
+                conn, jogo_id, data, jogadores_posicoes, observacoes,
+                jogatina_id, valida_ranking, eh_jogo_time
             )
-            partida_id = cursor.lastrowid
-            
-            # Insere resultados
-            for item in jogadores_posicoes:
-                if len(item) == 3:
-                    jogador_id, posicao, pontuacao = item
-                    time_id = None
-                else:
-                    jogador_id, posicao, pontuacao, time_id = item
-                
-                # Converte todos os IDs para int nativo
-                jogador_id = int(jogador_id)
-                posicao = int(posicao)
-                if time_id is not None:
-                    time_id = int(time_id)
-                
-                cursor.execute(
-                    """INSERT INTO resultados 
-                       (partida_id, jogador_id, posicao, pontuacao, time_id) 
-                       VALUES (?, ?, ?, ?, ?)""",
-                    (partida_id, jogador_id, posicao, pontuacao, time_id)
+            if sorteio_id is not None:
+                conn.execute(
+                    """UPDATE sorteios SET partida_id = ?, jogatina_id = ?
+                       WHERE id = ? AND partida_id IS NULL""",
+                    (partida_id, jogatina, int(sorteio_id))
                 )
-            
-            conn.commit()
+        
+        try:
+            self.executar_escrita(escrita)
             return True
         except Exception as e:
-            conn.rollback()
             print(f"Erro ao adicionar partida: {e}")
             return False
-        finally:
-            conn.close()
     
-    def get_partidas(self, limit=None):
+    def _inserir_partida(self, conn, jogo_id, data, jogadores_posicoes, observacoes="",
+                         jogatina_id=None, valida_ranking='S', eh_jogo_time='N', uuid_partida=None):
+        """Insere partida + resultados e atualiza agregados/eventos. Retorna (partida_id, jogatina_id)"""
+        cursor = conn.cursor()
+        
+        # Converte IDs para int nativo (evita BLOB)
+        jogo_id_int = int(jogo_id)
+        jogatina = int(jogatina_id) if jogatina_id is not None else None
+        
+        # Cria jogatina se não existir
+        if jogatina is None:
+            jogatina = self._obter_ou_criar_jogatina(conn, data)
+        
+        # Insere partida
+        cursor.execute(
+            """INSERT INTO partidas 
+               (jogo_id, data, observacoes, jogatina_id, valida_ranking, eh_jogo_time, uuid) 
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (jogo_id_int, data, observacoes, jogatina, valida_ranking, eh_jogo_time,
+             uuid_partida or str(uuid.uuid4()))
+        )
+        partida_id = cursor.lastrowid
+        
+        # Insere resultados
+        for item in jogadores_posicoes:
+            if len(item) == 3:
+                jogador_id, posicao, pontuacao = item
+                time_id = None
+            else:
+                jogador_id, posicao, pontuacao, time_id = item
+            
+            # Converte todos os IDs para int nativo
+            jogador_id = int(jogador_id)
+            posicao = int(posicao)
+            if time_id is not None:
+                time_id = int(time_id)
+            
+            cursor.execute(
+                """INSERT INTO resultados 
+                   (partida_id, jogador_id, posicao, pontuacao, time_id) 
+                   VALUES (?, ?, ?, ?, ?)""",
+                (partida_id, jogador_id, posicao, pontuacao, time_id)
+            )
+        
+        self._atualizar_agregados_partida(cursor, partida_id, 1)
+        self._registrar_evento(cursor, 'partida_adicionada', partida_id, jogo_id_int)
+        return partida_id, jogatina
+    
+    def get_partidas(self, limit=None, offset=0):
         conn = self.get_connection()
-        query = """
+        # Com limit, a página de partidas é escolhida antes dos JOINs: só
+        # as partidas da página passam pelo GROUP_CONCAT
+        partidas = "partidas"
+        if limit:
+            partidas = f"(SELECT * FROM partidas ORDER BY id DESC LIMIT {int(limit)} OFFSET {int(offset)})"
+        query = f"""
             SELECT 
                 p.id,
                 p.data,
@@ -370,77 +1074,148 @@ class Database:
                 p.valida_ranking,
                 p.eh_jogo_time,
                 GROUP_CONCAT(jog.nome || ' (' || r.posicao || '°)') as jogadores
-            FROM partidas p
+            FROM {partidas} p
             JOIN jogos j ON p.jogo_id = j.id
             JOIN resultados r ON p.id = r.partida_id
             JOIN jogadores jog ON r.jogador_id = jog.id
             GROUP BY p.id
             ORDER BY p.id DESC
         """
-        if limit:
-            query += f" LIMIT {limit}"
         
         df = pd.read_sql_query(query, conn)
         conn.close()
-        # Retorna cópia para evitar cache do Streamlit
-        return df.copy()
+        return df
+    
+    def contar_partidas(self):
+        conn = self.get_connection()
+        total = conn.execute("SELECT COUNT(*) FROM partidas").fetchone()[0]
+        conn.close()
+        return total
+    
+    def get_metricas_dashboard(self):
+        """
+        Contadores e destaques do 🏠 Início (MetricasDashboard) numa consulta
+        só. Guardado por versão dos dados (e mês): sem escrita nova, só a
+        versão é lida.
+        """
+        hoje = datetime.now().date()
+        caminho = os.path.abspath(self.db_name)
+        chave = (self.get_versao_dados(), hoje.strftime('%Y-%m'))
+        cache_chave, metricas = _cache_metricas.get(caminho, (None, None))
+        if cache_chave == chave:
+            return metricas
+        
+        conn = self.get_connection()
+        linha = conn.execute("""
+            SELECT c.jogadores, c.jogos, c.partidas,
+                   ult.data, ult.local, ult.partidas,
+                   mes.nome, mes.partidas,
+                   lider.nome, lider.elo
+            FROM (
+                SELECT (SELECT COUNT(*) FROM jogadores WHERE ativo = 1) as jogadores,
+                       (SELECT COUNT(*) FROM jogos WHERE ativo = 1) as jogos,
+                       (SELECT COUNT(*) FROM partidas) as partidas
+            ) c
+            LEFT JOIN (
+                SELECT jt.data, jt.local,
+                       (SELECT COUNT(*) FROM partidas p WHERE p.jogatina_id = jt.id) as partidas
+                FROM jogatinas jt
+                WHERE EXISTS (SELECT 1 FROM partidas p WHERE p.jogatina_id = jt.id)
+                ORDER BY jt.data DESC, jt.id DESC
+                LIMIT 1
+            ) ult ON true
+            LEFT JOIN (
+                SELECT j.nome, COUNT(*) as partidas
+                FROM partidas p
+                JOIN jogos j ON j.id = p.jogo_id
+                WHERE p.data >= ?
+                GROUP BY p.jogo_id
+                ORDER BY partidas DESC, MAX(p.id) DESC
+                LIMIT 1
+            ) mes ON true
+            LEFT JOIN (
+                SELECT nome, elo FROM jogadores WHERE ativo = 1 ORDER BY elo DESC LIMIT 1
+            ) lider ON true
+        """, (hoje.replace(day=1).isoformat(),)).fetchone()
+        conn.close()
+        
+        metricas = MetricasDashboard(*linha)
+        _cache_metricas[caminho] = (chave, metricas)
+        return metricas
+    
+    def get_versao_dados(self):
+        """Contador que sobe a cada escrita em jogadores/jogos/jogatinas/partidas/resultados"""
+        conn = self.get_connection()
+        versao = conn.execute("SELECT valor FROM metadados WHERE chave = 'versao_dados'").fetchone()[0]
+        conn.close()
+        return versao
     
     def get_partida_detalhes(self, partida_id):
-        """Retorna detalhes completos de uma partida"""
+        """
+        Retorna (Partida, [Resultado, ...]) da partida (registros.py),
+        resultados ordenados por posição. (None, []) se não existe.
+        """
         # Força int nativo (evita problemas com numpy.int64)
         partida_id = int(partida_id)
         
         conn = self.get_connection()
         
         # Dados da partida
-        partida_query = """
-            SELECT p.*, j.nome as jogo_nome
+        partida = conn.execute(f"""
+            SELECT {Partida.COLUNAS}
             FROM partidas p
             JOIN jogos j ON p.jogo_id = j.id
             WHERE p.id = ?
-        """
-        partida = pd.read_sql_query(partida_query, conn, params=(partida_id,))
+        """, (partida_id,)).fetchone()
         
         # Resultados
-        resultados_query = """
-            SELECT r.*, jog.nome as jogador_nome
+        resultados = conn.execute(f"""
+            SELECT {Resultado.COLUNAS}
             FROM resultados r
             JOIN jogadores jog ON r.jogador_id = jog.id
             WHERE r.partida_id = ?
             ORDER BY r.posicao
-        """
-        resultados = pd.read_sql_query(resultados_query, conn, params=(partida_id,))
+        """, (partida_id,)).fetchall()
         
         conn.close()
-        return partida.iloc[0] if len(partida) > 0 else None, resultados
+        if partida is None:
+            return None, []
+        return Partida(*partida), [Resultado(*r) for r in resultados]
     
     def delete_partida(self, partida_id):
         """Exclui uma partida e seus resultados"""
         partida_id = int(partida_id)
-        conn = self.get_connection()
+        
         try:
-            # Deleta resultados primeiro (FK constraint)
-            conn.execute("DELETE FROM resultados WHERE partida_id = ?", (partida_id,))
-            # Deleta partida
-            conn.execute("DELETE FROM partidas WHERE id = ?", (partida_id,))
-            conn.commit()
+            self.executar_escrita(lambda conn: self._remover_partida(conn, partida_id))
             return True
         except Exception as e:
-            conn.rollback()
             print(f"Erro ao deletar partida: {e}")
             return False
-        finally:
-            conn.close()
+    
+    def _remover_partida(self, conn, partida_id):
+        # Tira a partida dos agregados enquanto os resultados ainda existem
+        self._atualizar_agregados_partida(conn.cursor(), partida_id, -1)
+        # Deleta resultados primeiro (FK constraint)
+        conn.execute("DELETE FROM resultados WHERE partida_id = ?", (partida_id,))
+        # Deleta partida
+        jogo = conn.execute("SELECT jogo_id FROM partidas WHERE id = ?", (partida_id,)).fetchone()
+        conn.execute("DELETE FROM partidas WHERE id = ?", (partida_id,))
+        conn.execute("UPDATE sorteios SET partida_id = NULL WHERE partida_id = ?", (partida_id,))
+        self._registrar_evento(conn.cursor(), 'partida_removida', partida_id, jogo[0] if jogo else None)
     
     def update_partida(self, partida_id, jogo_id, data, jogadores_posicoes, 
                       observacoes="", valida_ranking='S', eh_jogo_time='N'):
         """Atualiza uma partida existente"""
         partida_id = int(partida_id)
         jogo_id = int(jogo_id)
-        conn = self.get_connection()
-        cursor = conn.cursor()
         
-        try:
+        def escrita(conn):
+            cursor = conn.cursor()
+            
+            # Tira a versão antiga da partida dos agregados
+            self._atualizar_agregados_partida(cursor, partida_id, -1)
+            
             # Atualiza partida
             cursor.execute("""
                 UPDATE partidas 
@@ -467,14 +1242,15 @@ class Database:
                     (partida_id, jogador_id, posicao, pontuacao, time_id)
                 )
             
-            conn.commit()
+            self._atualizar_agregados_partida(cursor, partida_id, 1)
+            self._registrar_evento(cursor, 'partida_atualizada', partida_id, jogo_id)
+        
+        try:
+            self.executar_escrita(escrita)
             return True
         except Exception as e:
-            conn.rollback()
             print(f"Erro ao atualizar partida: {e}")
             return False
-        finally:
-            conn.close()
     
     def get_ultima_data_partida(self):
         """Retorna a data mais recente com partidas registradas"""
@@ -489,7 +1265,8 @@ class Database:
         conn = self.get_connection()
         
         filtro_valida = "AND p.valida_ranking = 'S'" if apenas_validas else ""
-        filtro_data = f"AND p.data = '{data_filtro}'" if data_filtro else ""
+        filtro_data = "AND p.data = ?" if data_filtro else ""
+        params = (jogador_id, data_filtro, limit) if data_filtro else (jogador_id, limit)
         
         query = f"""
             SELECT 
@@ -511,10 +1288,252 @@ class Database:
             ORDER BY p.id DESC
             LIMIT ?
         """
-        df = pd.read_sql_query(query, conn, params=(jogador_id, limit))
+        df = pd.read_sql_query(query, conn, params=params)
+        conn.close()
+        return df
+    
+    # Partidas de uma janela (período e/ou jogatina) com o total de jogadores de cada uma
+    # total_jogadores = MAX(posicao) da partida, igual ao get_todas_partidas_jogador
+    _JANELA_CTE = """
+        janela AS (
+            SELECT 
+                r.jogador_id,
+                p.id as partida_id,
+                p.jogatina_id,
+                p.data,
+                j.peso_bgg as peso,
+                r.posicao,
+                MAX(r.posicao) OVER (PARTITION BY r.partida_id) as total_jogadores
+            FROM partidas p
+            JOIN resultados r ON r.partida_id = p.id
+            JOIN jogos j ON p.jogo_id = j.id
+            WHERE (:apenas_validas = 0 OR p.valida_ranking = 'S')
+              AND (:data_inicio IS NULL OR p.data >= :data_inicio)
+              AND (:data_fim IS NULL OR p.data <= :data_fim)
+              AND (:jogatina_id IS NULL OR p.jogatina_id = :jogatina_id)
+        )
+    """
+    
+    def get_aproveitamento_janela(self, limite_partidas=None, data_inicio=None, data_fim=None,
+                                  jogatina_id=None, apenas_validas=True):
+        """
+        Soma das mini-partidas de cada jogador ativo numa janela, calculada no SQLite
+        - limite_partidas: só as últimas N partidas de cada jogador dentro da janela
+        - data_inicio / data_fim: datas 'YYYY-MM-DD' (inclusive)
+        - jogatina_id: só uma jogatina
+        Retorna jogador, vitorias_ponderadas, mini_partidas_ponderadas e partidas
+        (peso ajustado = peso - 1; jogos de peso 1.0 não pontuam, mas contam como partida)
+        """
+        conn = self.get_connection()
+        query = f"""
+            WITH {self._JANELA_CTE},
+            recentes AS (
+                SELECT *, ROW_NUMBER() OVER (PARTITION BY jogador_id ORDER BY partida_id DESC) as n
+                FROM janela
+            )
+            SELECT 
+                jog.nome as jogador,
+                COALESCE(SUM(CASE WHEN peso > 1 THEN (total_jogadores - posicao) * (peso - 1) END), 0)
+                    as vitorias_ponderadas,
+                COALESCE(SUM(CASE WHEN peso > 1 THEN (total_jogadores - 1) * (peso - 1) END), 0)
+                    as mini_partidas_ponderadas,
+                COUNT(*) as partidas
+            FROM recentes
+            JOIN jogadores jog ON recentes.jogador_id = jog.id
+            WHERE jog.ativo = 1
+              AND (:limite IS NULL OR n <= :limite)
+            GROUP BY jog.id
+            ORDER BY jog.nome
+        """
+        params = {
+            'apenas_validas': 1 if apenas_validas else 0,
+            'data_inicio': data_inicio,
+            'data_fim': data_fim,
+            'jogatina_id': int(jogatina_id) if jogatina_id is not None else None,
+            'limite': int(limite_partidas) if limite_partidas else None,
+        }
+        df = pd.read_sql_query(query, conn, params=params)
+        conn.close()
+        return df
+    
+    def get_evolucao_ranking_jogatinas(self, data_inicio=None, data_fim=None, apenas_validas=True):
+        """
+        Aproveitamento acumulado e posição de cada jogador ativo ao fim de cada jogatina,
+        numa única consulta (somas acumuladas com window functions).
+        Quem faltou numa jogatina mantém o acumulado anterior.
+        """
+        conn = self.get_connection()
+        query = f"""
+            WITH {self._JANELA_CTE},
+            por_jogatina AS (
+                SELECT 
+                    jogador_id,
+                    jogatina_id,
+                    SUM(CASE WHEN peso > 1 THEN (total_jogadores - posicao) * (peso - 1) ELSE 0 END) as v,
+                    SUM(CASE WHEN peso > 1 THEN (total_jogadores - 1) * (peso - 1) ELSE 0 END) as m,
+                    COUNT(*) as partidas
+                FROM janela
+                GROUP BY jogador_id, jogatina_id
+            ),
+            jogatinas_janela AS (
+                SELECT DISTINCT jt.id, jt.data
+                FROM jogatinas jt
+                JOIN janela ON janela.jogatina_id = jt.id
+            ),
+            acumulado AS (
+                SELECT 
+                    jt.id as jogatina_id,
+                    jt.data,
+                    jog.id as jogador_id,
+                    jog.nome as jogador,
+                    SUM(COALESCE(pj.v, 0)) OVER w as v,
+                    SUM(COALESCE(pj.m, 0)) OVER w as m,
+                    SUM(COALESCE(pj.partidas, 0)) OVER w as partidas
+                FROM jogatinas_janela jt
+                CROSS JOIN jogadores jog
+                LEFT JOIN por_jogatina pj ON pj.jogatina_id = jt.id AND pj.jogador_id = jog.id
+                WHERE jog.ativo = 1
+                WINDOW w AS (PARTITION BY jog.id ORDER BY jt.data, jt.id ROWS UNBOUNDED PRECEDING)
+            )
+            SELECT 
+                jogatina_id,
+                data,
+                jogador,
+                ROUND(100.0 * v / NULLIF(m, 0), 2) as aproveitamento,
+                partidas,
+                RANK() OVER (PARTITION BY jogatina_id ORDER BY 1.0 * v / NULLIF(m, 0) DESC) as posicao
+            FROM acumulado
+            WHERE partidas > 0
+            ORDER BY data, jogatina_id, posicao
+        """
+        params = {
+            'apenas_validas': 1 if apenas_validas else 0,
+            'data_inicio': data_inicio,
+            'data_fim': data_fim,
+            'jogatina_id': None,
+        }
+        df = pd.read_sql_query(query, conn, params=params)
+        conn.close()
+        return df
+    
+    def get_confronto_direto(self, apenas_ativos=True):
+        """
+        Retorna o confronto direto entre cada par de jogadores (a contra b)
+        aproveitamento = % ponderado de mini-partidas vencidas por a (empate vale meio)
+        """
+        conn = self.get_connection()
+        filtro_ativos = "WHERE ja.ativo = 1 AND jb.ativo = 1" if apenas_ativos else ""
+        query = f"""
+            SELECT 
+                ja.nome as jogador_a,
+                jb.nome as jogador_b,
+                c.vitorias,
+                c.derrotas,
+                c.empates,
+                ROUND(100.0 * (c.vitorias_ponderadas + 0.5 * c.empates_ponderados)
+                      / NULLIF(c.vitorias_ponderadas + c.derrotas_ponderadas + c.empates_ponderados, 0), 2)
+                    as aproveitamento
+            FROM confronto_direto c
+            JOIN jogadores ja ON c.jogador_a = ja.id
+            JOIN jogadores jb ON c.jogador_b = jb.id
+            {filtro_ativos}
+            ORDER BY ja.nome, jb.nome
+        """
+        df = pd.read_sql_query(query, conn)
+        conn.close()
+        return df
+    
+    def get_ranking_jogo(self, jogo_id, limit=None):
+        """Ranking ELO de um jogo específico (jogadores ativos que já jogaram)"""
+        jogo_id = int(jogo_id)
+        conn = self.get_connection()
+        query = """
+            SELECT jog.nome, e.elo, e.partidas
+            FROM elos_jogo e
+            JOIN jogadores jog ON e.jogador_id = jog.id
+            WHERE e.jogo_id = ? AND jog.ativo = 1
+            ORDER BY e.elo DESC
+            LIMIT ?
+        """
+        df = pd.read_sql_query(query, conn, params=(jogo_id, limit if limit else -1))
+        conn.close()
+        df.index = df.index + 1
+        return df
+    
+    def get_ranking_faixa_peso(self, faixa):
+        """Ranking ELO de uma faixa de peso ('leve', 'medio' ou 'pesado')"""
+        conn = self.get_connection()
+        query = """
+            SELECT jog.nome, e.elo, e.partidas
+            FROM elos_faixa_peso e
+            JOIN jogadores jog ON e.jogador_id = jog.id
+            WHERE e.faixa = ? AND jog.ativo = 1
+            ORDER BY e.elo DESC
+        """
+        df = pd.read_sql_query(query, conn, params=(faixa,))
         conn.close()
+        df.index = df.index + 1
         return df
     
+    # === MESCLA (duas instâncias sincronizando pelo Drive) ===
+    def mesclar_partidas(self, outro, uuids_base=None):
+        """
+        Traz para este banco as partidas de `outro` (conexão sqlite3, ex.: a
+        cópia do Drive), comparando pelo uuid:
+        - no outro e não aqui: nova lá, é inserida (jogo e jogadores pelo
+          nome, jogatina por data e local, criados se faltarem), a menos
+          que esteja em uuids_base: aí foi apagada aqui e continua apagada
+        - aqui e em uuids_base, mas não no outro: apagada lá, apaga aqui
+        uuids_base = partidas do último estado comum; sem ele só insere.
+        Edições de uma partida que existe dos dois lados não são mescladas.
+        Retorna (inseridas, removidas) ou None em caso de erro.
+        """
+        remotas = ler_partidas(outro)
+        base = set(uuids_base or ())
+        
+        def escrita(conn):
+            locais = dict(conn.execute("SELECT uuid, id FROM partidas").fetchall())
+            novas = sorted(
+                (u for u in remotas if u not in locais and u not in base),
+                key=lambda u: remotas[u][0]  # em ordem de data, como seriam registradas
+            )
+            removidas = [locais[u] for u in base if u in locais and u not in remotas]
+            
+            jogos = dict(conn.execute("SELECT nome, id FROM jogos").fetchall())
+            jogadores = dict(conn.execute("SELECT nome, id FROM jogadores").fetchall())
+            jogatinas = {}
+            for jogatina_id, data_jogatina, local in conn.execute(
+                    "SELECT id, data, local FROM jogatinas ORDER BY id DESC").fetchall():
+                jogatinas[(data_jogatina, local)] = jogatina_id  # repetida: fica a mais antiga
+            for uuid_partida in novas:
+                data, jogo, valida_ranking, eh_jogo_time, observacoes, jogatina, resultados = remotas[uuid_partida]
+                if jogatina is not None and jogatina not in jogatinas:
+                    jogatinas[jogatina] = conn.execute(
+                        "INSERT INTO jogatinas (data, local) VALUES (?, ?)", jogatina
+                    ).lastrowid
+                if jogo not in jogos:
+                    jogos[jogo] = conn.execute("INSERT INTO jogos (nome) VALUES (?)", (jogo,)).lastrowid
+                for jogador, *_ in resultados:
+                    if jogador not in jogadores:
+                        jogadores[jogador] = conn.execute(
+                            "INSERT INTO jogadores (nome) VALUES (?)", (jogador,)
+                        ).lastrowid
+                self._inserir_partida(
+                    conn, jogos[jogo], data,
+                    [(jogadores[jogador], posicao, pontuacao, time_id)
+                     for jogador, posicao, pontuacao, time_id in resultados],
+                    observacoes, jogatinas.get(jogatina), valida_ranking, eh_jogo_time, uuid_partida
+                )
+            for partida_id in removidas:
+                self._remover_partida(conn, partida_id)
+            return len(novas), len(removidas)
+        
+        try:
+            return self.executar_escrita(escrita)
+        except Exception as e:
+            print(f"Erro ao mesclar partidas: {e}")
+            return None
+    
     def backup_bytes(self) -> tuple[bytes, str]:
         """
         Gera um backup consistente do SQLite e devolve:
@@ -0,0 +1,163 @@
+"""
+Escritor único por arquivo de banco.
+
+Todas as escritas do processo entram numa fila e são executadas por uma
+thread com uma conexão só. Escritas que chegam juntas (várias sessões
+salvando ao mesmo tempo na noite de jogatina) vão na mesma transação, cada
+uma no seu SAVEPOINT, com um único COMMIT; quem pediu recebe um Future.
+Leituras continuam abrindo suas próprias conexões (snapshots do WAL).
+
+A fila é por processo: outro processo escrevendo no mesmo arquivo ainda
+depende do busy timeout do SQLite.
+"""
+import os
+import queue
+import threading
+from concurrent.futures import Future
+
+MAX_LOTE = 64  # escritas por transação
+
+_escritores = {}
+_lock = threading.Lock()
+
+
+def obter(db_name, conectar):
+    """Escritor do arquivo `db_name` (criado na primeira chamada do processo)"""
+    chave = os.path.abspath(db_name)
+    with _lock:
+        escritor = _escritores.get(chave)
+        if escritor is None:
+            escritor = _escritores[chave] = EscritorSQLite(db_name, conectar)
+        return escritor
+
+
+class EscritorSQLite:
+    """
+    Thread dona da conexão de escrita. `conectar()` deve devolver uma
+    conexão em modo autocommit (isolation_level=None): as transações são
+    abertas e fechadas aqui.
+    """
+
+    def __init__(self, db_name, conectar):
+        self.db_name = db_name
+        self._conectar_banco = conectar
+        self._fila = queue.Queue()
+        self._conn = None
+        self._arquivo = None
+        self._thread = threading.Thread(
+            target=self._loop, name=f"escritor-{os.path.basename(db_name)}", daemon=True
+        )
+        self._thread.start()
+
+    def executar(self, funcao, transacao=True):
+        """
+        Agenda funcao(conn) e devolve um Future com o retorno (ou a exceção).
+        A função não deve dar commit/rollback. Com transacao=False ela roda
+        sozinha, fora de transação (ex.: API de backup do SQLite).
+        """
+        futuro = Future()
+        if threading.current_thread() is self._thread:
+            # Escrita pedida de dentro de outra escrita: roda na mesma transação
+            futuro.set_running_or_notify_cancel()
+            self._rodar_em_savepoint(funcao, futuro)
+            return futuro
+        self._fila.put((funcao, transacao, futuro))
+        return futuro
+
+    def _loop(self):
+        while True:
+            lote = [self._fila.get()]
+            while len(lote) < MAX_LOTE:
+                try:
+                    lote.append(self._fila.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._conectar()
+            except Exception as e:
+                for _, _, futuro in lote:
+                    if futuro.set_running_or_notify_cancel():
+                        futuro.set_exception(e)
+                continue
+            self._processar(lote)
+
+    def _conectar(self):
+        """(Re)abre a conexão na primeira vez ou se o arquivo foi trocado/apagado"""
+        if self._conn is not None and self._arquivo == self._identificar_arquivo():
+            return
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        self._conn = self._conectar_banco()
+        self._arquivo = self._identificar_arquivo()
+
+    def _identificar_arquivo(self):
+        try:
+            info = os.stat(self.db_name)
+        except FileNotFoundError:
+            return None
+        return (info.st_dev, info.st_ino)
+
+    def _processar(self, lote):
+        pendentes = []  # (futuro, resultado) esperando o COMMIT
+        for funcao, transacao, futuro in lote:
+            if not futuro.set_running_or_notify_cancel():
+                continue
+            if not transacao:
+                self._confirmar(pendentes)
+                pendentes = []
+                try:
+                    futuro.set_result(funcao(self._conn))
+                except Exception as e:
+                    futuro.set_exception(e)
+                continue
+            try:
+                if not self._conn.in_transaction:
+                    self._conn.execute("BEGIN IMMEDIATE")
+            except Exception as e:
+                futuro.set_exception(e)
+                continue
+            if not self._rodar_em_savepoint(funcao, futuro, pendentes):
+                # O SQLite desfez a transação inteira (ex.: disco cheio):
+                # as escritas anteriores do lote se perderam junto
+                erro = futuro.exception()
+                for anterior, _ in pendentes:
+                    anterior.set_exception(erro)
+                pendentes = []
+        self._confirmar(pendentes)
+
+    def _rodar_em_savepoint(self, funcao, futuro, pendentes=None):
+        """
+        Roda a função num SAVEPOINT. Sucesso: resultado vai para `pendentes`
+        (ou direto para o Future, se pendentes=None). Erro: desfaz só esta
+        escrita. Retorna False se a transação externa foi perdida.
+        """
+        try:
+            self._conn.execute("SAVEPOINT escrita")
+            resultado = funcao(self._conn)
+            self._conn.execute("RELEASE escrita")
+        except Exception as e:
+            futuro.set_exception(e)
+            if not self._conn.in_transaction:
+                return False
+            self._conn.execute("ROLLBACK TO escrita")
+            self._conn.execute("RELEASE escrita")
+            return True
+        if pendentes is None:
+            futuro.set_result(resultado)
+        else:
+            pendentes.append((futuro, resultado))
+        return True
+
+    def _confirmar(self, pendentes):
+        """COMMIT do lote; só então os Futures recebem os resultados"""
+        try:
+            if self._conn.in_transaction:
+                self._conn.commit()
+        except Exception as e:
+            self._conn.rollback()
+            for futuro, _ in pendentes:
+                futuro.set_exception(e)
+            return
+        for futuro, resultado in pendentes:
+            futuro.set_result(resultado)
@@ -0,0 +1,18 @@
+"""
+Ferramentas da página 🛠️ Ferramentas. Cada módulo expõe render(db) e só é
+importado quando a página é aberta.
+"""
+import importlib
+
+# Nome da aba -> módulo dentro de ferramentas/
+FERRAMENTAS = {
+    "🎲 Sorteador de Jogador": "sorteador_jogador",
+    "⚖️ Gerador de Times": "gerador_times",
+    "🎯 O que jogar?": "recomendador",
+    "📈 Relatórios": "relatorios",
+}
+
+
+def carregar(nome):
+    """Importa (na primeira vez) e devolve o módulo da ferramenta"""
+    return importlib.import_module(f"{__name__}.{FERRAMENTAS[nome]}")
@@ -0,0 +1,261 @@
+"""
+Gerador de times equilibrados por Elo.
+
+Divide os jogadores em N times de tamanhos o mais iguais possível (diferença
+máxima de 1) minimizando a diferença entre a maior e a menor média de Elo
+dos times, a mesma média usada em calcular_elos_partida.
+
+- Poucas divisões possíveis (até LIMITE_EXATO): busca exata, testa todas.
+- Mais que isso: guloso (jogador mais forte para o time mais abaixo da meta)
+  e algumas divisões aleatórias, cada um seguido de busca local por trocas
+  de pares entre times; fica a melhor.
+"""
+import math
+import random
+from itertools import combinations
+
+import numpy as np
+import streamlit as st
+
+# Acima deste número de divisões distintas usa a heurística
+LIMITE_EXATO = 20_000
+
+# Trocas da busca local (cada rodada testa todos os pares de times)
+MAX_RODADAS = 50
+
+# Pontos de partida da busca local: o guloso + divisões aleatórias (semente fixa,
+# então a mesma seleção sempre gera os mesmos times)
+TENTATIVAS = 8
+
+
+def tamanhos_times(n_jogadores, n_times):
+    """Tamanhos dos times, maiores primeiro: 7 jogadores em 2 times -> [4, 3]"""
+    base, sobra = divmod(n_jogadores, n_times)
+    return [base + 1] * sobra + [base] * (n_times - sobra)
+
+
+def contar_divisoes(tamanhos):
+    """Quantas divisões distintas existem (times do mesmo tamanho são intercambiáveis)"""
+    total = math.factorial(sum(tamanhos))
+    for tamanho in tamanhos:
+        total //= math.factorial(tamanho)
+    for repeticoes in {t: tamanhos.count(t) for t in tamanhos}.values():
+        total //= math.factorial(repeticoes)
+    return total
+
+
+def _diferenca(somas, tamanhos):
+    medias = [s / t for s, t in zip(somas, tamanhos)]
+    return max(medias) - min(medias)
+
+
+def _divisao_exata(elos, tamanhos):
+    """Testa todas as divisões; cada uma aparece uma vez só (sem permutar times iguais)"""
+    n_times = len(tamanhos)
+    ordem = sorted(range(len(elos)), key=lambda i: -elos[i])
+    somas = [0.0] * n_times
+    vagas = list(tamanhos)
+    atribuicao = [0] * len(elos)
+    melhor = [math.inf, None]
+
+    def buscar(k):
+        if k == len(ordem):
+            diferenca = _diferenca(somas, tamanhos)
+            if diferenca < melhor[0]:
+                melhor[0], melhor[1] = diferenca, list(atribuicao)
+            return
+        jogador = ordem[k]
+        vazios_vistos = set()
+        for t in range(n_times):
+            if vagas[t] == 0:
+                continue
+            # Times vazios do mesmo tamanho são iguais: tenta só o primeiro
+            if vagas[t] == tamanhos[t]:
+                if tamanhos[t] in vazios_vistos:
+                    continue
+                vazios_vistos.add(tamanhos[t])
+            vagas[t] -= 1
+            somas[t] += elos[jogador]
+            atribuicao[jogador] = t
+            buscar(k + 1)
+            vagas[t] += 1
+            somas[t] -= elos[jogador]
+
+    buscar(0)
+    return melhor[1]
+
+
+def _divisao_gulosa(elos, tamanhos):
+    """Do mais forte ao mais fraco, cada um vai para o time mais longe da meta por vaga"""
+    media_geral = sum(elos) / len(elos)
+    metas = [t * media_geral for t in tamanhos]
+    somas = [0.0] * len(tamanhos)
+    vagas = list(tamanhos)
+    atribuicao = [0] * len(elos)
+    for jogador in sorted(range(len(elos)), key=lambda i: -elos[i]):
+        time = max(
+            (t for t in range(len(tamanhos)) if vagas[t] > 0),
+            key=lambda t: (metas[t] - somas[t]) / vagas[t]
+        )
+        atribuicao[jogador] = time
+        somas[time] += elos[jogador]
+        vagas[time] -= 1
+    return atribuicao
+
+
+def _melhor(candidato, atual, tolerancia=1e-9):
+    """Compara (diferença, quadrados) ignorando ruído de ponto flutuante"""
+    if candidato[0] < atual[0] - tolerancia:
+        return True
+    return abs(candidato[0] - atual[0]) <= tolerancia and candidato[1] < atual[1] - tolerancia
+
+
+def _busca_local(elos, tamanhos, atribuicao):
+    """
+    Troca pares de jogadores entre dois times enquanto alguma troca diminuir
+    (diferença de médias, soma dos quadrados dos desvios das médias). As trocas
+    de um par de times são avaliadas de uma vez com numpy.
+    """
+    elos = np.asarray(elos, dtype=float)
+    atribuicao = np.asarray(atribuicao)
+    tamanhos = np.asarray(tamanhos, dtype=float)
+    n_times = len(tamanhos)
+    somas = np.bincount(atribuicao, weights=elos, minlength=n_times)
+
+    def custo(somas):
+        medias = somas / tamanhos
+        return medias.max() - medias.min(), float(((medias - medias.mean()) ** 2).sum())
+
+    atual = custo(somas)
+    for _ in range(MAX_RODADAS):
+        melhorou = False
+        for a, b in combinations(range(n_times), 2):
+            membros_a = np.flatnonzero(atribuicao == a)
+            membros_b = np.flatnonzero(atribuicao == b)
+            # delta[i, j]: quanto a soma do time a cai ao trocar membros_a[i] por membros_b[j]
+            delta = elos[membros_a][:, None] - elos[membros_b][None, :]
+            medias = np.broadcast_to(somas / tamanhos, delta.shape + (n_times,)).copy()
+            medias[..., a] = (somas[a] - delta) / tamanhos[a]
+            medias[..., b] = (somas[b] + delta) / tamanhos[b]
+            diferencas = medias.max(axis=-1) - medias.min(axis=-1)
+            quadrados = ((medias - medias.mean(axis=-1, keepdims=True)) ** 2).sum(axis=-1)
+            i, j = np.unravel_index(np.lexsort((quadrados.ravel(), diferencas.ravel()))[0], delta.shape)
+            if _melhor((diferencas[i, j], quadrados[i, j]), atual):
+                atribuicao[membros_a[i]], atribuicao[membros_b[j]] = b, a
+                somas[a] -= delta[i, j]
+                somas[b] += delta[i, j]
+                atual = custo(somas)
+                melhorou = True
+        if not melhorou:
+            break
+    return atribuicao.tolist(), atual
+
+
+def dividir_times(elos, n_times, limite_exato=LIMITE_EXATO):
+    """
+    elos: {jogador_id: elo}
+    Retorna (times, exato): lista de listas de jogador_id (maiores times
+    primeiro, mais fortes primeiro dentro do time) e se a busca foi exata.
+    """
+    ids = list(elos)
+    if not 1 <= n_times <= len(ids):
+        raise ValueError("Número de times deve estar entre 1 e o número de jogadores")
+    valores = [float(elos[j]) for j in ids]
+    tamanhos = tamanhos_times(len(ids), n_times)
+
+    exato = contar_divisoes(tamanhos) <= limite_exato
+    if exato:
+        atribuicao = _divisao_exata(valores, tamanhos)
+    else:
+        rng = random.Random(0)
+        inicios = [_divisao_gulosa(valores, tamanhos)]
+        for _ in range(TENTATIVAS - 1):
+            aleatoria = [t for t, tamanho in enumerate(tamanhos) for _ in range(tamanho)]
+            rng.shuffle(aleatoria)
+            inicios.append(aleatoria)
+        melhor = None
+        for inicio in inicios:
+            atribuicao, custo = _busca_local(valores, tamanhos, inicio)
+            if melhor is None or _melhor(custo, melhor[1]):
+                melhor = (atribuicao, custo)
+        atribuicao = melhor[0]
+
+    times = [[] for _ in tamanhos]
+    for jogador, time in zip(ids, atribuicao):
+        times[time].append(jogador)
+    for time in times:
+        time.sort(key=lambda j: -elos[j])
+    return times, exato
+
+
+def media_time(time, elos):
+    return sum(elos[j] for j in time) / len(time)
+
+
+def render(db):
+    """Renderiza o gerador de times"""
+    st.title("⚖️ Gerador de Times")
+    st.markdown("---")
+
+    jogadores_df = db.get_jogadores()
+    if len(jogadores_df) < 2:
+        st.warning("⚠️ Cadastre pelo menos 2 jogadores!")
+        return
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        selecionados = st.multiselect(
+            "Quem vai jogar?",
+            options=jogadores_df['nome'].tolist(),
+            key='times_jogadores'
+        )
+    with col2:
+        # Menos jogadores marcados: traz o valor para dentro do novo máximo
+        max_times = max(2, len(selecionados))
+        if st.session_state.get('times_quantidade', 2) > max_times:
+            st.session_state['times_quantidade'] = max_times
+        n_times = st.number_input("Times", min_value=2, max_value=max_times, key='times_quantidade')
+
+    jogos_df = db.get_jogos()
+    referencia = st.selectbox(
+        "Elo de referência",
+        ["Geral"] + jogos_df['nome'].tolist(),
+        help="Elo de um jogo usa o ranking daquele jogo (quem nunca jogou fica com o Elo geral)",
+        key='times_referencia'
+    )
+
+    # Times gerados para outra seleção não valem mais
+    escolha = (tuple(selecionados), int(n_times), referencia)
+    if st.session_state.get('times_gerados', (None,))[0] != escolha:
+        st.session_state.pop('times_gerados', None)
+
+    if len(selecionados) < n_times:
+        st.info("💡 Selecione pelo menos um jogador por time")
+        return
+
+    if st.button("🔀 Gerar times", use_container_width=True, type="primary"):
+        elos = dict(zip(jogadores_df['nome'], jogadores_df['elo'].astype(float)))
+        if referencia != "Geral":
+            jogo_id = jogos_df.loc[jogos_df['nome'] == referencia, 'id'].iloc[0]
+            ranking_jogo = db.get_ranking_jogo(jogo_id)
+            elos.update(zip(ranking_jogo['nome'], ranking_jogo['elo'].astype(float)))
+        elos = {nome: elos[nome] for nome in selecionados}
+        times, exato = dividir_times(elos, int(n_times))
+        st.session_state['times_gerados'] = (escolha, times, elos, exato)
+
+    if 'times_gerados' not in st.session_state:
+        return
+    _, times, elos, exato = st.session_state['times_gerados']
+
+    medias = [media_time(time, elos) for time in times]
+    st.metric(
+        "Diferença entre médias", f"{max(medias) - min(medias):.1f}",
+        help="Melhor divisão possível" if exato else "Heurística (muitos jogadores para testar todas as divisões)"
+    )
+    colunas = st.columns(len(times))
+    for i, (coluna, time, media) in enumerate(zip(colunas, times, medias), 1):
+        with coluna:
+            st.subheader(f"Time {i}")
+            st.caption(f"Elo médio: {media:.1f}")
+            for nome in time:
+                st.write(f"• {nome} ({elos[nome]:.0f})")
@@ -0,0 +1,63 @@
+import streamlit as st
+
+import ranking
+from perfil import medir
+
+
+def render(db):
+    """Renderiza o recomendador de jogos"""
+    RankingCalculator = medir(ranking.RankingCalculator, "ranking")
+
+    st.title("🎯 O que jogar?")
+    st.markdown("---")
+
+    jogadores_df = db.get_jogadores()
+    if len(jogadores_df) == 0:
+        st.warning("⚠️ Nenhum jogador cadastrado ainda!")
+        return
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        selecionados = st.multiselect(
+            "Quem está na mesa?",
+            options=jogadores_df['nome'].tolist(),
+            key='recomendador_jogadores'
+        )
+    with col2:
+        tempo = st.number_input(
+            "Tempo disponível (min)", min_value=0, max_value=600, value=90, step=15,
+            help="0 = sem limite", key='recomendador_tempo'
+        )
+
+    if len(selecionados) == 0:
+        st.info("💡 Selecione quem vai jogar")
+        return
+
+    ids = jogadores_df.set_index('nome').loc[selecionados, 'id'].tolist()
+    recomendacao = RankingCalculator.recomendar_jogos(db, ids, tempo or None)
+
+    if len(recomendacao) == 0:
+        st.warning("Nenhum jogo cadastrado comporta esse grupo nesse tempo")
+        return
+
+    st.caption(
+        "Pontuação = média de **novidade** (há quanto tempo o grupo não joga, "
+        f"satura em {RankingCalculator.DIAS_NOVIDADE} dias) e **competitividade** "
+        "(Elos do grupo próximos, pesando mais em jogos pesados)"
+    )
+    st.dataframe(
+        recomendacao.drop(columns=['jogo_id']).head(30),
+        width="stretch",
+        column_config={
+            'jogo': "Jogo",
+            'jogadores': "Jogadores",
+            'tempo_max': st.column_config.NumberColumn("Tempo", format="%d min"),
+            'peso_bgg': st.column_config.NumberColumn("Peso", format="%.2f"),
+            'ultima_vez': "Última vez",
+            'partidas_grupo': "Partidas do grupo",
+            'desvio_elo': "Desvio de Elo",
+            'novidade': st.column_config.ProgressColumn("Novidade", min_value=0, max_value=1),
+            'competitividade': st.column_config.ProgressColumn("Competitividade", min_value=0, max_value=1),
+            'pontuacao': st.column_config.NumberColumn("Pontuação", format="%.3f"),
+        }
+    )
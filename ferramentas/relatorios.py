@@ -0,0 +1,76 @@
+import streamlit as st
+
+import analises
+from perfil import medir
+
+
+def render(db):
+    """Renderiza os relatórios analíticos"""
+    relatorios = medir(analises, "analises")
+
+    st.title("📈 Relatórios")
+    st.markdown("---")
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        relatorio = st.radio(
+            "Relatório", ["Temporadas", "Mecânicas", "Confrontos"],
+            horizontal=True, key='relatorios_tipo'
+        )
+    with col2:
+        motores = list(analises.MOTORES) if analises.duckdb_disponivel() else ['pandas']
+        motor = st.selectbox(
+            "Motor", motores, key='relatorios_motor',
+            help="duckdb roda em várias threads sobre o histórico em memória; o resultado é o mesmo"
+        )
+
+    if relatorio == "Temporadas":
+        df = relatorios.resumo_temporadas(db, motor=motor)
+        if len(df) == 0:
+            st.info("Nenhuma partida válida registrada ainda.")
+            return
+        temporada = st.selectbox("Temporada", df['temporada'].unique().tolist(), key='relatorios_temporada')
+        st.dataframe(
+            df[df['temporada'] == temporada].drop(columns=['temporada']),
+            width="stretch",
+            hide_index=True,
+            column_config={
+                'jogador': "Jogador",
+                'partidas': "Partidas",
+                'vitorias': "Vitórias",
+                'taxa_vitoria': st.column_config.NumberColumn("Vitórias (%)", format="%.2f"),
+                'posicao_media': st.column_config.NumberColumn("Posição média", format="%.2f"),
+            }
+        )
+
+    elif relatorio == "Mecânicas":
+        min_partidas = st.number_input(
+            "Mínimo de partidas", min_value=1, max_value=100, value=5, key='relatorios_min_partidas'
+        )
+        df = relatorios.vitorias_por_mecanica(db, min_partidas=min_partidas, motor=motor)
+        if len(df) == 0:
+            st.info("Nenhuma partida em jogos com mecânicas do BGG.")
+            return
+        mecanica = st.selectbox("Mecânica", df['mecanica'].unique().tolist(), key='relatorios_mecanica')
+        st.dataframe(
+            df[df['mecanica'] == mecanica].drop(columns=['mecanica']),
+            width="stretch",
+            hide_index=True,
+            column_config={
+                'jogador': "Jogador",
+                'partidas': "Partidas",
+                'vitorias': "Vitórias",
+                'taxa_vitoria': st.column_config.NumberColumn("Vitórias (%)", format="%.2f"),
+            }
+        )
+
+    else:
+        df = relatorios.matriz_confrontos(db, motor=motor)
+        if len(df) == 0:
+            st.info("Nenhum confronto registrado ainda.")
+            return
+        st.caption("Aproveitamento da linha contra a coluna (empate vale meia vitória)")
+        st.dataframe(
+            df.pivot(index='jogador', columns='adversario', values='aproveitamento'),
+            width="stretch"
+        )
@@ -1,6 +1,73 @@
 import streamlit as st
+import json
 import random
-import time
+
+# Animação da roleta roda no navegador: o servidor só sorteia e manda o
+# vencedor. Intervalos (ms) entre os nomes, desacelerando no fim.
+VELOCIDADES_MS = [80] * 8 + [120, 160, 200, 250, 300, 350, 400]
+
+# Sorteio justo: sorteios seguidos sem começar que ainda aumentam o peso
+MAX_ESPERA = 5
+
+_ROLETA_HTML = """
+<div id="roleta" style="text-align: center; font-family: sans-serif; font-weight: bold;
+     color: #F4D03F; font-size: 60px; line-height: 1.3; padding-top: 10px;"></div>
+<script>
+const nomes = __NOMES__, vencedor = __VENCEDOR__, velocidades = __VELOCIDADES__;
+const roleta = document.getElementById("roleta");
+let i = 0;
+function girar() {
+    if (i < velocidades.length) {
+        roleta.textContent = nomes[Math.floor(Math.random() * nomes.length)];
+        setTimeout(girar, velocidades[i++]);
+        return;
+    }
+    roleta.style.color = "#2ECC71";
+    roleta.style.fontSize = "70px";
+    roleta.textContent = "🎉 " + vencedor + " 🎉";
+    const aviso = document.createElement("div");
+    aviso.style.cssText = "font-size: 22px; color: #2ECC71; margin-top: 10px;";
+    aviso.textContent = "✅ " + vencedor + " começa jogando!";
+    roleta.appendChild(aviso);
+}
+girar();
+</script>
+"""
+
+
+def _json_js(valor):
+    """JSON seguro para embutir dentro de <script>"""
+    return json.dumps(valor, ensure_ascii=False).replace("</", "<\\/")
+
+
+def _roleta(nomes, vencedor, numero):
+    """HTML da roleta; `numero` muda a cada sorteio para o iframe animar de novo"""
+    html = (_ROLETA_HTML
+            .replace("__NOMES__", _json_js(nomes))
+            .replace("__VENCEDOR__", _json_js(vencedor))
+            .replace("__VELOCIDADES__", _json_js(VELOCIDADES_MS)))
+    return f"<!-- sorteio {numero} -->" + html
+
+
+def pesos_justos(jogador_ids, estatisticas):
+    """
+    Peso de cada jogador no sorteio justo (estatisticas = db.get_estatisticas_sorteio):
+    - espera: 1 + sorteios seguidos sem começar (até MAX_ESPERA); quem nunca
+      participou de sorteio conta como espera máxima
+    - frequência: (esperado + 1) / (vezes_sorteado + 1), abaixo de 1 para quem
+      já começou mais vezes do que a sorte daria
+    """
+    pesos = []
+    for jogador_id in jogador_ids:
+        estat = estatisticas.get(jogador_id)
+        if estat is None:
+            pesos.append(1.0 + MAX_ESPERA)
+            continue
+        espera = 1 + min(estat.desde_ultimo, MAX_ESPERA)
+        frequencia = (estat.esperado + 1) / (estat.vezes_sorteado + 1)
+        pesos.append(espera * frequencia)
+    return pesos
+
 
 def render(db):
     """Renderiza o sorteador de jogador"""
@@ -41,48 +108,66 @@ def render(db):
     
     st.markdown("---")
     
+    # Ids na ordem da seleção (nomes são únicos)
+    ids_por_nome = dict(zip(jogadores_df['nome'], jogadores_df['id'].astype(int)))
+    jogadores_selecionados = [nome for nome in jogadores_selecionados if nome in ids_por_nome]
+    participantes = [ids_por_nome[nome] for nome in jogadores_selecionados]
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        justo = st.toggle(
+            "⚖️ Sorteio justo",
+            help="Mais chance para quem está há mais sorteios sem começar ou começou menos do que deveria"
+        )
+    with col2:
+        vincular = st.toggle("🔗 Vincular à próxima partida registrada")
+    
+    pesos = None
+    if justo:
+        pesos = pesos_justos(participantes, db.get_estatisticas_sorteio(participantes))
+        total = sum(pesos)
+        st.caption("Chances: " + " · ".join(
+            f"{nome} {peso / total:.0%}" for nome, peso in zip(jogadores_selecionados, pesos)
+        ))
+    
+    st.markdown("---")
+    
     # Área da roleta
     col1, col2, col3 = st.columns([1, 2, 1])
     
     with col2:
-        resultado_placeholder = st.empty()
-        
-        # Mostra placeholder inicial
-        resultado_placeholder.markdown(
-            "<h1 style='text-align: center; color: #7F8C8D; font-size: 50px;'>❓</h1>", 
-            unsafe_allow_html=True
-        )
-        
         if st.button("🎰 SORTEAR!", use_container_width=True, type="primary"):
-            # Animação da roleta (15 rodadas)
-            velocidades = [0.08] * 8 + [0.12, 0.16, 0.20, 0.25, 0.30, 0.35, 0.4]
-            
-            for velocidade in velocidades:
-                nome_temp = random.choice(jogadores_selecionados)
-                resultado_placeholder.markdown(
-                    f"<h1 style='text-align: center; color: #F4D03F; font-size: 60px;'>{nome_temp}</h1>", 
-                    unsafe_allow_html=True
-                )
-                time.sleep(velocidade)
-            
-            # Resultado final
-            vencedor = random.choice(jogadores_selecionados)
-            resultado_placeholder.markdown(
-                f"<h1 style='text-align: center; color: #2ECC71; font-size: 80px;'>🎉 {vencedor} 🎉</h1>", 
+            vencedor_id = random.choices(participantes, weights=pesos)[0]
+            sorteio_id = db.registrar_sorteio(
+                participantes, vencedor_id, modo='justo' if justo else 'aleatorio'
+            )
+            vencedor = jogadores_selecionados[participantes.index(vencedor_id)]
+            # Contador da sessão, não o id do banco: sorteio que falhou ao
+            # salvar (id None) também precisa animar de novo
+            numero = st.session_state.get('sorteio_numero', 0) + 1
+            st.session_state['sorteio_numero'] = numero
+            st.session_state['sorteio_atual'] = (numero, list(jogadores_selecionados), vencedor)
+            if sorteio_id is None:
+                st.error("❌ Erro ao salvar o sorteio!")
+            elif vincular:
+                # Lido (e consumido) pela página Registrar Partida
+                st.session_state['sorteio_pendente'] = (sorteio_id, vencedor)
+        
+        if 'sorteio_atual' in st.session_state:
+            numero, nomes, vencedor = st.session_state['sorteio_atual']
+            st.iframe(_roleta(nomes, vencedor, numero), height=170)
+        else:
+            st.markdown(
+                "<h1 style='text-align: center; color: #7F8C8D; font-size: 50px;'>❓</h1>", 
                 unsafe_allow_html=True
             )
-            st.balloons()
-            
-            # Guarda no session_state para mostrar depois
-            if 'historico_sorteios' not in st.session_state:
-                st.session_state['historico_sorteios'] = []
-            st.session_state['historico_sorteios'].append(vencedor)
-            
-            st.success(f"✅ {vencedor} começa jogando!")
-    
-    # Histórico de sorteios (opcional)
-    if 'historico_sorteios' in st.session_state and len(st.session_state['historico_sorteios']) > 0:
+    
+    # Histórico de sorteios (gravado no banco)
+    sorteios = db.get_sorteios(limit=10)
+    if len(sorteios) > 0:
         st.markdown("---")
-        with st.expander("📜 Últimos sorteios desta sessão"):
-            for i, nome in enumerate(reversed(st.session_state['historico_sorteios'][-10:]), 1):
-                st.write(f"{i}. {nome}")
+        with st.expander("📜 Últimos sorteios"):
+            for i, sorteio in enumerate(sorteios.itertuples(), 1):
+                modo = " ⚖️" if sorteio.modo == 'justo' else ""
+                jogo = f" → {sorteio.jogo}" if sorteio.jogo else ""
+                st.write(f"{i}. {sorteio.vencedor}{modo} ({sorteio.quando[:16].replace('T', ' ')}){jogo}")
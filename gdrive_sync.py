@@ -1,17 +1,32 @@
 import streamlit as st
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload, MediaIoBaseDownload
-from google.oauth2.service_account import Credentials
 import io
 import os
+import sqlite3
+import tempfile
+import threading
+from datetime import datetime
+
+import replicacao
+from database import Database, uuids_partidas
+from ranking import RankingCalculator
 
 SCOPES = ['https://www.googleapis.com/auth/drive']
 DB_NAME = 'jogos.db'
-DRIVE_FILENAME = 'jogos.db'
+DRIVE_FILENAME = 'jogos.db'  # arquivo inteiro de antes da réplica por páginas
+
+# Diretório local no lugar do Drive (testes, uso offline): sem credenciais
+PASTA_LOCAL = os.environ.get('DJ_REPLICA_PASTA')
+
+# Envios que podem esbarrar em outra instância antes de desistir
+TENTATIVAS_ENVIO = 3
 
 
 def _get_service():
     creds_dict = dict(st.secrets["gdrive_credentials"])
+    # Imports do cliente Google só quando a sincronização roda (são pesados)
+    from googleapiclient.discovery import build
+    from google.oauth2.service_account import Credentials
+
     creds = Credentials.from_service_account_info(creds_dict, scopes=SCOPES)
     return build('drive', 'v3', credentials=creds)
 
@@ -20,50 +35,279 @@ def _get_folder_id():
     return st.secrets["gdrive"]["FOLDER_ID"]
 
 
-def _find_file_id(service):
-    """Acha o ID do jogos.db na pasta do Drive, ou None se não existir"""
-    folder_id = _get_folder_id()
-    query = f"name='{DRIVE_FILENAME}' and '{folder_id}' in parents and trashed=false"
-    result = service.files().list(q=query, fields="files(id)").execute()
-    files = result.get('files', [])
-    return files[0]['id'] if files else None
+class ArmazenamentoDrive:
+    """Objetos da réplica como arquivos na pasta do Drive (ver replicacao.py)"""
 
+    def __init__(self, service, folder_id):
+        self.service = service
+        self.folder_id = folder_id
+        self._ids = {}  # nome -> id do arquivo no Drive
 
-def baixar_db():
-    """Baixa jogos.db do Drive para o filesystem local. Retorna True se baixou."""
-    try:
-        service = _get_service()
-        file_id = _find_file_id(service)
-        if not file_id:
-            return False  # ainda não tem no Drive, usa o local
-
-        request = service.files().get_media(fileId=file_id)
-        buf = io.BytesIO()
-        downloader = MediaIoBaseDownload(buf, request)
+    def listar(self, prefixo):
+        query = f"name contains '{prefixo}' and '{self.folder_id}' in parents and trashed=false"
+        nomes = []
+        pagina = None
+        while True:
+            result = self.service.files().list(
+                q=query, fields="nextPageToken, files(id, name)", pageSize=1000, pageToken=pagina
+            ).execute()
+            for arquivo in result.get('files', []):
+                self._ids[arquivo['name']] = arquivo['id']
+                nomes.append(arquivo['name'])
+            pagina = result.get('nextPageToken')
+            if not pagina:
+                break
+        # Só o que está no Drive agora (outra instância pode ter apagado)
+        return [nome for nome in nomes if nome.startswith(prefixo)]
+
+    def _id(self, nome):
+        if nome not in self._ids:
+            self.listar(nome)
+        return self._ids[nome]
+
+    def ler(self, nome):
+        from googleapiclient.http import MediaIoBaseDownload
+        buffer = io.BytesIO()
+        downloader = MediaIoBaseDownload(buffer, self.service.files().get_media(fileId=self._id(nome)))
         done = False
         while not done:
             _, done = downloader.next_chunk()
+        return buffer.getvalue()
+
+    def gravar(self, nome, dados):
+        from googleapiclient.http import MediaIoBaseUpload
+        media = MediaIoBaseUpload(io.BytesIO(dados), mimetype='application/octet-stream')
+        metadata = {'name': nome, 'parents': [self.folder_id]}
+        criado = self.service.files().create(body=metadata, media_body=media, fields='id').execute()
+        # O Drive aceita nomes repetidos: vale o primeiro criado, o outro sai
+        mesmo_nome = self.service.files().list(
+            q=f"name = '{nome}' and '{self.folder_id}' in parents and trashed=false",
+            orderBy='createdTime', fields="files(id)"
+        ).execute().get('files', [])
+        if mesmo_nome and mesmo_nome[0]['id'] != criado['id']:
+            self.service.files().delete(fileId=criado['id']).execute()
+            raise FileExistsError(nome)
+        self._ids[nome] = criado['id']
+
+    def apagar(self, nome):
+        self.service.files().delete(fileId=self._id(nome)).execute()
+        self._ids.pop(nome, None)
+
+
+def _armazenamento():
+    if PASTA_LOCAL:
+        return replicacao.ArmazenamentoPasta(PASTA_LOCAL)
+    return ArmazenamentoDrive(_get_service(), _get_folder_id())
+
+
+# === HIDRATAÇÃO (download do Drive na inicialização) ===
+# Uma vez por processo, em background: as sessões renderizam a cópia local
+# enquanto o download roda e o banco é trocado só no final.
+_lock_hidratacao = threading.Lock()   # protege _hidratacao
+_lock_arquivo = threading.Lock()      # troca do banco x upload do arquivo
+_hidratacao = {'estado': 'pendente', 'inicio': None, 'fim': None, 'erro': None}
+
+# O que está na réplica remota: hashes das páginas (para enviar só o que
+# mudou) e uuids das partidas (para mesclar o que outra instância enviou)
+_lock_replica = threading.Lock()
+_replica = {'estado': None, 'partidas': None}
+
+EM_ANDAMENTO = ('pendente', 'baixando')
+
+
+def _baixar_para(caminho):
+    """
+    Restaura o banco do remoto em `caminho`: a réplica por páginas ou, se ela
+    ainda não existe, o jogos.db inteiro enviado antes dela.
+    Retorna (achou, EstadoReplica ou None).
+    """
+    armazenamento = _armazenamento()
+    imagem, estado = replicacao.restaurar(armazenamento)
+    if imagem is None:
+        if DRIVE_FILENAME not in armazenamento.listar(DRIVE_FILENAME):
+            return False, None  # ainda não tem no Drive, usa o local
+        imagem = armazenamento.ler(DRIVE_FILENAME)
+    with open(caminho, 'wb') as f:
+        f.write(imagem)
+    return True, estado
+
+
+def _validar_banco(caminho):
+    """Confere se o arquivo baixado é um SQLite íntegro com as tabelas do app"""
+    conn = sqlite3.connect(f"file:{caminho}?mode=ro", uri=True)
+    try:
+        if conn.execute("PRAGMA quick_check").fetchone()[0] != 'ok':
+            raise ValueError("arquivo do Drive corrompido")
+        tabelas = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if not {'jogadores', 'jogos', 'partidas', 'resultados'} <= tabelas:
+            raise ValueError("arquivo do Drive não é um banco da Diretoria")
+    finally:
+        conn.close()
+
+
+def _partidas_imagem(imagem):
+    """uuids das partidas de uma imagem do banco"""
+    conn = replicacao.abrir_imagem(imagem)
+    try:
+        return uuids_partidas(conn)
+    finally:
+        conn.close()
+
+
+def _banco_local_vazio(conn):
+    try:
+        return conn.execute("SELECT COUNT(*) FROM partidas").fetchone()[0] == 0
+    except sqlite3.OperationalError:
+        return True  # banco novo, ainda sem tabelas
+
+
+def _baixar_e_trocar():
+    """
+    Baixa para um arquivo temporário e copia para o jogos.db com a API de
+    backup do SQLite (quem está lendo vê o banco antigo ou o novo, nunca um
+    arquivo pela metade). Se o banco local recebeu escritas durante o
+    download, mantém o local e traz para ele as partidas que só existem no
+    Drive (o resultado vai para o Drive no próximo upload).
+    Retorna 'atualizado', 'sem_arquivo' ou 'local_alterado'.
+    """
+    pasta = os.path.dirname(os.path.abspath(DB_NAME))
+    fd, temporario = tempfile.mkstemp(suffix='.drive', dir=pasta)
+    os.close(fd)
+    # data_version muda quando OUTRA conexão faz commit no banco
+    local = sqlite3.connect(DB_NAME, timeout=30, check_same_thread=False)
+    try:
+        versao_inicial = local.execute("PRAGMA data_version").fetchone()[0]
+        achou, estado_replica = _baixar_para(temporario)
+        if not achou:
+            return 'sem_arquivo'
+        _validar_banco(temporario)
+
+        db = Database(DB_NAME)
+
+        def trocar(conn):
+            # Roda no escritor do banco: nenhuma escrita do app entra no meio
+            alterado = local.execute("PRAGMA data_version").fetchone()[0] != versao_inicial
+            if alterado and not _banco_local_vazio(local):
+                return 'local_alterado'
+            versao_local = db.get_versao_dados()
+            novo = sqlite3.connect(temporario)
+            try:
+                novo.backup(conn)
+            finally:
+                novo.close()
+            # A cópia do Drive pode ser de uma versão anterior do app: cria as
+            # tabelas/índices que faltarem e preenche os agregados. A versão
+            # dos dados continua subindo (senão um ETag antigo voltaria a valer).
+            conn.execute("BEGIN IMMEDIATE")
+            db._criar_tabelas(conn)
+            conn.execute(
+                "UPDATE metadados SET valor = MAX(valor, ?) + 1 WHERE chave = 'versao_dados'",
+                (versao_local,)
+            )
+            conn.commit()
+            return 'atualizado'
 
-        with open(DB_NAME, 'wb') as f:
-            f.write(buf.getvalue())
-        return True
+        with _lock_arquivo:
+            resultado = db.executar_escrita(trocar, transacao=False)
+        baixado = sqlite3.connect(temporario)
+        try:
+            partidas_remotas = uuids_partidas(baixado)
+            if resultado == 'local_alterado':
+                # Sem ancestral comum conhecido: só soma, não apaga nada
+                mescla = db.mesclar_partidas(baixado)
+                if mescla and any(mescla):
+                    RankingCalculator.recalcular_todos_elos(db)
+        finally:
+            baixado.close()
+        # Mesmo mantendo o local, o remoto é o que foi baixado: o próximo
+        # envio manda a diferença entre os dois
+        with _lock_replica:
+            _replica.update(estado=estado_replica, partidas=partidas_remotas)
+        return resultado
+    finally:
+        local.close()
+        os.remove(temporario)
+
+
+def _hidratar():
+    with _lock_hidratacao:
+        _hidratacao.update(estado='baixando', inicio=datetime.now())
+    try:
+        estado, erro = _baixar_e_trocar(), None
+    except Exception as e:
+        estado, erro = 'erro', str(e)
+    with _lock_hidratacao:
+        _hidratacao.update(estado=estado, erro=erro, fim=datetime.now())
+
+
+def iniciar_hidratacao():
+    """Dispara o download do Drive em background (só na primeira chamada do processo)"""
+    with _lock_hidratacao:
+        if _hidratacao['inicio'] is not None:
+            return
+        _hidratacao['inicio'] = datetime.now()
+    threading.Thread(target=_hidratar, name='hidratacao-drive', daemon=True).start()
+
+
+def estado_hidratacao():
+    """Cópia do estado: estado, inicio, fim, erro"""
+    with _lock_hidratacao:
+        return dict(_hidratacao)
+
+
+def baixar_db():
+    """Baixa jogos.db do Drive e troca o local (bloqueante). Retorna True se trocou."""
+    try:
+        return _baixar_e_trocar() == 'atualizado'
     except Exception as e:
         st.warning(f"⚠️ Não foi possível baixar backup do Drive: {e}")
         return False
 
 
+def _mesclar_remoto(armazenamento):
+    """
+    Traz para o jogos.db as partidas que outra instância enviou e passa a
+    considerar o remoto atual como o último estado comum (chamar com
+    _lock_replica). Partidas apagadas no remoto desde o último estado comum
+    são apagadas aqui; as apagadas aqui continuam apagadas.
+    """
+    imagem, estado = replicacao.restaurar(armazenamento)
+    partidas = set()
+    if imagem is not None:
+        remoto = replicacao.abrir_imagem(imagem)
+        try:
+            db = Database(DB_NAME)
+            mescla = db.mesclar_partidas(remoto, _replica['partidas'])
+            if mescla is None:
+                raise RuntimeError("não foi possível mesclar as partidas do Drive")
+            partidas = uuids_partidas(remoto)
+        finally:
+            remoto.close()
+        if any(mescla):
+            RankingCalculator.recalcular_todos_elos(db)
+    _replica.update(estado=estado, partidas=partidas)
+
+
 def fazer_upload_db():
-    """Faz upload do jogos.db local para o Drive (cria ou substitui)."""
+    """
+    Envia para o Drive as páginas do jogos.db que mudaram desde o último envio.
+    Se outra instância enviou antes (ConflitoReplica), mescla as partidas dela
+    no banco local e envia de novo: nenhuma das duas perde partidas.
+    """
     try:
-        service = _get_service()
-        file_id = _find_file_id(service)
-        media = MediaFileUpload(DB_NAME, mimetype='application/octet-stream')
-
-        if file_id:
-            service.files().update(fileId=file_id, media_body=media).execute()
-        else:
-            folder_id = _get_folder_id()
-            metadata = {'name': DRIVE_FILENAME, 'parents': [folder_id]}
-            service.files().create(body=metadata, media_body=media).execute()
+        armazenamento = _armazenamento()
+        for tentativa in range(TENTATIVAS_ENVIO):
+            # Não lê o banco no meio de uma troca pela hidratação
+            with _lock_arquivo:
+                imagem = replicacao.imagem_banco(DB_NAME)
+            with _lock_replica:
+                try:
+                    _replica['estado'] = replicacao.replicar(armazenamento, imagem, _replica['estado'])
+                    _replica['partidas'] = _partidas_imagem(imagem)
+                    return
+                except replicacao.ConflitoReplica:
+                    if tentativa == TENTATIVAS_ENVIO - 1:
+                        raise
+                    _mesclar_remoto(armazenamento)
     except Exception as e:
         st.warning(f"⚠️ Não foi possível fazer upload para o Drive: {e}")
@@ -0,0 +1,379 @@
+"""
+Instrumentação opcional do Database: tempo de cada método, SQL executado
+(cursor que mede execute/fetch*, mais sqlite3 set_trace_callback /
+set_progress_handler) e log de queries lentas com EXPLAIN QUERY PLAN.
+
+Ativa com a variável de ambiente DJ_INSTRUMENTACAO=1. O limite de query
+lenta (ms) vem de DJ_LIMITE_QUERY_MS (padrão 100). Os agregados ficam em
+memória, compartilhados por todas as sessões do processo.
+"""
+import collections
+import inspect
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import weakref
+
+logger = logging.getLogger(__name__)
+
+LIMITE_LENTA_MS = float(os.environ.get('DJ_LIMITE_QUERY_MS', 100))
+PASSOS_POR_CHAMADA = 1000  # progress handler é chamado a cada N instruções da VM
+
+_lock = threading.Lock()
+_metodos = {}      # nome -> {chamadas, tempo_total, tempo_max, linhas}
+_sql = {}          # sql normalizado -> {chamadas, tempo_total, tempo_max, passos_vm}
+_paginas = {}      # (pagina, metodo) -> {chamadas, tempo_total}
+_queries_lentas = collections.deque(maxlen=200)
+_contexto = threading.local()
+
+
+def ativa():
+    """Instrumentação ligada por variável de ambiente"""
+    return os.environ.get('DJ_INSTRUMENTACAO', '0') == '1'
+
+
+def definir_pagina(pagina):
+    """Marca a página que está sendo renderizada nesta thread (sessão)"""
+    _contexto.pagina = pagina
+
+
+def _pagina_atual():
+    return getattr(_contexto, 'pagina', None)
+
+
+def _pilha():
+    if not hasattr(_contexto, 'pilha'):
+        _contexto.pilha = []
+    return _contexto.pilha
+
+
+def _metodo_atual():
+    """Método do Database em execução ou, fora dele, a função que abriu a conexão"""
+    pilha = _pilha()
+    if pilha:
+        return pilha[-1]
+    frame = sys._getframe(1)
+    while frame is not None:
+        arquivo = os.path.basename(frame.f_code.co_filename)
+        if arquivo not in ('instrumentacao.py', 'database.py'):
+            return frame.f_code.co_name
+        frame = frame.f_back
+    return None
+
+
+def _normalizar(sql):
+    """Troca literais por ? para agrupar a mesma query com parâmetros diferentes"""
+    sql = re.sub(r"'(?:[^']|'')*'", '?', sql)
+    sql = re.sub(r'\b\d+(?:\.\d+)?\b', '?', sql)
+    return ' '.join(sql.split())
+
+
+def _contar_linhas(resultado):
+    if resultado is None or isinstance(resultado, (bool, int, float, str, bytes)):
+        return 0
+    if isinstance(resultado, tuple):
+        return sum(_contar_linhas(r) for r in resultado)
+    try:
+        return len(resultado)
+    except TypeError:
+        return 1
+
+
+class CursorInstrumentado(sqlite3.Cursor):
+    """
+    Cursor que soma o tempo passado dentro de execute*/fetch*/next. O
+    statement termina quando as linhas acabam, o cursor é reusado ou
+    fechado, ou a conexão fecha; o tempo entre as chamadas (código do
+    chamador, conexão parada entre jobs do escritor) não conta.
+    """
+
+    def __init__(self, conexao):
+        super().__init__(conexao)
+        self._conexao = conexao
+        self._statement = None
+
+    def _medir(self, funcao, *args):
+        if self._statement is None:
+            return funcao(*args)
+        conexao = self._conexao
+        anterior, conexao._statement = conexao._statement, self._statement
+        inicio = time.perf_counter()
+        try:
+            return funcao(*args)
+        finally:
+            self._statement['tempo'] += time.perf_counter() - inicio
+            conexao._statement = anterior
+
+    def _executar(self, funcao, sql, *args):
+        self._fechar_statement()
+        self._statement = {'sql': None, 'sql_original': sql, 'tempo': 0.0, 'passos': 0}
+        self._medir(funcao, sql, *args)
+        if self.description is None:
+            self._fechar_statement()  # sem linhas para ler (INSERT, UPDATE, ...)
+        return self
+
+    def execute(self, sql, parameters=()):
+        return self._executar(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._executar(super().executemany, sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self._executar(super().executescript, sql_script)
+
+    def fetchone(self):
+        linha = self._medir(super().fetchone)
+        if linha is None:
+            self._fechar_statement()
+        return linha
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        linhas = self._medir(super().fetchmany, size)
+        if len(linhas) < size:
+            self._fechar_statement()
+        return linhas
+
+    def fetchall(self):
+        linhas = self._medir(super().fetchall)
+        self._fechar_statement()
+        return linhas
+
+    def __next__(self):
+        try:
+            return self._medir(super().__next__)
+        except StopIteration:
+            self._fechar_statement()
+            raise
+
+    def close(self):
+        self._fechar_statement()
+        super().close()
+
+    def _fechar_statement(self):
+        statement, self._statement = self._statement, None
+        if statement is None:
+            return
+        sql = statement['sql'] or statement['sql_original']
+        if sql.lstrip().upper().startswith('PRAGMA'):
+            return
+        conexao = self._conexao
+        _registrar_sql(sql, statement['tempo'], statement['passos'],
+                       conexao._metodo, conexao._pagina, conexao._db_name)
+
+
+class ConexaoInstrumentada(sqlite3.Connection):
+    """
+    Conexão que mede cada statement pelos seus cursores (CursorInstrumentado,
+    também usado por conn.execute) e o COMMIT/ROLLBACK. O trace callback só
+    guarda o SQL com os parâmetros já substituídos, para o EXPLAIN das lentas.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._db_name = args[0] if args else kwargs.get('database')
+        self._statement = None  # do cursor que está rodando agora
+        self._cursores = weakref.WeakSet()
+        self._metodo = _metodo_atual()
+        self._pagina = _pagina_atual()
+        self.set_trace_callback(self._ao_iniciar_statement)
+        self.set_progress_handler(self._ao_progredir, PASSOS_POR_CHAMADA)
+
+    def cursor(self, factory=None):
+        cursor = super().cursor(factory or CursorInstrumentado)
+        if isinstance(cursor, CursorInstrumentado):
+            self._cursores.add(cursor)
+        return cursor
+
+    # conn.execute* do sqlite3 não passam por self.cursor()
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+    def _ao_iniciar_statement(self, sql):
+        # Ignora o BEGIN implícito do módulo sqlite3 e os triggers ("-- TRIGGER ...")
+        if (self._statement is not None and self._statement['sql'] is None
+                and not sql.lstrip().upper().startswith(('BEGIN', '--'))):
+            self._statement['sql'] = sql
+
+    def _ao_progredir(self):
+        if self._statement is not None:
+            self._statement['passos'] += PASSOS_POR_CHAMADA
+        return 0
+
+    def _medir_transacao(self, sql, funcao):
+        if not self.in_transaction:
+            return funcao()
+        inicio = time.perf_counter()
+        try:
+            return funcao()
+        finally:
+            _registrar_sql(sql, time.perf_counter() - inicio, 0,
+                           self._metodo, self._pagina, self._db_name)
+
+    def commit(self):
+        self._medir_transacao('COMMIT', super().commit)
+
+    def rollback(self):
+        self._medir_transacao('ROLLBACK', super().rollback)
+
+    def close(self):
+        for cursor in list(self._cursores):
+            cursor._fechar_statement()
+        super().close()
+        _processar_lentas()
+
+
+def _registrar_sql(sql, duracao, passos, metodo, pagina, db_name):
+    chave = _normalizar(sql)
+    with _lock:
+        estat = _sql.setdefault(chave, {'chamadas': 0, 'tempo_total': 0.0, 'tempo_max': 0.0, 'passos_vm': 0})
+        estat['chamadas'] += 1
+        estat['tempo_total'] += duracao
+        estat['tempo_max'] = max(estat['tempo_max'], duracao)
+        estat['passos_vm'] += passos
+        if duracao * 1000 >= LIMITE_LENTA_MS:
+            _queries_lentas.append({
+                'quando': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'sql': sql,
+                'duracao_ms': round(duracao * 1000, 1),
+                'passos_vm': passos,
+                'metodo': metodo,
+                'pagina': pagina,
+                'db_name': db_name,
+                'plano': None,
+            })
+
+
+def _formatar_plano(linhas):
+    """Linhas (id, pai, _, detalhe) do EXPLAIN QUERY PLAN indentadas como árvore"""
+    profundidade = {0: -1}
+    partes = []
+    for id_, pai, _, detalhe in linhas:
+        profundidade[id_] = profundidade.get(pai, -1) + 1
+        partes.append('  ' * profundidade[id_] + detalhe)
+    return '\n'.join(partes)
+
+
+def _processar_lentas():
+    """Roda EXPLAIN QUERY PLAN das queries lentas ainda sem plano (fora do trace callback)"""
+    with _lock:
+        pendentes = [q for q in _queries_lentas if q['plano'] is None]
+        for q in pendentes:
+            q['plano'] = ''
+    for q in pendentes:
+        sql = q['sql'].lstrip()
+        if sql.upper().startswith(('SELECT', 'WITH')):
+            try:
+                conn = sqlite3.connect(f"file:{q['db_name']}?mode=ro", uri=True)
+                try:
+                    linhas = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+                finally:
+                    conn.close()
+                q['plano'] = _formatar_plano(linhas)
+            except sqlite3.Error as e:
+                q['plano'] = f"(sem plano: {e})"
+        logger.warning("Query lenta (%.1f ms) em %s [%s]: %s\n%s",
+                       q['duracao_ms'], q['metodo'], q['pagina'], ' '.join(sql.split()), q['plano'])
+
+
+def _instrumentar_metodo(nome, metodo):
+    def wrapper(*args, **kwargs):
+        pilha = _pilha()
+        pilha.append(nome)
+        inicio = time.perf_counter()
+        resultado = None
+        try:
+            resultado = metodo(*args, **kwargs)
+            return resultado
+        finally:
+            duracao = time.perf_counter() - inicio
+            pilha.pop()
+            pagina = _pagina_atual()
+            with _lock:
+                estat = _metodos.setdefault(nome, {'chamadas': 0, 'tempo_total': 0.0, 'tempo_max': 0.0, 'linhas': 0})
+                estat['chamadas'] += 1
+                estat['tempo_total'] += duracao
+                estat['tempo_max'] = max(estat['tempo_max'], duracao)
+                estat['linhas'] += _contar_linhas(resultado)
+                por_pagina = _paginas.setdefault((pagina, nome), {'chamadas': 0, 'tempo_total': 0.0})
+                por_pagina['chamadas'] += 1
+                por_pagina['tempo_total'] += duracao
+    wrapper.__name__ = nome
+    wrapper.__doc__ = metodo.__doc__
+    return wrapper
+
+
+def instrumentar(db):
+    """Envolve todos os métodos de uma instância de Database e troca a fábrica de conexões"""
+    if getattr(db, '_instrumentado', False):
+        return db
+    for nome, metodo in inspect.getmembers(db, inspect.ismethod):
+        # get_connection é medido pela própria conexão (fabrica_conexao)
+        if nome.startswith('__') or nome == 'get_connection':
+            continue
+        setattr(db, nome, _instrumentar_metodo(nome, metodo))
+    db.fabrica_conexao = ConexaoInstrumentada
+    db._instrumentado = True
+    return db
+
+
+# === RELATÓRIOS (página de admin) ===
+def resumo_metodos():
+    """Lista de dicts por método, do mais caro (tempo total) para o mais barato"""
+    with _lock:
+        linhas = [
+            {'metodo': nome, 'chamadas': e['chamadas'],
+             'tempo_total_ms': round(e['tempo_total'] * 1000, 1),
+             'tempo_medio_ms': round(e['tempo_total'] / e['chamadas'] * 1000, 2),
+             'tempo_max_ms': round(e['tempo_max'] * 1000, 1),
+             'linhas_retornadas': e['linhas']}
+            for nome, e in _metodos.items()
+        ]
+    return sorted(linhas, key=lambda x: -x['tempo_total_ms'])
+
+
+def resumo_sql():
+    with _lock:
+        linhas = [
+            {'sql': sql, 'chamadas': e['chamadas'],
+             'tempo_total_ms': round(e['tempo_total'] * 1000, 1),
+             'tempo_medio_ms': round(e['tempo_total'] / e['chamadas'] * 1000, 2),
+             'tempo_max_ms': round(e['tempo_max'] * 1000, 1),
+             'passos_vm': e['passos_vm']}
+            for sql, e in _sql.items()
+        ]
+    return sorted(linhas, key=lambda x: -x['tempo_total_ms'])
+
+
+def resumo_paginas():
+    with _lock:
+        linhas = [
+            {'pagina': pagina, 'metodo': metodo, 'chamadas': e['chamadas'],
+             'tempo_total_ms': round(e['tempo_total'] * 1000, 1)}
+            for (pagina, metodo), e in _paginas.items()
+        ]
+    return sorted(linhas, key=lambda x: (str(x['pagina']), -x['tempo_total_ms']))
+
+
+def queries_lentas():
+    _processar_lentas()
+    with _lock:
+        return list(reversed(_queries_lentas))
+
+
+def limpar():
+    with _lock:
+        _metodos.clear()
+        _sql.clear()
+        _paginas.clear()
+        _queries_lentas.clear()
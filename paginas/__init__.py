@@ -0,0 +1,29 @@
+"""
+Páginas do app, uma por módulo (cada uma expõe render(db)).
+
+O app.py só importa o módulo da página escolhida no menu, então o custo de
+import (ranking/numpy, Google API, altair, ferramentas) só é pago por quem
+abre a página que usa.
+"""
+import importlib
+
+# Rótulo do menu -> módulo dentro de paginas/ (na ordem do menu)
+PAGINAS = {
+    "🏠 Início": "inicio",
+    "➕ Registrar Partida": "registrar_partida",
+    "🏆 Rankings": "rankings",
+    "👥 Jogadores": "jogadores",
+    "🎮 Jogos": "jogos",
+    "📊 Histórico": "historico",
+    "🛠️ Ferramentas": "ferramentas",
+    "✏️ Editar": "editar",
+}
+
+# Página escondida (abrir com ?admin=1 na URL)
+PAGINA_ADMIN = ("🔧 Admin", "admin")
+
+
+def carregar(pagina):
+    """Importa (na primeira vez) e devolve o módulo da página"""
+    modulo = PAGINA_ADMIN[1] if pagina == PAGINA_ADMIN[0] else PAGINAS[pagina]
+    return importlib.import_module(f"{__name__}.{modulo}")
@@ -0,0 +1,38 @@
+"""Página escondida de administração (?admin=1): estatísticas da instrumentação"""
+import streamlit as st
+
+import instrumentacao
+
+
+def render(db):
+    st.title("🔧 Admin")
+    
+    if not instrumentacao.ativa():
+        st.info("Instrumentação desligada. Inicie o app com DJ_INSTRUMENTACAO=1 para coletar tempos.")
+        st.stop()
+    
+    if st.button("🧹 Limpar estatísticas"):
+        instrumentacao.limpar()
+        st.rerun()
+    
+    tab1, tab2, tab3, tab4 = st.tabs(["⏱️ Métodos", "📄 Páginas", "🗄️ SQL", "🐢 Queries Lentas"])
+    
+    with tab1:
+        st.dataframe(instrumentacao.resumo_metodos(), width="stretch", hide_index=True)
+    
+    with tab2:
+        st.dataframe(instrumentacao.resumo_paginas(), width="stretch", hide_index=True)
+    
+    with tab3:
+        st.dataframe(instrumentacao.resumo_sql(), width="stretch", hide_index=True)
+    
+    with tab4:
+        st.caption(f"Queries acima de {instrumentacao.LIMITE_LENTA_MS:.0f} ms (últimas 200)")
+        lentas = instrumentacao.queries_lentas()
+        if len(lentas) == 0:
+            st.info("Nenhuma query lenta registrada.")
+        for q in lentas:
+            with st.expander(f"{q['duracao_ms']} ms - {q['metodo']} ({q['pagina']}) - {q['quando']}"):
+                st.code(q['sql'], language="sql")
+                if q['plano']:
+                    st.code(q['plano'], language="text")
@@ -0,0 +1,256 @@
+"""Página de edição de jogadores, jogos e partidas"""
+import pandas as pd
+import streamlit as st
+
+import ranking
+from perfil import medir
+
+
+def render(db):
+    RankingCalculator = medir(ranking.RankingCalculator, "ranking")
+
+    st.title("✏️ Editar Registros")
+    
+    tab1, tab2, tab3 = st.tabs(["👥 Jogadores", "🎮 Jogos", "🎯 Partidas"])
+    
+    with tab1:
+        st.subheader("Editar Jogadores")
+        
+        # Mostra TODOS jogadores (ativos e inativos)
+        jogadores = db.get_jogadores(apenas_ativos=False)
+        
+        if len(jogadores) > 0:
+            # Adiciona indicador de status
+            jogadores['display_nome'] = jogadores.apply(
+                lambda x: f"{'✅' if x['ativo'] else '🚫'} {x['nome']}", 
+                axis=1
+            )
+            
+            jogador_selecionado = st.selectbox(
+                "Selecione um jogador",
+                jogadores['display_nome'].tolist(),
+                help="✅ = Ativo | 🚫 = Desativado"
+            )
+            
+            jogador_info = jogadores[jogadores['display_nome'] == jogador_selecionado].iloc[0]
+            
+            # Mostra status
+            if jogador_info['ativo'] == 0:
+                st.warning("⚠️ Este jogador está DESATIVADO (não aparece em registros novos)")
+            
+            with st.form("form_editar_jogador"):
+                nome = st.text_input("Nome", value=jogador_info['nome'])
+                
+                # ELO apenas para visualização (calculado automaticamente)
+                st.info(f"🎯 **ELO Atual:** {jogador_info['elo']:.1f} (calculado automaticamente baseado nas partidas)")
+                st.caption("💡 O ELO é recalculado automaticamente. Para atualizar, vá em Rankings → ELO → Recalcular.")
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    salvar = st.form_submit_button("💾 Salvar Nome", width="stretch")
+                
+                with col2:
+                    if jogador_info['ativo'] == 1:
+                        desativar = st.form_submit_button("🗑️ Desativar", width="stretch")
+                        reativar = False  # Garante que existe
+                    else:
+                        reativar = st.form_submit_button("✅ Reativar", width="stretch", type="primary")
+                        desativar = False  # Garante que existe
+            
+            # Processa ações FORA do form
+            if salvar:
+                sucesso = db.update_jogador(jogador_info['id'], nome)
+                if sucesso:
+                    st.success("✅ Jogador atualizado!")
+                    st.rerun()
+                else:
+                    st.error("❌ Erro ao atualizar (nome pode já existir)")
+            
+            if desativar:
+                st.write("🔍 DEBUG: Botão desativar clicado!")  # DEBUG
+                st.write(f"🔍 DEBUG: jogador_info['id'] = {jogador_info['id']}")  # DEBUG
+                db.desativar_jogador(jogador_info['id'])
+                st.success(f"🗑️ Jogador '{jogador_info['nome']}' desativado!")
+                st.info("💡 Jogador não aparecerá mais em novos registros, mas histórico está preservado.")
+                st.balloons()
+                st.rerun()
+            
+            if reativar:
+                st.write("🔍 DEBUG: Botão reativar clicado!")  # DEBUG
+                db.reativar_jogador(jogador_info['id'])
+                st.success(f"✅ Jogador '{jogador_info['nome']}' reativado!")
+                st.balloons()
+                st.rerun()
+        else:
+            st.info("Nenhum jogador cadastrado.")
+    
+    with tab2:
+        st.subheader("Editar Jogos")
+        
+        # Mostra TODOS jogos (ativos e inativos)
+        jogos = db.get_jogos(apenas_ativos=False)
+        
+        if len(jogos) > 0:
+            # Adiciona indicador de status
+            jogos['display_nome'] = jogos.apply(
+                lambda x: f"{'✅' if x['ativo'] else '🚫'} {x['nome']}", 
+                axis=1
+            )
+            
+            jogo_selecionado = st.selectbox(
+                "Selecione um jogo",
+                jogos['display_nome'].tolist(),
+                help="✅ = Ativo | 🚫 = Desativado"
+            )
+            
+            jogo_info = jogos[jogos['display_nome'] == jogo_selecionado].iloc[0]
+            
+            # Mostra status
+            if jogo_info['ativo'] == 0:
+                st.warning("⚠️ Este jogo está DESATIVADO (não aparece em registros novos)")
+            
+            with st.form("form_editar_jogo"):
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    nome = st.text_input("Nome", value=jogo_info['nome'])
+                    peso = st.number_input("Peso BGG", min_value=1.0, max_value=5.0, 
+                                          value=float(jogo_info['peso_bgg']), step=0.1)
+                    min_jog = st.number_input("Min Jogadores", min_value=1, 
+                                             value=int(jogo_info['min_jogadores']) if pd.notna(jogo_info['min_jogadores']) else 2)
+                    max_jog = st.number_input("Max Jogadores", min_value=1, 
+                                             value=int(jogo_info['max_jogadores']) if pd.notna(jogo_info['max_jogadores']) else 4)
+                
+                with col2:
+                    tempo_min = st.number_input("Tempo Min (min)", min_value=0, 
+                                               value=int(jogo_info['tempo_min']) if pd.notna(jogo_info['tempo_min']) else 30)
+                    tempo_max = st.number_input("Tempo Max (min)", min_value=0, 
+                                               value=int(jogo_info['tempo_max']) if pd.notna(jogo_info['tempo_max']) else 60)
+                    tipo = st.text_input("Tipo", value=str(jogo_info['tipo']) if pd.notna(jogo_info['tipo']) else "")
+                    link = st.text_input("Link BGG", value=str(jogo_info['link_bgg']) if pd.notna(jogo_info['link_bgg']) else "")
+                
+                categoria = st.text_input("Categoria", value=str(jogo_info['categoria']) if pd.notna(jogo_info['categoria']) else "")
+                mecanicas = st.text_area("Mecânicas", value=str(jogo_info['mecanicas']) if pd.notna(jogo_info['mecanicas']) else "")
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    salvar = st.form_submit_button("💾 Salvar Alterações", width="stretch")
+                
+                with col2:
+                    if jogo_info['ativo'] == 1:
+                        desativar_jogo = st.form_submit_button("🗑️ Desativar", width="stretch")
+                        reativar_jogo = False  # Garante que existe
+                    else:
+                        reativar_jogo = st.form_submit_button("✅ Reativar", width="stretch", type="primary")
+                        desativar_jogo = False  # Garante que existe
+            
+            # Processa ações FORA do form
+            if salvar:
+                dados = {
+                    'nome': nome,
+                    'peso_bgg': peso,
+                    'min_jogadores': min_jog,
+                    'max_jogadores': max_jog,
+                    'tempo_min': tempo_min,
+                    'tempo_max': tempo_max,
+                    'tipo': tipo if tipo else None,
+                    'categoria': categoria if categoria else None,
+                    'mecanicas': mecanicas if mecanicas else None,
+                    'link_bgg': link if link else None
+                }
+                sucesso = db.update_jogo(jogo_info['id'], dados)
+                if sucesso:
+                    st.success("✅ Jogo atualizado!")
+                    st.rerun()
+                else:
+                    st.error("❌ Erro ao atualizar")
+            
+            if desativar_jogo:
+                st.write("🔍 DEBUG: Botão desativar jogo clicado!")  # DEBUG
+                db.desativar_jogo(jogo_info['id'])
+                st.success(f"🗑️ Jogo '{jogo_info['nome']}' desativado!")
+                st.info("💡 Jogo não aparecerá mais em novos registros.")
+                st.balloons()
+                st.rerun()
+            
+            if reativar_jogo:
+                st.write("🔍 DEBUG: Botão reativar jogo clicado!")  # DEBUG
+                db.reativar_jogo(jogo_info['id'])
+                st.success(f"✅ Jogo '{jogo_info['nome']}' reativado!")
+                st.balloons()
+                st.rerun()
+        else:
+            st.info("Nenhum jogo cadastrado.")
+    
+    with tab3:
+        st.subheader("Editar/Excluir Partidas")
+        
+        partidas = db.get_partidas(limit=50)
+        
+        if len(partidas) > 0:
+            # Cria identificador visual (tratando None em jogadores)
+            partidas['display'] = partidas.apply(
+                lambda x: f"{x['data']} - {x['jogo']} ({x['jogadores'][:50] if x['jogadores'] else 'Sem jogadores'}...)", 
+                axis=1
+            )
+            
+            partida_selecionada = st.selectbox(
+                "Selecione uma partida",
+                partidas['display'].tolist(),
+                key="select_partida_edit"
+            )
+            
+            idx = partidas[partidas['display'] == partida_selecionada].index[0]
+            partida_id = int(partidas.loc[idx, 'id'])  # Força int nativo
+            
+            # Busca detalhes
+            partida_info, resultados = db.get_partida_detalhes(partida_id)
+            
+            if partida_info is None:
+                st.error("❌ Erro ao carregar detalhes da partida")
+            else:
+                st.write(f"**Jogo:** {partida_info.jogo_nome}")
+                st.write(f"**Data:** {partida_info.data}")
+                st.write(f"**Válida para ranking:** {partida_info.valida_ranking}")
+                st.write(f"**Jogo de times:** {partida_info.eh_jogo_time}")
+                
+                st.markdown("**Resultados:**")
+                st.dataframe(
+                    [{'jogador_nome': r.jogador_nome, 'posicao': r.posicao, 'pontuacao': r.pontuacao}
+                     for r in resultados],
+                    hide_index=True,
+                    column_config={
+                        "jogador_nome": "Jogador",
+                        "posicao": "Posição",
+                        "pontuacao": "Pontuação"
+                    }
+                )
+                
+                st.markdown("---")
+                
+                # Opções de edição
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    editar_mode = st.checkbox("✏️ Habilitar edição", key=f"edit_{partida_id}")
+                
+                with col2:
+                    confirmar_delete = st.checkbox("⚠️ Confirmar exclusão", key=f"del_{partida_id}")
+                
+                if editar_mode:
+                    st.warning("🚧 Edição completa em desenvolvimento. Por enquanto, exclua e registre novamente.")
+                
+                if confirmar_delete:
+                    if st.button("🗑️ EXCLUIR PARTIDA PERMANENTEMENTE", width="stretch", type="primary"):
+                        if db.delete_partida(partida_id):
+                            st.success("✅ Partida excluída!")
+                            # Recalcula Elos
+                            with st.spinner("Recalculando Elos..."):
+                                RankingCalculator.recalcular_todos_elos(db)
+                            st.rerun()
+                        else:
+                            st.error("❌ Erro ao excluir partida")
+        else:
+            st.info("Nenhuma partida registrada.")
@@ -0,0 +1,15 @@
+"""Página de ferramentas (uma aba por ferramenta registrada)"""
+import streamlit as st
+
+import ferramentas
+
+
+def render(db):
+    st.title("🛠️ Ferramentas")
+    
+    # Abas para cada ferramenta
+    abas = st.tabs(list(ferramentas.FERRAMENTAS))
+    
+    for aba, nome in zip(abas, ferramentas.FERRAMENTAS):
+        with aba:
+            ferramentas.carregar(nome).render(db)
@@ -0,0 +1,38 @@
+"""Página de histórico de partidas"""
+import streamlit as st
+
+
+def render(db):
+    st.title("📊 Histórico de Partidas")
+    
+    partidas = db.get_partidas()
+    
+    if len(partidas) > 0:
+        # Filtros
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            jogos_unicos = db.get_jogos()['nome'].tolist()
+            jogo_filtro = st.selectbox("Filtrar por jogo", ["Todos"] + jogos_unicos)
+        
+        with col2:
+            ordenacao = st.selectbox("Ordenar por", ["Mais recentes", "Mais antigas"])
+        
+        # Aplica filtros (simplificado - pode melhorar)
+        df_exibir = partidas
+        
+        st.dataframe(
+            df_exibir[['data', 'jogo', 'peso_bgg', 'jogadores']],
+            width="stretch",
+            hide_index=True,
+            column_config={
+                "data": "Data",
+                "jogo": "Jogo",
+                "peso_bgg": "Peso",
+                "jogadores": "Jogadores (Posição)"
+            }
+        )
+        
+        st.metric("Total de Partidas", len(df_exibir))
+    else:
+        st.info("Nenhuma partida registrada ainda.")
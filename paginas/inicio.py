@@ -0,0 +1,38 @@
+"""Página inicial: contadores e últimas partidas"""
+import streamlit as st
+
+
+def render(db):
+    st.title("🏠 Dashboard")
+    st.write("Bem-vindo à **Diretoria da Jogatina**!")
+    
+    metricas = db.get_metricas_dashboard()
+    
+    col1, col2, col3 = st.columns(3)
+    col1.metric("👥 Jogadores Ativos", metricas.jogadores)
+    col2.metric("🎮 Jogos Cadastrados", metricas.jogos)
+    col3.metric("🎯 Partidas Registradas", metricas.partidas)
+    
+    col1, col2, col3 = st.columns(3)
+    if metricas.ultima_jogatina_data:
+        col1.metric(
+            "📅 Última Jogatina", metricas.ultima_jogatina_data,
+            f"{metricas.ultima_jogatina_partidas} partidas", delta_color="off",
+            help=metricas.ultima_jogatina_local
+        )
+    if metricas.jogo_do_mes:
+        col2.metric(
+            "🔥 Jogo do Mês", metricas.jogo_do_mes,
+            f"{metricas.jogo_do_mes_partidas} partidas", delta_color="off"
+        )
+    if metricas.lider_nome:
+        col3.metric("👑 Líder no ELO", metricas.lider_nome, f"{metricas.lider_elo:.0f}", delta_color="off")
+    
+    st.markdown("---")
+    
+    st.subheader("📊 Últimas Partidas")
+    ultimas = db.get_partidas(limit=10)
+    if len(ultimas) > 0:
+        st.dataframe(ultimas[['data', 'jogo', 'jogadores']], width="stretch", hide_index=True)
+    else:
+        st.info("Nenhuma partida registrada ainda. Vá em 'Registrar Partida' para começar!")
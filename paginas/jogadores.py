@@ -0,0 +1,89 @@
+"""Página de cadastro e listagem de jogadores"""
+import streamlit as st
+
+
+def render(db):
+    st.title("👥 Gerenciar Jogadores")
+    
+    tab1, tab2, tab3 = st.tabs(["📋 Lista", "➕ Adicionar", "🪪 Perfil"])
+    
+    with tab1:
+        st.subheader("Jogadores Cadastrados")
+        jogadores = db.get_jogadores()
+        
+        if len(jogadores) > 0:
+            st.dataframe(
+                jogadores[['nome', 'elo']],
+                width="stretch",
+                hide_index=True,
+                column_config={
+                    "nome": "Nome",
+                    "elo": "ELO Atual"
+                }
+            )
+        else:
+            st.info("Nenhum jogador cadastrado ainda.")
+    
+    with tab2:
+        st.subheader("Adicionar Novo Jogador")
+        
+        with st.form("form_jogador"):
+            nome = st.text_input("Nome do Jogador")
+            elo_inicial = st.number_input("ELO Inicial", min_value=0, value=1500, step=50)
+            
+            submit = st.form_submit_button("💾 Salvar Jogador")
+            
+            if submit:
+                if nome.strip() == "":
+                    st.error("❌ Nome não pode ser vazio!")
+                else:
+                    sucesso = db.add_jogador(nome.strip(), elo_inicial)
+                    if sucesso:
+                        st.success(f"✅ Jogador '{nome}' adicionado com sucesso!")
+                        st.rerun()
+                    else:
+                        st.error("❌ Jogador já existe!")
+    
+    with tab3:
+        st.subheader("Perfil do Jogador")
+        jogadores = db.get_jogadores()
+        
+        if len(jogadores) == 0:
+            st.info("Nenhum jogador cadastrado ainda.")
+            return
+        
+        nome = st.selectbox("Jogador", jogadores['nome'].tolist(), key="perfil_jogador")
+        jogador = jogadores[jogadores['nome'] == nome].iloc[0]
+        estat = db.get_estatisticas_jogador(jogador['id'])
+        
+        if estat is None:
+            st.info(f"{nome} ainda não jogou nenhuma partida.")
+            return
+        
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("ELO Atual", f"{jogador['elo']:.0f}")
+        col2.metric("Partidas", estat.partidas)
+        col3.metric("Vitórias", estat.vitorias, f"{estat.taxa_vitoria:.0%}", delta_color="off")
+        col4.metric("Posição média", f"{estat.posicao_media:.2f}")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Sequência de vitórias", estat.sequencia_atual)
+        col2.metric("Maior sequência", estat.maior_sequencia)
+        col3.metric("Primeira partida", estat.primeira_data)
+        col4.metric("Última partida", estat.ultima_data)
+        
+        st.markdown(f"❤️ **Jogo favorito:** {estat.jogo_favorito} ({estat.jogo_favorito_partidas} partidas)")
+        if estat.melhor_jogo:
+            st.markdown(f"🏋️ **Vitória mais pesada:** {estat.melhor_jogo} (peso {estat.melhor_jogo_peso:.2f})")
+        
+        st.markdown("**Mais jogados**")
+        st.dataframe(
+            db.get_jogos_mais_jogados(jogador['id']),
+            width="stretch",
+            hide_index=True,
+            column_config={
+                "jogo": "Jogo",
+                "partidas": "Partidas",
+                "ultima_data": "Última vez"
+            }
+        )
@@ -0,0 +1,208 @@
+"""Página de jogos: coleção, detalhes e integração com o BGG"""
+import time
+
+import pandas as pd
+import streamlit as st
+
+
+def render(db):
+    st.title("🎮 Gerenciar Jogos")
+    
+    tab1, tab2, tab3 = st.tabs(["📋 Lista", "➕ Adicionar", "🔄 Atualizar do BGG"])
+    
+    with tab1:
+        st.subheader("Jogos Cadastrados")
+        jogos = db.get_jogos()
+        
+        if len(jogos) > 0:
+            # Seleciona colunas relevantes para exibição
+            colunas_exibir = ['nome', 'peso_bgg', 'min_jogadores', 'max_jogadores', 
+                            'tempo_min', 'tempo_max', 'categoria']
+            
+            # Filtra apenas colunas que existem
+            colunas_disponiveis = [col for col in colunas_exibir if col in jogos.columns]
+            
+            st.dataframe(
+                jogos[colunas_disponiveis],
+                width="stretch",
+                hide_index=True,
+                column_config={
+                    "nome": "Nome",
+                    "peso_bgg": "Peso BGG",
+                    "min_jogadores": "Min Jog.",
+                    "max_jogadores": "Max Jog.",
+                    "tempo_min": "Tempo Min",
+                    "tempo_max": "Tempo Max",
+                    "categoria": "Categoria"
+                }
+            )
+            
+            # Detalhes expandíveis
+            with st.expander("🔍 Ver Detalhes Completos"):
+                jogo_selecionado = st.selectbox(
+                    "Selecione um jogo",
+                    jogos['nome'].tolist()
+                )
+                
+                jogo_info = jogos[jogos['nome'] == jogo_selecionado].iloc[0]
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    st.write(f"**Nome:** {jogo_info['nome']}")
+                    if 'ano_publicacao' in jogo_info and pd.notna(jogo_info['ano_publicacao']):
+                        st.write(f"**Ano:** {int(jogo_info['ano_publicacao'])}")
+                    st.write(f"**Peso BGG:** {jogo_info['peso_bgg']}")
+                    if 'min_jogadores' in jogo_info and pd.notna(jogo_info['min_jogadores']):
+                        st.write(f"**Jogadores:** {int(jogo_info['min_jogadores'])} - {int(jogo_info['max_jogadores'])}")
+                    if 'tempo_min' in jogo_info and pd.notna(jogo_info['tempo_min']):
+                        st.write(f"**Tempo:** {int(jogo_info['tempo_min'])} - {int(jogo_info['tempo_max'])} min")
+                
+                with col2:
+                    if 'tipo' in jogo_info and pd.notna(jogo_info['tipo']):
+                        st.write(f"**Tipo:** {jogo_info['tipo']}")
+                    if 'categoria' in jogo_info and pd.notna(jogo_info['categoria']):
+                        st.write(f"**Categoria:** {jogo_info['categoria']}")
+                    if 'mecanicas' in jogo_info and pd.notna(jogo_info['mecanicas']):
+                        st.write(f"**Mecânicas:** {jogo_info['mecanicas']}")
+                    if 'link_bgg' in jogo_info and pd.notna(jogo_info['link_bgg']):
+                        st.write(f"**Link:** [{jogo_info['link_bgg']}]({jogo_info['link_bgg']})")
+                
+                if 'ultima_atualizacao' in jogo_info and pd.notna(jogo_info['ultima_atualizacao']):
+                    st.caption(f"Última atualização: {jogo_info['ultima_atualizacao']}")
+                
+                # Quem é melhor neste jogo (Elo calculado só com partidas dele)
+                st.markdown("**🏆 Melhores neste jogo**")
+                ranking_jogo = db.get_ranking_jogo(jogo_info['id'], limit=5)
+                if len(ranking_jogo) > 0:
+                    st.dataframe(
+                        ranking_jogo,
+                        width="stretch",
+                        column_config={
+                            "nome": "Jogador",
+                            "elo": "ELO no Jogo",
+                            "partidas": "Partidas"
+                        }
+                    )
+                else:
+                    st.caption("Nenhuma partida válida deste jogo ainda.")
+        else:
+            st.info("Nenhum jogo cadastrado ainda.")
+    
+    with tab2:
+        st.subheader("Adicionar Novo Jogo")
+        
+        modo = st.radio("Como deseja adicionar?", ["🔍 Buscar no BGG", "✏️ Manual"])
+        
+        if modo == "🔍 Buscar no BGG":
+            with st.form("form_jogo_bgg"):
+                nome_busca = st.text_input("Nome do jogo para buscar no BGG")
+                
+                submit = st.form_submit_button("🔍 Buscar e Adicionar")
+                
+                if submit:
+                    if nome_busca.strip() == "":
+                        st.error("❌ Nome não pode ser vazio!")
+                    else:
+                        with st.spinner(f"Buscando '{nome_busca}' no BGG..."):
+                            from bgg_sync import adicionar_jogo_com_bgg
+                            sucesso, dados = adicionar_jogo_com_bgg(db, nome_busca)
+                        
+                        if sucesso:
+                            st.success(f"✅ Jogo '{dados['nome']}' adicionado com sucesso!")
+                            st.info(f"Peso: {dados['peso']} | Jogadores: {dados['min_jogadores']}-{dados['max_jogadores']}")
+                            st.rerun()
+                        elif dados is None:
+                            st.error("❌ Jogo não encontrado no BGG! Tente buscar com outro nome ou adicione manualmente.")
+                        else:
+                            st.error("❌ Jogo já existe no banco!")
+        
+        else:  # Manual
+            with st.form("form_jogo_manual"):
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    nome = st.text_input("Nome do Jogo")
+                    peso = st.number_input("Peso BGG", min_value=1.0, max_value=5.0, value=2.5, step=0.1)
+                    min_jog = st.number_input("Min Jogadores", min_value=1, value=2)
+                    max_jog = st.number_input("Max Jogadores", min_value=1, value=4)
+                
+                with col2:
+                    tempo_min = st.number_input("Tempo Mínimo (min)", min_value=0, value=30)
+                    tempo_max = st.number_input("Tempo Máximo (min)", min_value=0, value=60)
+                    link = st.text_input("Link BGG (opcional)")
+                
+                submit = st.form_submit_button("💾 Salvar Jogo")
+                
+                if submit:
+                    if nome.strip() == "":
+                        st.error("❌ Nome não pode ser vazio!")
+                    else:
+                        sucesso = db.add_jogo(
+                            nome=nome.strip(),
+                            peso_bgg=peso,
+                            min_jogadores=min_jog,
+                            max_jogadores=max_jog,
+                            tempo_min=tempo_min,
+                            tempo_max=tempo_max,
+                            link_bgg=link if link else None
+                        )
+                        if sucesso:
+                            st.success(f"✅ Jogo '{nome}' adicionado com sucesso!")
+                            st.rerun()
+                        else:
+                            st.error("❌ Jogo já existe!")
+    
+    with tab3:
+        st.subheader("🔄 Atualizar Jogos do BGG")
+        st.write("Busca e atualiza informações dos jogos cadastrados usando o BGG.")
+        
+        jogos = db.get_jogos()
+        
+        if len(jogos) > 0:
+            jogo_atualizar = st.selectbox(
+                "Selecione um jogo para atualizar",
+                jogos['nome'].tolist()
+            )
+            
+            if st.button("🔄 Atualizar este jogo"):
+                jogo_info = jogos[jogos['nome'] == jogo_atualizar].iloc[0]
+                jogo_id = jogo_info['id']
+                
+                with st.spinner(f"Buscando dados de '{jogo_atualizar}' no BGG..."):
+                    from bgg_sync import atualizar_jogo_do_bgg
+                    sucesso, dados = atualizar_jogo_do_bgg(db, jogo_id, jogo_atualizar)
+                
+                if sucesso:
+                    st.success(f"✅ Jogo '{dados['nome']}' atualizado!")
+                    st.info(f"Peso: {dados['peso']} | Jogadores: {dados['min_jogadores']}-{dados['max_jogadores']}")
+                    st.rerun()
+                else:
+                    st.error("❌ Não foi possível encontrar o jogo no BGG!")
+            
+            st.markdown("---")
+            
+            if st.button("🔄 Atualizar TODOS os jogos"):
+                from bgg_sync import atualizar_jogo_do_bgg
+                
+                progress_bar = st.progress(0)
+                status_text = st.empty()
+                
+                total = len(jogos)
+                sucessos = 0
+                
+                for idx, (_, jogo) in enumerate(jogos.iterrows()):
+                    status_text.text(f"Atualizando {idx+1}/{total}: {jogo['nome']}")
+                    
+                    sucesso, _ = atualizar_jogo_do_bgg(db, jogo['id'], jogo['nome'])
+                    if sucesso:
+                        sucessos += 1
+                    
+                    progress_bar.progress((idx + 1) / total)
+                    time.sleep(0.5)  # Rate limit da API
+                
+                status_text.text(f"✅ Concluído! {sucessos}/{total} jogos atualizados.")
+                st.balloons()
+                st.rerun()
+        else:
+            st.info("Nenhum jogo cadastrado ainda.")
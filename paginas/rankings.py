@@ -0,0 +1,281 @@
+"""Página de rankings: aproveitamento, Elo e confronto direto"""
+from datetime import datetime, timedelta
+
+import streamlit as st
+
+import ranking
+from perfil import medir
+
+
+# Intervalo do modo "ao vivo": cada checagem é só um SELECT na tabela metadados
+INTERVALO_AO_VIVO = "3s"
+
+
+@st.fragment(run_every=INTERVALO_AO_VIVO)
+def _vigiar_versao(db, versao_exibida):
+    """Recarrega a página só quando alguma escrita mudou os dados"""
+    if db.get_versao_dados() != versao_exibida:
+        st.rerun(scope="app")
+
+
+def _avisar_mudancas(db, RankingCalculator, versao, ranking_elo):
+    """Toasts com as partidas novas e quem subiu/desceu no Elo desde a última exibição"""
+    anterior = st.session_state.get('ranking_ao_vivo')
+    st.session_state['ranking_ao_vivo'] = (versao, db.get_ultimo_evento_id(), ranking_elo)
+    if anterior is None or anterior[0] == versao:
+        return
+    _, ultimo_evento, elo_anterior = anterior
+
+    eventos = db.get_eventos(ultimo_evento)
+    if eventos:
+        jogos = db.get_jogos(apenas_ativos=False).set_index('id')['nome']
+        for evento in eventos:
+            if evento.tipo == 'partida_adicionada':
+                st.toast(f"🎲 Nova partida: {jogos.get(evento.jogo_id, 'jogo removido')}")
+            elif evento.tipo == 'partida_removida':
+                st.toast(f"🗑️ Partida removida: {jogos.get(evento.jogo_id, 'jogo removido')}")
+
+    for mudanca in RankingCalculator.diferenca_ranking(elo_anterior, ranking_elo):
+        antes, depois = mudanca['posicao_antes'], mudanca['posicao_depois']
+        if antes is None or depois is None or antes == depois:
+            continue
+        seta = "⬆️" if depois < antes else "⬇️"
+        st.toast(f"{seta} {mudanca['nome']}: {antes}º → {depois}º no Elo")
+
+
+def render(db):
+    RankingCalculator = medir(ranking.RankingCalculator, "ranking")
+
+    st.title("🏆 Rankings")
+
+    if st.toggle("🔴 Ao vivo", help="Atualiza sozinho quando uma partida for registrada (telão da jogatina)"):
+        versao = db.get_versao_dados()
+        _avisar_mudancas(db, RankingCalculator, versao, RankingCalculator.get_ranking_elo(db))
+        _vigiar_versao(db, versao)
+    else:
+        st.session_state.pop('ranking_ao_vivo', None)
+    
+    tab1, tab2, tab3 = st.tabs(["📊 Aproveitamento", "🎯 ELO", "⚔️ Confronto Direto"])
+    
+    with tab1:
+        st.subheader("Ranking por Aproveitamento")
+        
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            limite = st.number_input("Quantas partidas considerar?", min_value=1, max_value=500, value=40)
+        with col2:
+            ultima_data = db.get_ultima_data_partida()
+            periodo = st.selectbox(
+                "Período",
+                ["Todo o período",
+                 f"Só última sessão ({ultima_data})" if ultima_data else "Só última sessão",
+                 "Últimos 30 dias", "Últimos 90 dias", "Últimos 365 dias",
+                 "Temporada", "Jogatina específica"]
+            )
+        
+        # Janela de partidas (datas 'YYYY-MM-DD', inclusive)
+        data_inicio, data_fim, jogatina_filtro = None, None, None
+        if periodo.startswith("Só última sessão"):
+            data_inicio = data_fim = ultima_data
+        elif periodo.startswith("Últimos"):
+            dias = int(periodo.split()[1])
+            data_inicio = (datetime.now().date() - timedelta(days=dias)).isoformat()
+        elif periodo in ("Temporada", "Jogatina específica"):
+            jogatinas = db.get_jogatinas()
+            if len(jogatinas) == 0:
+                st.info("Nenhuma jogatina registrada ainda.")
+            elif periodo == "Temporada":
+                temporadas = sorted({str(d)[:4] for d in jogatinas['data']}, reverse=True)
+                temporada = st.selectbox("Temporada", temporadas)
+                data_inicio, data_fim = f"{temporada}-01-01", f"{temporada}-12-31"
+            else:
+                jogatinas['display'] = jogatinas.apply(
+                    lambda x: f"{x['data']}{' - ' + x['local'] if x['local'] else ''}",
+                    axis=1
+                )
+                jogatina_selecionada = st.selectbox("Jogatina", jogatinas['display'].tolist())
+                jogatina_filtro = int(jogatinas[jogatinas['display'] == jogatina_selecionada]['id'].iloc[0])
+        
+        with st.spinner("Calculando ranking..."):
+            ranking_aprov = RankingCalculator.calcular_ranking_aproveitamento(
+                db,
+                limite_partidas=limite,
+                data_inicio=data_inicio,
+                data_fim=data_fim,
+                jogatina_id=jogatina_filtro
+            )
+        
+        if len(ranking_aprov) > 0:
+            # Formata para exibição
+            ranking_aprov['aproveitamento'] = ranking_aprov['aproveitamento'].apply(lambda x: f"{x:.2f}%")
+            
+            st.dataframe(
+                ranking_aprov,
+                width="stretch",
+                column_config={
+                    "jogador": "Jogador",
+                    "aproveitamento": "Aproveitamento",
+                    "partidas": "Partidas"
+                }
+            )
+
+        else:
+            st.info("Nenhum jogador com partidas registradas ainda.")
+        
+        # Evolução do aproveitamento acumulado, jogatina a jogatina, dentro do período
+        with st.expander("📈 Evolução por jogatina"):
+            evolucao = db.get_evolucao_ranking_jogatinas(data_inicio=data_inicio, data_fim=data_fim)
+            
+            if len(evolucao) > 0:
+                metrica = st.radio("Mostrar", ["Posição", "Aproveitamento"], horizontal=True)
+                
+                import altair as alt
+                campo = 'posicao' if metrica == "Posição" else 'aproveitamento'
+                grafico = alt.Chart(evolucao).mark_line(point=True).encode(
+                    x=alt.X('data:T', title='Jogatina'),
+                    y=alt.Y(f'{campo}:Q', title=metrica,
+                            scale=alt.Scale(reverse=True) if campo == 'posicao' else alt.Scale()),
+                    color=alt.Color('jogador:N', title='Jogador'),
+                    tooltip=['data', 'jogador', 'aproveitamento', 'posicao', 'partidas']
+                )
+                st.altair_chart(grafico, width="stretch")
+            else:
+                st.info("Nenhuma jogatina no período.")
+    
+    with tab2:
+        st.subheader("Ranking ELO")
+        
+        col1, col2 = st.columns([3, 1])
+        
+        with col1:
+            faixas_elo = {
+                "Geral": None,
+                "🪶 Leve (peso < 2.0)": "leve",
+                "⚖️ Médio (peso 2.0 a 3.0)": "medio",
+                "🏋️ Pesado (peso ≥ 3.0)": "pesado",
+            }
+            faixa_elo = st.selectbox("Categoria de peso", list(faixas_elo.keys()))
+        
+        with col2:
+            if st.button("🔄 Recalcular Todos Elos"):
+                with st.spinner("Recalculando..."):
+                    RankingCalculator.recalcular_todos_elos(db)
+                st.success("✅ Elos recalculados!")
+                st.rerun()
+        
+        if faixas_elo[faixa_elo] is not None:
+            ranking_faixa = db.get_ranking_faixa_peso(faixas_elo[faixa_elo])
+            
+            if len(ranking_faixa) > 0:
+                st.dataframe(
+                    ranking_faixa,
+                    width="stretch",
+                    column_config={
+                        "nome": "Jogador",
+                        "elo": "ELO",
+                        "partidas": "Partidas"
+                    }
+                )
+            else:
+                st.info("Nenhum Elo por faixa calculado ainda. Clique em 'Recalcular Todos Elos'.")
+        
+        else:
+            ranking_elo = RankingCalculator.get_ranking_elo(db)
+            
+            if len(ranking_elo) > 0:
+                st.dataframe(
+                    ranking_elo,
+                    width="stretch",
+                    column_config={
+                        "nome": "Jogador",
+                        "elo": "ELO"
+                    }
+                )
+
+                # Intervalos de confiança via bootstrap das partidas
+                if len(RankingCalculator.carregar_historico(db)['partida_id']) == 0:
+                    st.info("Registre partidas válidas para ranking para simular a confiança do ranking.")
+                else:
+                    with st.expander("🎲 Confiança do ranking (Monte Carlo)"):
+                        st.caption("Reamostra as partidas, recalcula os Elos e mostra a faixa de posições de cada jogador.")
+
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            n_replays = st.number_input("Simulações", min_value=100, max_value=5000, value=1000, step=100)
+                        with col2:
+                            confianca = st.slider("Confiança", min_value=0.5, max_value=0.99, value=0.9, step=0.01)
+
+                        if st.button("🎲 Simular"):
+                            with st.spinner(f"Rodando {n_replays} simulações..."):
+                                st.session_state['ranking_mc'] = RankingCalculator.simular_intervalos_ranking(
+                                    db, n_replays=int(n_replays), confianca=confianca
+                                )
+
+                        if 'ranking_mc' in st.session_state:
+                            resumo, distribuicao = st.session_state['ranking_mc']
+                            st.dataframe(
+                                resumo,
+                                width="stretch",
+                                column_config={
+                                    "nome": "Jogador",
+                                    "elo": "ELO",
+                                    "posicao_mediana": "Posição Mediana",
+                                    "ic_inferior": "Melhor Posição (IC)",
+                                    "ic_superior": "Pior Posição (IC)",
+                                    "prob_lider": st.column_config.NumberColumn("Chance de Liderar", format="percent")
+                                }
+                            )
+                            st.caption("Probabilidade de cada posição")
+                            st.dataframe(distribuicao, width="stretch")
+
+            else:
+                st.info("Nenhum jogador cadastrado ainda.")
+    
+    with tab3:
+        st.subheader("Confronto Direto")
+        st.caption("Aproveitamento da linha contra a coluna nas mini-partidas (ponderado pelo peso do jogo).")
+        
+        confrontos = db.get_confronto_direto()
+        
+        if len(confrontos) > 0:
+            import altair as alt
+            
+            confrontos['mini_partidas'] = confrontos['vitorias'] + confrontos['derrotas'] + confrontos['empates']
+            
+            heatmap = alt.Chart(confrontos).mark_rect().encode(
+                x=alt.X('jogador_b:N', title=None),
+                y=alt.Y('jogador_a:N', title=None),
+                color=alt.Color('aproveitamento:Q', title='Aproveitamento (%)',
+                                scale=alt.Scale(scheme='redyellowgreen', domain=[0, 100])),
+                tooltip=[
+                    alt.Tooltip('jogador_a:N', title='Jogador'),
+                    alt.Tooltip('jogador_b:N', title='Contra'),
+                    alt.Tooltip('aproveitamento:Q', title='Aproveitamento (%)'),
+                    alt.Tooltip('vitorias:Q', title='Vitórias'),
+                    alt.Tooltip('derrotas:Q', title='Derrotas'),
+                    alt.Tooltip('empates:Q', title='Empates'),
+                ]
+            )
+            texto = heatmap.mark_text(fontSize=11).encode(
+                text=alt.Text('aproveitamento:Q', format='.0f'),
+                color=alt.value('black')
+            )
+            st.altair_chart(heatmap + texto, width="stretch")
+            
+            with st.expander("📋 Tabela completa"):
+                st.dataframe(
+                    confrontos,
+                    width="stretch",
+                    hide_index=True,
+                    column_config={
+                        "jogador_a": "Jogador",
+                        "jogador_b": "Contra",
+                        "vitorias": "Vitórias",
+                        "derrotas": "Derrotas",
+                        "empates": "Empates",
+                        "aproveitamento": "Aproveitamento (%)",
+                        "mini_partidas": "Mini-partidas"
+                    }
+                )
+        else:
+            st.info("Nenhum confronto registrado ainda.")
@@ -0,0 +1,164 @@
+"""Página de registro de partidas (recalcula Elos e sobe o banco pro Drive)"""
+from datetime import datetime
+
+import streamlit as st
+
+import gdrive_sync
+import ranking
+from perfil import medir
+
+
+def render(db):
+    RankingCalculator = medir(ranking.RankingCalculator, "ranking")
+    drive = medir(gdrive_sync, "drive")
+
+    st.title("➕ Registrar Nova Partida")
+    
+    jogos_df = db.get_jogos()
+    jogadores_df = db.get_jogadores()
+    
+    if len(jogos_df) == 0:
+        st.warning("⚠️ Você precisa cadastrar pelo menos um jogo primeiro!")
+        st.info("Vá no menu 'Jogos' para cadastrar.")
+        st.stop()
+    
+    if len(jogadores_df) == 0:
+        st.warning("⚠️ Você precisa cadastrar pelo menos um jogador primeiro!")
+        st.info("Vá no menu 'Jogadores' para cadastrar.")
+        st.stop()
+    
+    # Sorteio de primeiro jogador marcado para vincular (ferramenta Sorteador)
+    sorteio = st.session_state.get('sorteio_pendente')
+    if sorteio:
+        st.info(f"🎲 Esta partida será vinculada ao sorteio em que {sorteio[1]} começou")
+    
+    # Número de jogadores FORA do formulário (para atualizar campos dinamicamente)
+    st.subheader("👥 Jogadores")
+    num_jogadores = st.number_input(
+        "Quantos jogadores participaram?", 
+        min_value=2, 
+        max_value=10, 
+        value=3,
+        help="💡 Mude este número ANTES de preencher o formulário abaixo"
+    )
+    
+    st.markdown("---")
+    
+    # Sem st.form: a previsão acompanha o jogo e os jogadores escolhidos
+    with st.container(border=True):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Seleção do jogo
+            jogo_selecionado = st.selectbox(
+                "🎮 Jogo",
+                options=jogos_df['nome'].tolist()
+            )
+            jogo_id = jogos_df[jogos_df['nome'] == jogo_selecionado]['id'].iloc[0]
+            peso = jogos_df[jogos_df['nome'] == jogo_selecionado]['peso_bgg'].iloc[0]
+            st.caption(f"Peso BGG: {peso}")
+        
+        with col2:
+            # Data da partida
+            data_partida = st.date_input(
+                "📅 Data",
+                value=datetime.now()
+            )
+        
+        # Checkboxes
+        col1, col2 = st.columns(2)
+        with col1:
+            valida_ranking = st.checkbox("✅ Válida para ranking", value=True)
+        with col2:
+            eh_jogo_time = st.checkbox("👥 Jogo de times", value=False)
+        
+        st.markdown("---")
+        st.subheader("Jogadores e Resultados")
+        
+        # Cria inputs para cada jogador
+        jogadores_posicoes = []
+        
+        for i in range(num_jogadores):
+            col1, col2, col3 = st.columns([3, 1, 1])
+            
+            with col1:
+                jogador = st.selectbox(
+                    f"Jogador {i+1}",
+                    options=jogadores_df['nome'].tolist(),
+                    key=f"jogador_{i}"
+                )
+            
+            with col2:
+                posicao = st.number_input(
+                    f"Posição",
+                    min_value=1,
+                    max_value=num_jogadores,
+                    value=i+1,
+                    key=f"posicao_{i}"
+                )
+            
+            with col3:
+                pontuacao = st.number_input(
+                    f"Pontos",
+                    min_value=0,
+                    value=0,
+                    key=f"pontuacao_{i}"
+                )
+            
+            jogador_id = jogadores_df[jogadores_df['nome'] == jogador]['id'].iloc[0]
+            jogadores_posicoes.append((jogador_id, posicao, pontuacao))
+        
+        # Previsão com os Elos atuais (só partidas individuais, sem jogador repetido)
+        ids_escolhidos = [int(j) for j, _, _ in jogadores_posicoes]
+        if not eh_jogo_time and len(set(ids_escolhidos)) == len(ids_escolhidos):
+            with st.expander("🔮 Previsão (Elos atuais)", expanded=True):
+                previsao = RankingCalculator.prever_partida(db, jogo_id, ids_escolhidos)
+                colunas_posicao = [c for c in previsao.columns if c.endswith('º')]
+                previsao[colunas_posicao] = previsao[colunas_posicao] * 100
+                st.dataframe(
+                    previsao,
+                    width="stretch",
+                    hide_index=True,
+                    column_config={
+                        'jogador': "Jogador",
+                        'elo': st.column_config.NumberColumn("Elo", format="%.0f"),
+                        **{c: st.column_config.NumberColumn(c, format="%.0f%%") for c in colunas_posicao},
+                    }
+                )
+                if peso <= 1.0:
+                    st.caption("Peso 1.0: jogo de sorte, Elo não conta e todos têm a mesma chance")
+        
+        observacoes = st.text_area("Observações (opcional)")
+        
+        submit = st.button("💾 Salvar Partida", width="stretch", type="primary")
+        
+        if submit:
+            valida_str = 'S' if valida_ranking else 'N'
+            time_str = 'S' if eh_jogo_time else 'N'
+                
+            sucesso = db.add_partida(
+                jogo_id, 
+                data_partida, 
+                jogadores_posicoes, 
+                observacoes,
+                valida_ranking=valida_str,
+                eh_jogo_time=time_str,
+                sorteio_id=sorteio[0] if sorteio else None
+            )
+            
+            if sucesso:
+                st.session_state.pop('sorteio_pendente', None)
+                st.success("✅ Partida registrada com sucesso!")
+                
+                # Recalcula Elos
+                with st.spinner("Recalculando Elos..."):
+                    RankingCalculator.recalcular_todos_elos(db)
+                
+                # Sincroniza com Drive
+                with st.spinner("Salvando backup no Drive..."):
+                    drive.fazer_upload_db()
+                
+                st.info("✨ Elos atualizados!")
+                st.balloons()
+            else:
+                st.error("❌ Erro ao salvar partida!")
@@ -0,0 +1,220 @@
+"""
+Perfil de render do app (modo desenvolvedor, abrir com ?dev=1 na URL).
+
+Mede cada seção do script (cabeçalho, sidebar, página) como voltas de
+cronômetro, soma o tempo gasto em Database / RankingCalculator / Drive
+através de proxies e registra memória alocada com tracemalloc. As amostras
+vão para perfil_local.db (fora do jogos.db, que é sincronizado com o Drive).
+
+O tracemalloc é do processo inteiro: fica ligado só enquanto algum perfil
+está ativo (e desliga depois, porque deixa tudo mais lento), e a memória
+de cada seção é o saldo alocado no processo, que inclui outras sessões
+rodando ao mesmo tempo.
+
+Se o script for interrompido (st.stop / st.rerun) a amostra daquele
+rerun não é gravada.
+"""
+import functools
+import sqlite3
+import subprocess
+import threading
+import time
+import tracemalloc
+import weakref
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+ARQUIVO_PERFIL = 'perfil_local.db'
+
+# Perfil do rerun em andamento nesta thread (cada sessão roda numa thread)
+_contexto = threading.local()
+
+# Perfis ativos no processo; o tracemalloc desliga quando o último termina.
+# RLock: a liberação também roda no coletor de lixo (rerun interrompido)
+_lock_tracemalloc = threading.RLock()
+_tracemalloc = {'perfis': 0, 'ligado_aqui': False}
+
+
+def _ligar_tracemalloc():
+    with _lock_tracemalloc:
+        if _tracemalloc['perfis'] == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracemalloc['ligado_aqui'] = True
+        _tracemalloc['perfis'] += 1
+
+
+def _desligar_tracemalloc():
+    with _lock_tracemalloc:
+        _tracemalloc['perfis'] -= 1
+        if _tracemalloc['perfis'] == 0 and _tracemalloc['ligado_aqui']:
+            tracemalloc.stop()
+            _tracemalloc['ligado_aqui'] = False
+
+
+@functools.lru_cache(maxsize=1)
+def _versao_codigo():
+    """Commit atual (para comparar renders antes/depois de uma mudança)"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, timeout=2,
+            cwd=Path(__file__).parent
+        ).stdout.strip()
+    except Exception:
+        return ''
+
+
+class PerfilRender:
+    """Cronômetro de um rerun. Desativado, todos os métodos são no-op."""
+
+    def __init__(self, ativo=False, arquivo=ARQUIVO_PERFIL):
+        self.ativo = ativo
+        self.arquivo = arquivo
+        self.secoes = []          # [(nome, duracao_s, alocado_kb)]
+        self.chamadas = {}        # categoria -> {tempo, chamadas}
+        self._secao_atual = None
+        _contexto.perfil = self
+        if not ativo:
+            return
+        _ligar_tracemalloc()
+        # Também se o rerun for interrompido e o perfil nunca finalizar
+        self._liberar = weakref.finalize(self, _desligar_tracemalloc)
+        self._memoria_inicio, _ = tracemalloc.get_traced_memory()
+        self._inicio = time.perf_counter()
+
+    def iniciar(self, nome):
+        """Fecha a seção anterior (se houver) e começa uma nova"""
+        if not self.ativo:
+            return
+        self._fechar_secao()
+        memoria, _ = tracemalloc.get_traced_memory()
+        self._secao_atual = (nome, time.perf_counter(), memoria)
+
+    def _fechar_secao(self):
+        if self._secao_atual is None:
+            return
+        nome, inicio, memoria_inicio = self._secao_atual
+        memoria, _ = tracemalloc.get_traced_memory()
+        self.secoes.append((nome, time.perf_counter() - inicio, (memoria - memoria_inicio) / 1024))
+        self._secao_atual = None
+
+    def medir(self, alvo, categoria):
+        """Proxy de `alvo` que soma o tempo de cada chamada em `categoria`"""
+        if not self.ativo:
+            return alvo
+        return _Medido(alvo, self, categoria)
+
+    def _registrar_chamada(self, categoria, duracao):
+        estat = self.chamadas.setdefault(categoria, {'tempo': 0.0, 'chamadas': 0})
+        estat['tempo'] += duracao
+        estat['chamadas'] += 1
+
+    def finalizar(self, pagina):
+        """Fecha o rerun, grava a amostra e devolve o resumo (DataFrame)"""
+        if not self.ativo:
+            return None
+        self._fechar_secao()
+        total = time.perf_counter() - self._inicio
+        memoria, _ = tracemalloc.get_traced_memory()
+        self._liberar()
+
+        linhas = [
+            {'secao': nome, 'duracao_ms': round(duracao * 1000, 1), 'alocado_kb': round(alocado, 1)}
+            for nome, duracao, alocado in self.secoes
+        ]
+        # Chamadas medidas por proxy (estão contidas nas seções acima)
+        linhas += [
+            {'secao': f"↳ {categoria} ({e['chamadas']}x)", 'duracao_ms': round(e['tempo'] * 1000, 1),
+             'alocado_kb': None}
+            for categoria, e in self.chamadas.items()
+        ]
+        linhas.append({'secao': 'TOTAL', 'duracao_ms': round(total * 1000, 1),
+                       'alocado_kb': round((memoria - self._memoria_inicio) / 1024, 1)})
+        resumo = pd.DataFrame(linhas)
+        self._gravar(pagina, resumo)
+        return resumo
+
+    def _gravar(self, pagina, resumo):
+        conn = sqlite3.connect(self.arquivo, timeout=5)
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS perfil_renders (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    quando TEXT NOT NULL,
+                    versao TEXT,
+                    pagina TEXT,
+                    secao TEXT NOT NULL,
+                    duracao_ms REAL,
+                    alocado_kb REAL
+                )
+            """)
+            quando = datetime.now().isoformat(timespec='seconds')
+            versao = _versao_codigo()
+            conn.executemany(
+                """INSERT INTO perfil_renders (quando, versao, pagina, secao, duracao_ms, alocado_kb)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                [(quando, versao, pagina, r['secao'], r['duracao_ms'], r['alocado_kb'])
+                 for r in resumo.to_dict('records')]
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def historico(self, pagina=None):
+        """Mediana do TOTAL por página e versão do código (para achar regressões)"""
+        if not Path(self.arquivo).exists():
+            return pd.DataFrame()
+        conn = sqlite3.connect(self.arquivo, timeout=5)
+        try:
+            df = pd.read_sql_query(
+                """SELECT quando, versao, pagina, duracao_ms, alocado_kb
+                   FROM perfil_renders
+                   WHERE secao = 'TOTAL' AND (? IS NULL OR pagina = ?)""",
+                conn, params=(pagina, pagina)
+            )
+        finally:
+            conn.close()
+        if len(df) == 0:
+            return df
+        return (
+            df.groupby(['pagina', 'versao'])
+            .agg(amostras=('duracao_ms', 'size'),
+                 mediana_ms=('duracao_ms', 'median'),
+                 alocado_kb=('alocado_kb', 'median'),
+                 ultima=('quando', 'max'))
+            .reset_index()
+            .sort_values('ultima', ascending=False)
+        )
+
+
+def medir(alvo, categoria):
+    """PerfilRender.medir no perfil do rerun atual (para os módulos de paginas/)"""
+    perfil = getattr(_contexto, 'perfil', None)
+    if perfil is None:
+        return alvo
+    return perfil.medir(alvo, categoria)
+
+
+class _Medido:
+    """Repassa atributos para o alvo, cronometrando as chamadas"""
+
+    def __init__(self, alvo, perfil, categoria):
+        self._alvo = alvo
+        self._perfil = perfil
+        self._categoria = categoria
+
+    def __getattr__(self, nome):
+        atributo = getattr(self._alvo, nome)
+        if not callable(atributo):
+            return atributo
+
+        @functools.wraps(atributo)
+        def cronometrado(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return atributo(*args, **kwargs)
+            finally:
+                self._perfil._registrar_chamada(self._categoria, time.perf_counter() - inicio)
+        return cronometrado
@@ -1,8 +1,24 @@
 import pandas as pd
+import numpy as np
 import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import colunar
 
 class RankingCalculator:
     
+    # Faixas de peso BGG: (nome, limite superior exclusivo)
+    FAIXAS_PESO = [('leve', 2.0), ('medio', 3.0), ('pesado', float('inf'))]
+    
+    # Recomendador de jogos: a novidade satura em DIAS_NOVIDADE sem jogar;
+    # PESO_REFERENCIA é o peso BGG em que o desvio de Elo conta "cheio"
+    DIAS_NOVIDADE = 90
+    PESO_REFERENCIA = 2.5
+    
+    # Previsão de partida: até este nº de jogadores a conta é exata, acima é Monte Carlo
+    MAX_JOGADORES_EXATO = 12
+    
     @staticmethod
     def calcular_aproveitamento(df_partidas, peso_jogo):
         """
@@ -41,26 +57,35 @@ class RankingCalculator:
         return round(aproveitamento, 2)
     
     @staticmethod
-    def calcular_ranking_aproveitamento(db, limite_partidas=40, data_filtro=None):
-        """Calcula ranking de aproveitamento para todos jogadores"""
-        jogadores = db.get_jogadores()
+    def calcular_ranking_aproveitamento(db, limite_partidas=40, data_filtro=None,
+                                        data_inicio=None, data_fim=None, jogatina_id=None):
+        """
+        Calcula ranking de aproveitamento para todos jogadores
+        - limite_partidas: últimas N partidas de cada jogador (None = todas da janela)
+        - data_filtro: só uma data (atalho para data_inicio = data_fim)
+        - data_inicio / data_fim / jogatina_id: janela de partidas
+        As somas das mini-partidas são feitas no SQLite (ver get_aproveitamento_janela)
+        """
+        if data_filtro:
+            data_inicio = data_fim = data_filtro
         
-        ranking = []
-        for _, jogador in jogadores.iterrows():
-            partidas = db.get_todas_partidas_jogador(jogador['id'], limit=limite_partidas, data_filtro=data_filtro)
-            
-            if len(partidas) == 0:
-                continue
-            
-            aproveitamento = RankingCalculator.calcular_aproveitamento(partidas, peso_jogo=True)
-            
-            ranking.append({
-                'jogador': jogador['nome'],
-                'aproveitamento': aproveitamento,
-                'partidas': len(partidas)
-            })
+        df = db.get_aproveitamento_janela(
+            limite_partidas=limite_partidas,
+            data_inicio=data_inicio,
+            data_fim=data_fim,
+            jogatina_id=jogatina_id
+        )
         
-        df_ranking = pd.DataFrame(ranking)
+        # Mesma conta do calcular_aproveitamento
+        aproveitamento = [
+            round(v / m * 100, 2) if m > 0 else 0.0
+            for v, m in zip(df['vitorias_ponderadas'], df['mini_partidas_ponderadas'])
+        ]
+        df_ranking = pd.DataFrame({
+            'jogador': df['jogador'],
+            'aproveitamento': pd.Series(aproveitamento, dtype=float),
+            'partidas': df['partidas']
+        })
         df_ranking = df_ranking.sort_values('aproveitamento', ascending=False).reset_index(drop=True)
         df_ranking.index = df_ranking.index + 1  # Começa do 1
         
@@ -194,57 +219,170 @@ class RankingCalculator:
         
         return novos_elos
     
+    @staticmethod
+    def carregar_historico(db):
+        """
+        Todas as partidas VÁLIDAS em ordem cronológica como arrays (somente
+        leitura), do histórico colunar compartilhado pelo processo
+        Retorna dict com:
+        - por resultado: jogador_id, posicao, time_id
+        - por partida: partida_id, data, jogo_id, peso, eh_jogo_time
+        - inicio: resultados da partida i ficam em [inicio[i], inicio[i+1])
+        """
+        return colunar.obter(db).validas()
+    
+    @staticmethod
+    def get_faixa_peso(peso_jogo):
+        """Retorna a faixa de peso ('leve', 'medio' ou 'pesado') de um jogo"""
+        for faixa, limite in RankingCalculator.FAIXAS_PESO:
+            if peso_jogo < limite:
+                return faixa
+        return RankingCalculator.FAIXAS_PESO[-1][0]
+    
     @staticmethod
     def recalcular_todos_elos(db, elo_inicial=1500):
-        """Recalcula Elos de todos jogadores desde o início"""
-        conn = db.get_connection()
-        
-        # Pega todas as partidas VÁLIDAS em ordem cronológica
-        query = """
-            SELECT 
-                p.id as partida_id,
-                p.data,
-                p.eh_jogo_time,
-                j.peso_bgg as peso,
-                r.jogador_id,
-                r.posicao,
-                r.time_id
-            FROM partidas p
-            JOIN jogos j ON p.jogo_id = j.id
-            JOIN resultados r ON p.id = r.partida_id
-            WHERE p.valida_ranking = 'S'
-            ORDER BY p.data ASC, p.id ASC
         """
-        df = pd.read_sql_query(query, conn)
-        conn.close()
+        Recalcula Elos de todos jogadores desde o início.
+        O mesmo replay também calcula o Elo de cada jogador por jogo e por
+        faixa de peso (cada contexto começa em elo_inicial), salvos em
+        elos_jogo e elos_faixa_peso.
+        """
+        historico = RankingCalculator.carregar_historico(db)
         
         # Inicializa Elos (TODOS jogadores, inclusive inativos, pois participaram de partidas)
         jogadores = db.get_jogadores(apenas_ativos=False)
         elos = {jog_id: elo_inicial for jog_id in jogadores['id'].tolist()}
         
+        # Elos por contexto: {jogo_id: {jogador_id: elo}} e {faixa: {jogador_id: elo}}
+        elos_jogo, partidas_jogo = {}, {}
+        elos_faixa, partidas_faixa = {}, {}
+        
         # Processa cada partida
-        for partida_id in df['partida_id'].unique():
-            partida_df = df[df['partida_id'] == partida_id]
-            peso = partida_df['peso'].iloc[0]
-            eh_jogo_time = partida_df['eh_jogo_time'].iloc[0]
+        inicio = historico['inicio']
+        for i in range(len(historico['partida_id'])):
+            a, b = inicio[i], inicio[i + 1]
+            peso = float(historico['peso'][i])
+            eh_jogo_time = historico['eh_jogo_time'][i]
+            jogo_id = int(historico['jogo_id'][i])
+            faixa = RankingCalculator.get_faixa_peso(peso)
             
             resultados = [
-                {'jogador_id': row['jogador_id'], 'posicao': row['posicao'], 'time_id': row['time_id']}
-                for _, row in partida_df.iterrows()
+                {'jogador_id': int(jid), 'posicao': int(pos), 'time_id': tid}
+                for jid, pos, tid in zip(historico['jogador_id'][a:b],
+                                         historico['posicao'][a:b],
+                                         historico['time_id'][a:b])
             ]
             
             # Calcula novos Elos (considera times se necessário)
             elos = RankingCalculator.calcular_elos_partida(resultados, elos, peso, eh_jogo_time)
+            
+            for contexto, chave, contagem in ((elos_jogo, jogo_id, partidas_jogo),
+                                              (elos_faixa, faixa, partidas_faixa)):
+                elos_contexto = contexto.setdefault(chave, {})
+                for r in resultados:
+                    elos_contexto.setdefault(r['jogador_id'], elo_inicial)
+                    contagem[(chave, r['jogador_id'])] = contagem.get((chave, r['jogador_id']), 0) + 1
+                contexto[chave] = RankingCalculator.calcular_elos_partida(
+                    resultados, elos_contexto, peso, eh_jogo_time
+                )
         
         # Atualiza Elos no banco
-        conn = db.get_connection()
-        for jogador_id, elo in elos.items():
-            conn.execute("UPDATE jogadores SET elo = ? WHERE id = ?", (round(elo, 1), jogador_id))
-        conn.commit()
-        conn.close()
+        def escrita(conn):
+            for jogador_id, elo in elos.items():
+                conn.execute("UPDATE jogadores SET elo = ? WHERE id = ?", (round(elo, 1), jogador_id))
+            
+            conn.execute("DELETE FROM elos_jogo")
+            conn.executemany(
+                "INSERT INTO elos_jogo (jogo_id, jogador_id, elo, partidas) VALUES (?, ?, ?, ?)",
+                [(jogo_id, jogador_id, round(elo, 1), partidas_jogo[(jogo_id, jogador_id)])
+                 for jogo_id, elos_contexto in elos_jogo.items()
+                 for jogador_id, elo in elos_contexto.items()]
+            )
+            conn.execute("DELETE FROM elos_faixa_peso")
+            conn.executemany(
+                "INSERT INTO elos_faixa_peso (faixa, jogador_id, elo, partidas) VALUES (?, ?, ?, ?)",
+                [(faixa, jogador_id, round(elo, 1), partidas_faixa[(faixa, jogador_id)])
+                 for faixa, elos_contexto in elos_faixa.items()
+                 for jogador_id, elo in elos_contexto.items()]
+            )
+        
+        db.executar_escrita(escrita)
         
         return elos
     
+    @staticmethod
+    def simular_intervalos_ranking(db, n_replays=1000, confianca=0.9, processos=None,
+                                   seed=None, elo_inicial=1500):
+        """
+        Bootstrap do ranking ELO: reamostra as partidas (com reposição),
+        refaz o cálculo de Elo em cada amostra e mede a distribuição de
+        posições de cada jogador ativo.
+        Retorna (resumo, distribuicao):
+        - resumo: ranking ELO atual + posição mediana, intervalo de confiança
+          e probabilidade de liderar
+        - distribuicao: probabilidade de cada jogador terminar em cada posição
+        """
+        ranking = RankingCalculator.get_ranking_elo(db)
+        if len(ranking) == 0:
+            return ranking, pd.DataFrame()
+        
+        historico = RankingCalculator.carregar_historico(db)
+        if len(historico['partida_id']) == 0:
+            return ranking.iloc[:0], pd.DataFrame()  # nada para reamostrar
+        jogadores = db.get_jogadores(apenas_ativos=False)
+        ativos = db.get_jogadores()
+        
+        # Jogadores viram colunas da matriz de Elos
+        ids = jogadores['id'].to_numpy(dtype=np.int64)
+        coluna = {int(jid): i for i, jid in enumerate(ids)}
+        colunas_ativos = np.array([coluna[int(jid)] for jid in ativos['id']], dtype=np.int64)
+        
+        partidas = _preparar_partidas_replay(historico, coluna)
+        
+        # Divide os replays entre processos (cada bloco com sua própria semente)
+        if processos is None:
+            processos = min(os.cpu_count() or 1, max(1, n_replays // 100))
+        processos = max(1, min(processos, n_replays))
+        blocos = np.array_split(np.arange(n_replays), processos)
+        sementes = np.random.SeedSequence(seed).spawn(processos)
+        tarefas = [
+            (partidas, len(historico['partida_id']), len(ids), len(bloco), semente,
+             colunas_ativos, elo_inicial)
+            for bloco, semente in zip(blocos, sementes)
+        ]
+        
+        if processos == 1:
+            posicoes = [_executar_replays(tarefas[0])]
+        else:
+            with ProcessPoolExecutor(max_workers=processos) as executor:
+                posicoes = list(executor.map(_executar_replays, tarefas))
+        posicoes = np.vstack(posicoes)  # (n_replays, n_ativos), posições 1..n
+        
+        n_ativos = len(colunas_ativos)
+        distribuicao = np.stack([
+            np.bincount(posicoes[:, i] - 1, minlength=n_ativos) for i in range(n_ativos)
+        ]) / len(posicoes)
+        
+        alfa = (1 - confianca) / 2
+        resumo = pd.DataFrame({
+            'nome': ativos['nome'].to_numpy(),
+            'posicao_mediana': np.median(posicoes, axis=0),
+            'ic_inferior': np.quantile(posicoes, alfa, axis=0, method='lower'),
+            'ic_superior': np.quantile(posicoes, 1 - alfa, axis=0, method='higher'),
+            'prob_lider': distribuicao[:, 0].round(3),
+        })
+        resumo = ranking.reset_index(names='posicao').merge(resumo, on='nome', how='left')
+        resumo.index = ranking.index
+        resumo = resumo.drop(columns='posicao')
+        
+        distribuicao = pd.DataFrame(
+            distribuicao.round(3),
+            index=ativos['nome'].to_numpy(),
+            columns=range(1, n_ativos + 1)
+        ).loc[resumo['nome']]
+        
+        return resumo, distribuicao
+    
     @staticmethod
     def get_ranking_elo(db):
         """Retorna ranking por Elo"""
@@ -254,3 +392,227 @@ class RankingCalculator:
         ranking.index = ranking.index + 1
         ranking['elo'] = ranking['elo'].round(1)
         return ranking
+
+    @staticmethod
+    def diferenca_ranking(antes, depois, coluna_nome='nome', coluna_valor='elo'):
+        """
+        Compara dois rankings (índice = posição) e devolve só quem mudou:
+        lista de dicts com nome, posicao_antes/depois e valor_antes/depois
+        (None quando o jogador entrou ou saiu do ranking)
+        """
+        def por_nome(ranking):
+            return {
+                linha[coluna_nome]: (posicao, linha[coluna_valor])
+                for posicao, linha in ranking[[coluna_nome, coluna_valor]].iterrows()
+            }
+
+        anterior, atual = por_nome(antes), por_nome(depois)
+        mudancas = []
+        for nome in list(atual) + [n for n in anterior if n not in atual]:
+            posicao_antes, valor_antes = anterior.get(nome, (None, None))
+            posicao_depois, valor_depois = atual.get(nome, (None, None))
+            if (posicao_antes, valor_antes) != (posicao_depois, valor_depois):
+                mudancas.append({
+                    'nome': nome,
+                    'posicao_antes': posicao_antes,
+                    'posicao_depois': posicao_depois,
+                    'valor_antes': valor_antes,
+                    'valor_depois': valor_depois,
+                })
+        return mudancas
+    
+    @staticmethod
+    def probabilidades_posicoes(elos, peso_jogo, amostras=20_000, seed=None):
+        """
+        Matriz n x n: [i, k] = probabilidade do jogador i terminar em k+1º.
+        Modelo de Plackett-Luce com força 10^(escala * elo / 350), escala = K do jogo / 64:
+        par a par é a expectativa do calcular_variacao_elo com a diferença de
+        Elo multiplicada pela escala. Só em peso 5.0 (escala 1) as duas coincidem;
+        peso 1.0 (sorte pura, K = 0) deixa todos iguais.
+        Até MAX_JOGADORES_EXATO jogadores a conta é exata; acima, sorteia
+        `amostras` ordens de chegada (truque de Gumbel, vetorizado).
+        """
+        elos = np.asarray(elos, dtype=float)
+        n = len(elos)
+        escala = RankingCalculator.get_k_factor(peso_jogo) / 64
+        log_forca = escala * (elos - elos.max()) * np.log(10) / 350
+        if n <= RankingCalculator.MAX_JOGADORES_EXATO:
+            return _posicoes_plackett_luce(np.exp(log_forca))
+        
+        rng = np.random.default_rng(seed)
+        # Ordenar log-força + ruído Gumbel = sortear uma ordem do Plackett-Luce
+        ordens = np.argsort(-(log_forca + rng.gumbel(size=(amostras, n))), axis=1)
+        contagem = np.zeros((n, n))
+        np.add.at(contagem, (ordens, np.arange(n)[None, :]), 1)
+        return contagem / amostras
+    
+    @staticmethod
+    def prever_partida(db, jogo_id, jogador_ids):
+        """
+        Previsão com os Elos atuais: DataFrame com jogador, elo e uma coluna
+        por posição ('1º', '2º', ...) com a probabilidade, mais provável vencedor primeiro
+        """
+        jogador_ids = [int(j) for j in jogador_ids]
+        jogadores = db.get_jogadores(apenas_ativos=False).set_index('id')
+        jogos = db.get_jogos(apenas_ativos=False).set_index('id')
+        peso = jogos.loc[int(jogo_id), 'peso_bgg']
+        elos = jogadores.loc[jogador_ids, 'elo'].to_numpy(dtype=float)
+        
+        probs = RankingCalculator.probabilidades_posicoes(elos, peso)
+        previsao = pd.DataFrame(probs, columns=[f"{k}º" for k in range(1, len(jogador_ids) + 1)])
+        previsao.insert(0, 'jogador', jogadores.loc[jogador_ids, 'nome'].to_numpy())
+        previsao.insert(1, 'elo', elos.round(1))
+        return previsao.sort_values('1º', ascending=False).reset_index(drop=True)
+    
+    @staticmethod
+    def recomendar_jogos(db, jogador_ids, tempo_disponivel=None, hoje=None):
+        """
+        Jogos que comportam o grupo (e cabem no tempo), do mais ao menos recomendado.
+        pontuacao = média de:
+        - novidade: dias desde que alguém do grupo jogou / DIAS_NOVIDADE, até 1
+          (nunca jogado pelo grupo = 1)
+        - competitividade: 1 / (1 + desvio dos Elos do grupo * peso / (PESO_REFERENCIA * 100)).
+          Usa o Elo do jogo (elos_jogo) e, para quem nunca jogou, o Elo geral.
+          Em jogo pesado a diferença de nível pesa mais.
+        Empate desempata por partidas_grupo (partidas distintas com alguém do grupo).
+        Lê só as partidas do grupo (índice por jogador), elos_jogo e o índice
+        de faixa de jogadores.
+        """
+        jogador_ids = [int(j) for j in jogador_ids]
+        candidatos = db.get_jogos_para_grupo(len(jogador_ids), tempo_disponivel)
+        if len(candidatos) == 0:
+            return candidatos
+        hoje = pd.Timestamp(hoje or pd.Timestamp.now().date())
+        
+        historico = db.get_historico_grupo_jogos(jogador_ids).set_index('jogo_id')
+        historico = historico.reindex(candidatos['id'])
+        dias = (hoje - pd.to_datetime(historico['ultima_data'])).dt.days.to_numpy(dtype=float)
+        novidade = np.where(np.isnan(dias), 1.0,
+                            np.clip(dias / RankingCalculator.DIAS_NOVIDADE, 0.0, 1.0))
+        
+        # Matriz jogo x jogador de Elos: do jogo quando existe, senão o geral
+        jogadores = db.get_jogadores(apenas_ativos=False).set_index('id')['elo']
+        elos = (db.get_elos_jogo_grupo(jogador_ids)
+                .pivot(index='jogo_id', columns='jogador_id', values='elo')
+                .reindex(index=candidatos['id'], columns=jogador_ids))
+        elos = elos.fillna(jogadores.reindex(jogador_ids))
+        desvio = elos.std(axis=1, ddof=0).to_numpy()
+        peso = candidatos['peso_bgg'].fillna(RankingCalculator.PESO_REFERENCIA).to_numpy()
+        competitividade = 1 / (1 + desvio * peso / (RankingCalculator.PESO_REFERENCIA * 100))
+        
+        recomendacao = pd.DataFrame({
+            'jogo_id': candidatos['id'],
+            'jogo': candidatos['nome'],
+            'jogadores': [f"{a}-{b}" for a, b in zip(candidatos['min_jogadores'], candidatos['max_jogadores'])],
+            'tempo_max': candidatos['tempo_max'].fillna(candidatos['tempo_min']),
+            'peso_bgg': candidatos['peso_bgg'],
+            'ultima_vez': historico['ultima_data'].to_numpy(),
+            'partidas_grupo': historico['partidas'].fillna(0).astype(int).to_numpy(),
+            'desvio_elo': desvio.round(1),
+            'novidade': novidade.round(3),
+            'competitividade': competitividade.round(3),
+            'pontuacao': ((novidade + competitividade) / 2).round(3),
+        })
+        recomendacao = recomendacao.sort_values(
+            ['pontuacao', 'partidas_grupo'], ascending=[False, False]
+        ).reset_index(drop=True)
+        recomendacao.index = recomendacao.index + 1
+        return recomendacao
+
+
+def _posicoes_plackett_luce(forca):
+    """
+    Probabilidades exatas de posição no Plackett-Luce: programação dinâmica
+    sobre os subconjuntos de jogadores já colocados, uma camada (posição) por vez.
+    f[S] = probabilidade de S ocupar as |S| primeiras posições.
+    """
+    n = len(forca)
+    mascaras = np.arange(1 << n)
+    bits = (mascaras[:, None] >> np.arange(n)) & 1
+    restante = forca.sum() - bits @ forca
+    tamanho = bits.sum(axis=1)
+    f = np.zeros(1 << n)
+    f[0] = 1.0
+    probs = np.zeros((n, n))
+    for k in range(n):
+        camada = mascaras[tamanho == k]
+        livres = bits[camada] == 0
+        # p[s, j]: chance de S = camada[s] ocupar o topo e j vir em seguida
+        p = f[camada][:, None] * livres * forca[None, :] / restante[camada][:, None]
+        probs[:, k] = p.sum(axis=0)
+        destino = camada[:, None] | (1 << np.arange(n))[None, :]
+        np.add.at(f, destino[livres], p[livres])
+    return probs
+
+
+def _preparar_partidas_replay(historico, coluna):
+    """
+    Converte cada partida em matrizes independentes dos Elos, para o replay vetorizado:
+    - cols: colunas (jogadores) da matriz de Elos
+    - media: matriz m x m que transforma Elos individuais em Elo do time
+      (identidade em jogos individuais)
+    - pesos: quantas mini-partidas cada par (i, j) representa
+    - resultado: 1 = i venceu j, 0 = perdeu, 0.5 = empate
+    Partidas com K = 0 (peso 1.0) ficam como None, pois não alteram Elo.
+    """
+    inicio = historico['inicio']
+    partidas = []
+    for i in range(len(historico['partida_id'])):
+        k_factor = RankingCalculator.get_k_factor(float(historico['peso'][i]))
+        a, b = inicio[i], inicio[i + 1]
+        posicoes = historico['posicao'][a:b]
+        if k_factor == 0 or b - a < 2:
+            partidas.append(None)
+            continue
+        
+        cols = np.array([coluna[int(jid)] for jid in historico['jogador_id'][a:b]], dtype=np.int64)
+        mesma_posicao = posicoes[:, None] == posicoes[None, :]
+        resultado = np.where(posicoes[:, None] < posicoes[None, :], 1.0,
+                             np.where(mesma_posicao, 0.5, 0.0))
+        
+        if historico['eh_jogo_time'][i] == 'S':
+            # Mesmo time = mesma posição. Cada par de times conta uma vez:
+            # divide pelo tamanho do time adversário
+            tamanho = mesma_posicao.sum(axis=1)
+            media = mesma_posicao / tamanho[:, None]
+            pesos = (~mesma_posicao) / tamanho[None, :]
+        else:
+            media = None
+            pesos = 1.0 - np.eye(len(cols))
+        
+        partidas.append((cols, media, k_factor * pesos, resultado))
+    return partidas
+
+
+def _executar_replays(tarefa):
+    """
+    Executa um bloco de replays bootstrap ao mesmo tempo (vetorizado nos replays).
+    Cada replay reamostra as partidas com reposição; uma partida sorteada c vezes
+    é aplicada c vezes, mantendo a ordem cronológica.
+    Retorna posições (1 = líder) dos jogadores ativos em cada replay.
+    """
+    partidas, n_partidas, n_jogadores, n_replays, semente, colunas_ativos, elo_inicial = tarefa
+    rng = np.random.default_rng(semente)
+    contagens = rng.multinomial(n_partidas, np.full(n_partidas, 1 / n_partidas), size=n_replays)
+    
+    elos = np.full((n_replays, n_jogadores), float(elo_inicial))
+    for t, partida in enumerate(partidas):
+        if partida is None:
+            continue
+        cols, media, pesos, resultado = partida
+        c = contagens[:, t]
+        for repeticao in range(c.max()):
+            linhas = np.flatnonzero(c > repeticao)
+            bloco = elos[np.ix_(linhas, cols)]
+            if media is not None:
+                bloco = bloco @ media.T
+            # expectativa[r, i, j] = chance de i vencer j (divisor 350, igual ao calcular_variacao_elo)
+            expectativa = 1 / (1 + 10 ** ((bloco[:, None, :] - bloco[:, :, None]) / 350))
+            variacao = (pesos * (resultado - expectativa)).sum(axis=2)
+            elos[np.ix_(linhas, cols)] += variacao
+    
+    elos_ativos = elos[:, colunas_ativos]
+    ordem = np.argsort(-elos_ativos, axis=1, kind='stable')
+    posicoes = np.empty_like(ordem)
+    np.put_along_axis(posicoes, ordem, np.arange(1, len(colunas_ativos) + 1)[None, :], axis=1)
+    return posicoes
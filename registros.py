@@ -0,0 +1,108 @@
+"""
+Registros leves devolvidos pelo Database nas leituras de uma linha (ou de
+poucas linhas): dataclasses com __slots__, montadas direto das tuplas do
+sqlite3. DataFrames ficam para as consultas em massa (rankings, histórico),
+onde o custo fixo do pandas compensa.
+"""
+from dataclasses import dataclass
+
+
+@dataclass(slots=True, frozen=True)
+class Jogatina:
+    id: int
+    data: str
+    local: str | None
+    observacoes: str | None
+
+    COLUNAS = "id, data, local, observacoes"
+
+
+@dataclass(slots=True, frozen=True)
+class Partida:
+    id: int
+    jogo_id: int
+    jogatina_id: int | None
+    data: str
+    valida_ranking: str
+    eh_jogo_time: str
+    observacoes: str | None
+    jogo_nome: str
+
+    COLUNAS = ("p.id, p.jogo_id, p.jogatina_id, p.data, p.valida_ranking, "
+               "p.eh_jogo_time, p.observacoes, j.nome")
+
+
+@dataclass(slots=True, frozen=True)
+class Resultado:
+    jogador_id: int
+    jogador_nome: str
+    posicao: int
+    pontuacao: float | None
+    time_id: int | None
+
+    COLUNAS = "r.jogador_id, jog.nome, r.posicao, r.pontuacao, r.time_id"
+
+
+@dataclass(slots=True, frozen=True)
+class Evento:
+    id: int
+    quando: str
+    tipo: str
+    partida_id: int | None
+    jogo_id: int | None
+    versao: int
+
+    COLUNAS = "id, quando, tipo, partida_id, jogo_id, versao"
+
+
+@dataclass(slots=True, frozen=True)
+class EstatisticaSorteio:
+    jogador_id: int
+    participacoes: int
+    vezes_sorteado: int
+    esperado: float
+    desde_ultimo: int
+
+    COLUNAS = "jogador_id, participacoes, vezes_sorteado, esperado, desde_ultimo"
+
+
+@dataclass(slots=True, frozen=True)
+class EstatisticasJogador:
+    jogador_id: int
+    partidas: int
+    vitorias: int
+    soma_posicoes: int
+    primeira_data: str
+    ultima_data: str
+    sequencia_atual: int
+    maior_sequencia: int
+    jogo_favorito: str | None
+    jogo_favorito_partidas: int | None
+    melhor_jogo: str | None
+    melhor_jogo_peso: float | None
+
+    COLUNAS = ("e.jogador_id, e.partidas, e.vitorias, e.soma_posicoes, e.primeira_data, "
+               "e.ultima_data, e.sequencia_atual, e.maior_sequencia, fav.nome, "
+               "e.jogo_favorito_partidas, mel.nome, e.melhor_jogo_peso")
+
+    @property
+    def taxa_vitoria(self):
+        return self.vitorias / self.partidas
+
+    @property
+    def posicao_media(self):
+        return self.soma_posicoes / self.partidas
+
+
+@dataclass(slots=True, frozen=True)
+class MetricasDashboard:
+    jogadores: int
+    jogos: int
+    partidas: int
+    ultima_jogatina_data: str | None
+    ultima_jogatina_local: str | None
+    ultima_jogatina_partidas: int | None
+    jogo_do_mes: str | None
+    jogo_do_mes_partidas: int | None
+    lider_nome: str | None
+    lider_elo: float | None
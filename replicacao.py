@@ -0,0 +1,273 @@
+"""
+Replicação do banco por páginas, em vez de subir o arquivo inteiro.
+
+O remoto guarda objetos numerados `<prefixo>.<geracao>.<seq>`:
+- seq 0: snapshot, todas as páginas do banco
+- seq 1, 2, ...: segmentos, só as páginas que mudaram desde o objeto anterior
+Restaurar = snapshot da maior geração + seus segmentos em ordem, até o
+primeiro buraco na numeração. Cada objeto leva o hash da imagem inteira
+depois de aplicado, conferido na restauração.
+
+A imagem enviada é sempre uma cópia consistente (API de backup do SQLite
+para um banco em memória), então o WAL não importa. O estado do remoto
+(hash de cada página) fica em memória: vem da restauração na hidratação
+ou do último envio.
+
+Concorrência otimista: o (geracao, seq) do estado é a versão do remoto que
+a instância conhece. Se o remoto andou sem a gente (outra instância
+enviou), ou se já existe réplica e não temos estado, replicar levanta
+ConflitoReplica em vez de sobrescrever: quem chama mescla o remoto no
+banco local (Database.mesclar_partidas) e tenta de novo. Duas instâncias
+enviando o mesmo próximo objeto ao mesmo tempo também dão conflito, porque
+gravar é criação exclusiva (só um dos dois fica com o nome).
+
+Compactação: quando os segmentos de uma geração passam de MAX_SEGMENTOS
+ou somam mais bytes que o snapshot, o envio vira um snapshot numa geração
+nova e as gerações antigas são apagadas (só depois do snapshot novo subir).
+
+Armazenamento: qualquer objeto com listar(prefixo), ler(nome),
+gravar(nome, dados) e apagar(nome); gravar levanta FileExistsError se o
+nome já existe. ArmazenamentoPasta usa um diretório
+local (testes, uso offline); o do Drive fica em gdrive_sync.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import struct
+import tempfile
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+PREFIXO = 'jogos.db.replica'
+MAX_SEGMENTOS = 50
+
+_MAGICO = b'DJPAGS01'
+# magico, geracao, seq, tamanho da página, páginas da imagem, páginas no objeto, hash da imagem
+_CABECALHO = struct.Struct('<8sIIIII16s')
+_NUMERO_PAGINA = struct.Struct('<I')
+
+
+@dataclass(slots=True, frozen=True)
+class EstadoReplica:
+    """O que está no remoto: último objeto e hash de cada página da imagem"""
+    geracao: int
+    seq: int
+    tamanho_pagina: int
+    hashes: tuple
+    bytes_snapshot: int
+    bytes_segmentos: int  # soma dos segmentos da geração (para compactar)
+
+
+class ConflitoReplica(Exception):
+    """O remoto recebeu envios de outra instância desde o estado conhecido"""
+
+
+class ArmazenamentoPasta:
+    """Diretório local no lugar do Drive"""
+
+    def __init__(self, pasta):
+        self.pasta = Path(pasta)
+        self.pasta.mkdir(parents=True, exist_ok=True)
+
+    def listar(self, prefixo):
+        return [nome for nome in os.listdir(self.pasta) if nome.startswith(prefixo)]
+
+    def ler(self, nome):
+        return (self.pasta / nome).read_bytes()
+
+    def gravar(self, nome, dados):
+        # Arquivo temporário + link: quem lista nunca vê objeto pela metade e,
+        # se o nome já existe, o link falha (FileExistsError) sem sobrescrever
+        fd, temporario = tempfile.mkstemp(dir=self.pasta, prefix='.gravando-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(dados)
+            os.link(temporario, self.pasta / nome)
+        finally:
+            os.remove(temporario)
+
+    def apagar(self, nome):
+        (self.pasta / nome).unlink(missing_ok=True)
+
+
+def imagem_banco(caminho):
+    """Bytes de uma cópia consistente do banco (inclui o que está no WAL)"""
+    origem = sqlite3.connect(caminho, timeout=30)
+    copia = sqlite3.connect(':memory:')
+    try:
+        origem.backup(copia)
+        return copia.serialize()
+    finally:
+        origem.close()
+        copia.close()
+
+
+def abrir_imagem(imagem):
+    """Conexão sqlite3 em memória sobre uma imagem (ex.: a restaurada do remoto)"""
+    imagem = bytearray(imagem)
+    imagem[18:20] = b'\x01\x01'  # banco em memória não tem WAL: modo rollback
+    conn = sqlite3.connect(':memory:')
+    conn.deserialize(bytes(imagem))
+    return conn
+
+
+def replicar(armazenamento, imagem, estado=None, prefixo=PREFIXO):
+    """
+    Envia `imagem` e devolve o novo EstadoReplica. Com `estado` igual ao
+    último objeto do remoto, envia só as páginas alteradas; sem réplica no
+    remoto, snapshot. Levanta ConflitoReplica se o remoto não está no
+    `estado` (outra instância enviou) ou se tem réplica e `estado` é None.
+    """
+    tamanho = _tamanho_pagina(imagem)
+    hashes = _hashes_paginas(imagem, tamanho)
+    objetos = _objetos(armazenamento, prefixo)
+    ultimo = max(objetos) if objetos else None
+
+    if estado is None:
+        if ultimo is not None:
+            raise ConflitoReplica(f"remoto já tem réplica ({_nome(prefixo, *ultimo)})")
+        return _enviar_snapshot(armazenamento, prefixo, objetos, 1, imagem, tamanho, hashes)
+    if ultimo != (estado.geracao, estado.seq):
+        atual = _nome(prefixo, *ultimo) if ultimo else "nenhum objeto"
+        raise ConflitoReplica(f"remoto em {atual}, esperado {_nome(prefixo, estado.geracao, estado.seq)}")
+
+    if estado.tamanho_pagina != tamanho:
+        return _enviar_snapshot(armazenamento, prefixo, objetos, estado.geracao + 1, imagem, tamanho, hashes)
+
+    alteradas = [
+        i for i, h in enumerate(hashes)
+        if i >= len(estado.hashes) or h != estado.hashes[i]
+    ]
+    if not alteradas and len(hashes) == len(estado.hashes):
+        return estado
+
+    seq = estado.seq + 1
+    dados = _montar_objeto(estado.geracao, seq, imagem, tamanho, alteradas)
+    if seq > MAX_SEGMENTOS or estado.bytes_segmentos + len(dados) > estado.bytes_snapshot:
+        return _enviar_snapshot(armazenamento, prefixo, objetos, estado.geracao + 1, imagem, tamanho, hashes)
+
+    _gravar(armazenamento, _nome(prefixo, estado.geracao, seq), dados)
+    return EstadoReplica(estado.geracao, seq, tamanho, hashes,
+                         estado.bytes_snapshot, estado.bytes_segmentos + len(dados))
+
+
+def restaurar(armazenamento, prefixo=PREFIXO):
+    """
+    (imagem, EstadoReplica) do snapshot mais novo + segmentos, ou
+    (None, None) se o remoto não tem réplica
+    """
+    objetos = _objetos(armazenamento, prefixo)
+    geracoes = [geracao for geracao, seq in objetos if seq == 0]
+    if not geracoes:
+        return None, None
+    geracao = max(geracoes)
+
+    imagem = bytearray()
+    tamanho = bytes_snapshot = bytes_segmentos = 0
+    seq = 0
+    while (geracao, seq) in objetos:
+        dados = armazenamento.ler(objetos[(geracao, seq)])
+        cabecalho, paginas = _ler_objeto(dados)
+        _, geracao_obj, seq_obj, tamanho, total, _, hash_imagem = cabecalho
+        if (geracao_obj, seq_obj) != (geracao, seq):
+            raise ValueError(f"réplica inconsistente: {objetos[(geracao, seq)]} é {geracao_obj}.{seq_obj}")
+
+        del imagem[total * tamanho:]
+        imagem.extend(bytes(total * tamanho - len(imagem)))
+        for pagina, conteudo in paginas:
+            imagem[pagina * tamanho:(pagina + 1) * tamanho] = conteudo
+        if hashlib.blake2b(imagem, digest_size=16).digest() != hash_imagem:
+            raise ValueError(f"réplica corrompida em {objetos[(geracao, seq)]}")
+
+        if seq == 0:
+            bytes_snapshot = len(dados)
+        else:
+            bytes_segmentos += len(dados)
+        seq += 1
+
+    imagem = bytes(imagem)
+    estado = EstadoReplica(geracao, seq - 1, tamanho, _hashes_paginas(imagem, tamanho),
+                           bytes_snapshot, bytes_segmentos)
+    return imagem, estado
+
+
+def _enviar_snapshot(armazenamento, prefixo, objetos, geracao, imagem, tamanho, hashes):
+    dados = _montar_objeto(geracao, 0, imagem, tamanho, range(len(hashes)))
+    _gravar(armazenamento, _nome(prefixo, geracao, 0), dados)
+    # Gerações antigas só saem depois do snapshot novo estar no remoto
+    for (geracao_antiga, _), nome in objetos.items():
+        if geracao_antiga < geracao:
+            armazenamento.apagar(nome)
+    return EstadoReplica(geracao, 0, tamanho, hashes, len(dados), 0)
+
+
+def _gravar(armazenamento, nome, dados):
+    try:
+        armazenamento.gravar(nome, dados)
+    except FileExistsError:
+        # Outra instância enviou o mesmo próximo objeto antes
+        raise ConflitoReplica(f"{nome} já foi enviado por outra instância") from None
+
+
+def _nome(prefixo, geracao, seq):
+    return f"{prefixo}.{geracao:06d}.{seq:08d}"
+
+
+def _objetos(armazenamento, prefixo):
+    """{(geracao, seq): nome} dos objetos da réplica"""
+    padrao = re.compile(re.escape(prefixo) + r'\.(\d{6})\.(\d{8})$')
+    objetos = {}
+    for nome in armazenamento.listar(prefixo):
+        encontrado = padrao.match(nome)
+        if encontrado:
+            objetos[(int(encontrado[1]), int(encontrado[2]))] = nome
+    return objetos
+
+
+def _tamanho_pagina(imagem):
+    if len(imagem) < 100 or not imagem.startswith(b'SQLite format 3\x00'):
+        raise ValueError("imagem não é um banco SQLite")
+    tamanho = struct.unpack('>H', imagem[16:18])[0]
+    return 65536 if tamanho == 1 else tamanho
+
+
+def _hashes_paginas(imagem, tamanho):
+    visao = memoryview(imagem)
+    return tuple(
+        hashlib.blake2b(visao[inicio:inicio + tamanho], digest_size=16).digest()
+        for inicio in range(0, len(imagem), tamanho)
+    )
+
+
+def _montar_objeto(geracao, seq, imagem, tamanho, paginas):
+    visao = memoryview(imagem)
+    partes = [_CABECALHO.pack(_MAGICO, geracao, seq, tamanho, len(imagem) // tamanho, len(paginas),
+                              hashlib.blake2b(imagem, digest_size=16).digest())]
+    for pagina in paginas:
+        partes.append(_NUMERO_PAGINA.pack(pagina))
+        partes.append(visao[pagina * tamanho:(pagina + 1) * tamanho])
+    return zlib.compress(b''.join(partes))
+
+
+def _ler_objeto(dados):
+    """(campos do cabeçalho, [(pagina, bytes)]); ValueError se ilegível"""
+    try:
+        bruto = zlib.decompress(dados)
+        cabecalho = _CABECALHO.unpack_from(bruto)
+    except (zlib.error, struct.error) as e:
+        raise ValueError(f"objeto da réplica ilegível: {e}") from None
+    if cabecalho[0] != _MAGICO:
+        raise ValueError("objeto da réplica em formato desconhecido")
+    tamanho, n_paginas = cabecalho[3], cabecalho[5]
+    if len(bruto) != _CABECALHO.size + n_paginas * (_NUMERO_PAGINA.size + tamanho):
+        raise ValueError("objeto da réplica truncado")
+    paginas = []
+    posicao = _CABECALHO.size
+    for _ in range(n_paginas):
+        pagina, = _NUMERO_PAGINA.unpack_from(bruto, posicao)
+        posicao += _NUMERO_PAGINA.size
+        paginas.append((pagina, bruto[posicao:posicao + tamanho]))
+        posicao += tamanho
+    return cabecalho, paginas